@@ -43,6 +43,34 @@ class PaginatedModelListResponse(BaseModel):
     page: int
     limit: int
     has_more: bool
+    next_cursor: Optional[str] = Field(
+        None, description="Pass as `cursor` (with the next page number) to continue the search."
+    )
+
+
+class SourceCacheCounters(BaseModel):
+    """Cache counters for one kind of request (searches or model details)."""
+
+    hits: int = Field(..., description="Requests answered from a fresh entry.")
+    stale_hits: int = Field(
+        ..., description="Requests answered from an expired entry while it was refreshed."
+    )
+    misses: int = Field(..., description="Requests that had to wait for the source.")
+    refreshes: int = Field(..., description="Expired entries refreshed in the background.")
+    errors: int = Field(..., description="Failed requests to the source.")
+    unchanged: int = Field(
+        0, description="Details refreshed whose repository had not changed (README reused)."
+    )
+
+
+class SourceCacheStats(BaseModel):
+    """Hit and miss counters and the size of the search and model details cache."""
+
+    kinds: Dict[str, SourceCacheCounters]
+    entries: int
+    size_bytes: int = Field(..., description="Estimated memory used by the entries.")
+    max_bytes: int
+    evictions: int = Field(..., description="Entries evicted to stay within max_bytes.")
 
 
 class ModelDetails(ModelListItem):
@@ -88,6 +116,18 @@ class MalFullConfiguration(BaseModel):
     color_theme: Optional[ColorThemeTypePydantic]
     config_mode: Optional[ConfigurationModePydantic]
     automatic_mode_ui: Optional[UiNameTypePydantic] = Field(None)
+    download_segments: Optional[int] = Field(
+        None, description="Default number of parallel connections used per file download."
+    )
+    max_active_downloads: Optional[int] = Field(
+        None, description="Maximum number of downloads running at the same time."
+    )
+    max_downloads_per_host: Optional[int] = Field(
+        None, description="Maximum number of running downloads against a single host."
+    )
+    bandwidth_limit: Optional[int] = Field(
+        None, description="Global download bandwidth cap in bytes per second. 0 is unlimited."
+    )
 
     class Config:
         populate_by_name = True
@@ -104,6 +144,15 @@ class PathConfigurationRequest(BaseModel):
     automatic_mode_ui: Optional[UiNameTypePydantic] = Field(
         None, description="The selected UI for 'automatic' mode."
     )
+    download_segments: Optional[int] = Field(
+        None, ge=1, description="Default number of parallel connections per file download."
+    )
+    max_active_downloads: Optional[int] = Field(
+        None, ge=1, description="Maximum number of downloads running at the same time."
+    )
+    max_downloads_per_host: Optional[int] = Field(
+        None, ge=1, description="Maximum number of running downloads against a single host."
+    )
 
 
 class PathConfigurationResponse(BaseModel):
@@ -124,6 +173,26 @@ class FileDownloadRequest(BaseModel):
     model_type: ModelTypePydantic
     custom_sub_path: Optional[str] = Field(None)
     revision: Optional[str] = Field(None)
+    segments: Optional[int] = Field(
+        None,
+        ge=1,
+        description="Parallel connections for this download. Defaults to the global setting.",
+    )
+    priority: int = Field(0, description="Queue priority. Higher values start first.")
+    bandwidth_limit: Optional[int] = Field(
+        None,
+        ge=0,
+        description="Bandwidth cap for this download in bytes per second. 0 or null is unlimited.",
+    )
+    size: Optional[int] = Field(
+        None,
+        ge=0,
+        description="Expected file size in bytes, if known, to reserve disk space up front.",
+    )
+    additional_ui_targets: Optional[List[UiNameTypePydantic]] = Field(
+        None,
+        description="Other managed UIs to place the file in as well. It is downloaded once.",
+    )
 
 
 class FileDownloadResponse(BaseModel):
@@ -133,6 +202,171 @@ class FileDownloadResponse(BaseModel):
     message: Optional[str] = None
     error: Optional[str] = None
     download_id: Optional[str] = Field(None, description="The unique ID for tracking the download.")
+    attached: bool = Field(
+        False, description="True if the request joined a download already in progress."
+    )
+
+
+class SnapshotDownloadRequest(BaseModel):
+    """Request model for downloading many files of a repository as one job."""
+
+    source: str = Field(..., description="The source of the model (e.g., 'huggingface').")
+    repo_id: str = Field(..., description="The repository ID (e.g., 'author/model_name').")
+    revision: Optional[str] = Field(
+        None, description="Branch, tag or commit. Resolved to a commit sha once."
+    )
+    include_patterns: Optional[List[str]] = Field(
+        None, description="Glob patterns of files to download. All files if omitted."
+    )
+    exclude_patterns: Optional[List[str]] = Field(
+        None, description="Glob patterns of files to skip."
+    )
+    model_type: ModelTypePydantic
+    custom_sub_path: Optional[str] = Field(None)
+    segments: Optional[int] = Field(None, ge=1)
+    priority: int = Field(0, description="Queue priority. Higher values start first.")
+    bandwidth_limit: Optional[int] = Field(
+        None, ge=0, description="Bandwidth cap for the whole job in bytes per second."
+    )
+
+
+class SnapshotDownloadResponse(FileDownloadResponse):
+    """Response for a snapshot download request."""
+
+    revision: Optional[str] = Field(None, description="The commit sha all files come from.")
+    file_count: Optional[int] = None
+    total_size_bytes: Optional[int] = None
+
+
+class DownloadPriorityRequest(BaseModel):
+    """Request model for changing the queue priority of a download."""
+
+    priority: int = Field(..., description="The new priority. Higher values start first.")
+
+
+class DownloadMoveRequest(BaseModel):
+    """Request model for moving a queued download up or down in the queue."""
+
+    direction: Literal["up", "down"]
+
+
+class DownloadBandwidthRequest(BaseModel):
+    """Request model for changing the bandwidth cap of a single download."""
+
+    bandwidth_limit: Optional[int] = Field(
+        None, ge=0, description="Bytes per second. 0 or null removes the limit."
+    )
+
+
+class DownloadSettings(BaseModel):
+    """Download engine settings that take effect without restarting running downloads."""
+
+    download_segments: int
+    max_active_downloads: int
+    max_downloads_per_host: int
+    bandwidth_limit: int = Field(
+        ..., description="Global bandwidth cap in bytes per second. 0 is unlimited."
+    )
+    hub_endpoints: List[str] = Field(
+        default_factory=list,
+        description="Hugging Face Hub endpoints or mirrors. Empty uses the default Hub.",
+    )
+    trusted_hub_endpoints: List[str] = Field(
+        default_factory=list,
+        description="Mirrors that get the Hugging Face token. The official Hub always does.",
+    )
+    progress_broadcast_rate: float = Field(
+        ..., description="Progress updates broadcast per second for each download."
+    )
+
+
+class DownloadSettingsUpdateRequest(BaseModel):
+    """Partial update of the download engine settings. Omitted fields are unchanged."""
+
+    download_segments: Optional[int] = Field(None, ge=1)
+    max_active_downloads: Optional[int] = Field(None, ge=1)
+    max_downloads_per_host: Optional[int] = Field(None, ge=1)
+    bandwidth_limit: Optional[int] = Field(None, ge=0)
+    hub_endpoints: Optional[List[str]] = None
+    progress_broadcast_rate: Optional[float] = Field(None, gt=0)
+    trusted_hub_endpoints: Optional[List[str]] = None
+
+
+class DownloadEngineMetrics(BaseModel):
+    """Transfer metrics summed over all running downloads."""
+
+    active_downloads: int
+    stalled_downloads: int
+    throughput: float = Field(..., description="Combined smoothed bytes per second.")
+    peak_throughput: float = Field(..., description="Highest combined throughput seen.")
+    remaining_bytes: int
+    eta_seconds: Optional[float] = None
+    write_blocked_seconds: float = Field(
+        ..., description="Time running downloads have waited for their disk writes."
+    )
+
+
+class DownloadEngineStatus(DownloadEngineMetrics):
+    """The engine totals together with the status of every tracked download and task."""
+
+    downloads: List[Dict[str, Any]]
+
+
+class DownloadBroadcastStats(BaseModel):
+    """Counters of the download status messages broadcast to connected clients."""
+
+    progress_updates: int = Field(..., description="Progress updates reported by jobs.")
+    messages_sent: int = Field(..., description="Status messages broadcast.")
+    messages_saved: int = Field(
+        ..., description="Progress updates merged into another message instead of sent."
+    )
+    progress_broadcast_rate: float
+    connected_clients: int
+    client_messages_merged: int = Field(
+        ..., description="Queued messages replaced by a newer one before being sent."
+    )
+    client_messages_dropped: int = Field(
+        ..., description="Progress messages dropped because a client's queue was full."
+    )
+    slow_clients_disconnected: int
+
+
+class DiskSpaceStatus(BaseModel):
+    """Free space and the space reserved by downloads on one filesystem."""
+
+    path: str = Field(..., description="A directory on the filesystem.")
+    free_bytes: int
+    reserved_active_bytes: int = Field(
+        ..., description="Space running downloads still need to write."
+    )
+    reserved_queued_bytes: int = Field(..., description="Space queued downloads will need.")
+
+
+DownloadStatePydantic = Literal[
+    "pending", "paused", "downloading", "running", "completed", "error", "cancelled"
+]
+
+
+class DownloadHistoryResponse(BaseModel):
+    """One page of recorded downloads and background tasks, newest first."""
+
+    items: List[Dict[str, Any]] = Field(..., description="Download status records.")
+    page: int
+    limit: int
+    total: int = Field(..., description="Number of records matching the filters.")
+    has_more: bool
+
+
+class HubEndpointStatus(BaseModel):
+    """Health and measured speed of one Hugging Face Hub endpoint."""
+
+    url: str
+    healthy: bool
+    latency_seconds: Optional[float] = None
+    throughput: Optional[float] = Field(None, description="Smoothed bytes per second.")
+    failures: int = 0
+    last_error: Optional[str] = None
+    last_checked: Optional[float] = None
 
 
 # --- Models for Local File Management ---
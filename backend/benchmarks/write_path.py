@@ -0,0 +1,215 @@
+# backend/benchmarks/write_path.py
+"""
+Benchmarks the disk stage of a download: how fast, and at what CPU cost, a file
+streamed from a local HTTP server reaches the disk and the inline hasher.
+
+Two write paths are compared on the same segment plan and connections:
+
+- before: every network chunk is written (and hashed) with its own
+  `asyncio.to_thread` call, as downloads did before the writer stage existed.
+- after: chunks go through `SegmentFileWriter`, which coalesces them into large
+  buffers written by one dedicated thread, as downloads do now.
+
+The server runs in a separate process and serves a range-capable file, so the
+CPU time reported is the downloader's alone. Every run checks the SHA-256.
+
+Run from the repository root (it is not part of the test suite):
+
+    python -m backend.benchmarks.write_path --size-mib 512 --segments 1 4 --repeat 3
+"""
+
+import argparse
+import asyncio
+import hashlib
+import multiprocessing
+import os
+import pathlib
+import tempfile
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List
+
+import httpx
+
+from backend.core.constants.constants import DOWNLOAD_PIECE_BYTES
+from backend.core.file_management.file_writer import SegmentFileWriter, preallocate
+from backend.core.file_management.inline_hasher import HoldBudget, InlineHasher
+from backend.core.file_management.partial_download import DownloadSegment
+
+BLOCK_SIZE = 1024 * 1024
+SEND_SIZE = 64 * 1024
+
+
+def _payload_block() -> bytes:
+    """The 1 MiB block the served file repeats; fixed, so client and server agree."""
+    return hashlib.shake_256(b"write-path-benchmark").digest(BLOCK_SIZE)
+
+
+def _expected_sha256(size: int) -> str:
+    block, digest = _payload_block(), hashlib.sha256()
+    for offset in range(0, size, BLOCK_SIZE):
+        digest.update(block[: min(BLOCK_SIZE, size - offset)])
+    return digest.hexdigest()
+
+
+def _serve(size: int, port_queue: "multiprocessing.Queue"):
+    """Server process: serves `size` bytes of the repeated block, honouring `Range`."""
+    block = _payload_block() * 2  # Lets any offset be sent as one slice
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            start, end = 0, size - 1
+            range_header = self.headers.get("Range")
+            if range_header:
+                first, _, last = range_header.removeprefix("bytes=").partition("-")
+                start, end = int(first), int(last) if last else size - 1
+                self.send_response(206)
+                self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+            else:
+                self.send_response(200)
+            self.send_header("Content-Length", str(end - start + 1))
+            self.end_headers()
+            position = start
+            while position <= end:
+                length = min(SEND_SIZE, end + 1 - position)
+                offset = position % BLOCK_SIZE
+                self.wfile.write(block[offset : offset + length])
+                position += length
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    port_queue.put(httpd.server_address[1])
+    httpd.serve_forever()
+
+
+def _plan(size: int, segments: int) -> List[DownloadSegment]:
+    """The plan downloads use: ordered pieces when more than one connection is used."""
+    if segments == 1:
+        return [DownloadSegment(0, size - 1)]
+    return [
+        DownloadSegment(start, min(start + DOWNLOAD_PIECE_BYTES, size) - 1)
+        for start in range(0, size, DOWNLOAD_PIECE_BYTES)
+    ]
+
+
+async def _fetch_pieces(
+    client: httpx.AsyncClient,
+    url: str,
+    plan: List[DownloadSegment],
+    connections: int,
+    fetch: Callable,
+):
+    remaining = iter(plan)
+
+    async def connection():
+        for segment in remaining:
+            headers = {"Range": f"bytes={segment.start}-{segment.end}"}
+            async with client.stream("GET", url, headers=headers) as response:
+                response.raise_for_status()
+                await fetch(segment, response)
+
+    await asyncio.gather(*(connection() for _ in range(connections)))
+
+
+def _write_chunk(file_obj, chunk: bytes, hasher: InlineHasher, segment_start: int, position: int):
+    """The former per-chunk write: an unbuffered write, looping over short writes, then hash."""
+    view = memoryview(chunk)
+    while view:
+        view = view[file_obj.write(view) :]
+    hasher.feed(segment_start, position, chunk)
+
+
+async def _download_before(client, url, path, plan, connections, hasher):
+    async def fetch(segment: DownloadSegment, response: httpx.Response):
+        # One file object per segment, as before, so seeks do not race.
+        with open(path, "r+b", buffering=0) as f:
+            f.seek(segment.next_offset)
+            async for chunk in response.aiter_bytes():
+                await asyncio.to_thread(
+                    _write_chunk, f, chunk, hasher, segment.start, segment.next_offset
+                )
+                segment.written += len(chunk)
+
+    await _fetch_pieces(client, url, plan, connections, fetch)
+
+
+async def _download_after(client, url, path, plan, connections, hasher):
+    def on_written(segment: DownloadSegment, length: int):
+        segment.written += length
+
+    writer = SegmentFileWriter(path, hasher, connections, on_written)
+
+    async def fetch(segment: DownloadSegment, response: httpx.Response):
+        position = segment.next_offset
+        async for chunk in response.aiter_bytes():
+            await writer.write(segment, position, chunk)
+            position += len(chunk)
+        writer.flush(segment)
+
+    try:
+        await _fetch_pieces(client, url, plan, connections, fetch)
+    finally:
+        await writer.close()
+
+
+async def _run_once(url: str, size: int, segments: int, variant: str, directory: str) -> Dict:
+    path = pathlib.Path(directory) / f"{variant}.part"
+    with open(path, "wb") as f:
+        preallocate(f, size)
+    plan = _plan(size, segments)
+    connections = min(segments, len(plan))
+    hasher = InlineHasher(path, plan, budget=HoldBudget(256 * 1024 * 1024))
+    download = _download_before if variant == "before" else _download_after
+
+    async with httpx.AsyncClient(trust_env=False, timeout=60.0) as client:
+        started_wall, started_cpu = time.perf_counter(), time.process_time()
+        await download(client, url, path, plan, connections, hasher)
+        sha256 = await asyncio.to_thread(hasher.finish, size)
+        wall, cpu = time.perf_counter() - started_wall, time.process_time() - started_cpu
+    path.unlink()
+    return {"wall": wall, "cpu": cpu, "sha256": sha256, "read_back": hasher.bytes_read_back}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--size-mib", type=int, default=512, help="Size of the served file.")
+    parser.add_argument("--segments", type=int, nargs="+", default=[1, 4])
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per case; the best counts.")
+    parser.add_argument("--dir", default=None, help="Where to write (default: a temp dir).")
+    args = parser.parse_args()
+
+    size = args.size_mib * 1024 * 1024
+    expected = _expected_sha256(size)
+    port_queue: "multiprocessing.Queue" = multiprocessing.Queue()
+    server = multiprocessing.Process(target=_serve, args=(size, port_queue), daemon=True)
+    server.start()
+    url = f"http://127.0.0.1:{port_queue.get(timeout=10)}/file.bin"
+
+    print(f"{args.size_mib} MiB from a local server, best of {args.repeat}, {os.cpu_count()} CPUs")
+    try:
+        with tempfile.TemporaryDirectory(dir=args.dir) as directory:
+            for segments in args.segments:
+                for variant in ("before", "after"):
+                    runs = [
+                        asyncio.run(_run_once(url, size, segments, variant, directory))
+                        for _ in range(args.repeat)
+                    ]
+                    if any(run["sha256"] != expected for run in runs):
+                        raise SystemExit(f"{variant}, {segments} segments: SHA-256 mismatch")
+                    best = min(runs, key=lambda run: run["wall"])
+                    print(
+                        f"  {variant:6}, {segments:2} segments: {best['wall']:6.2f}s "
+                        f"{args.size_mib / best['wall']:7.1f} MiB/s  cpu {best['cpu']:6.2f}s  "
+                        f"hash read back {best['read_back'] / 2**20:6.1f} MiB"
+                    )
+    finally:
+        server.terminate()
+        server.join()
+
+
+if __name__ == "__main__":
+    main()
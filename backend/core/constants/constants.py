@@ -29,6 +29,13 @@ UiNameType = Literal["ComfyUI", "A1111", "ForgeUI"]
 CONFIG_FILE_DIR = pathlib.Path(__file__).resolve().parent.parent.parent / "config"
 CONFIG_FILE_NAME = "mal_settings.json"
 CONFIG_FILE_PATH = CONFIG_FILE_DIR / CONFIG_FILE_NAME
+# Older versions journaled unfinished download jobs here; it is moved into the history database.
+LEGACY_DOWNLOAD_QUEUE_FILE_PATH = CONFIG_FILE_DIR / "download_queue.json"
+# SHA-256 hashes of downloaded files, keyed by path.
+FILE_HASH_INDEX_PATH = CONFIG_FILE_DIR / "file_hashes.json"
+# SQLite database holding the record of every download and background task, and the
+# journal of unfinished download jobs.
+DOWNLOAD_HISTORY_DB_PATH = CONFIG_FILE_DIR / "download_history.db"
 
 # --- Managed UI Installation Root ---
 # This is the fixed root directory where M.A.L. will install and manage UI environments.
@@ -40,6 +47,145 @@ MANAGED_UIS_ROOT_PATH = CONFIG_FILE_DIR.parent / "managed_uis"
 MODEL_FILE_EXTENSIONS = (".safetensors", ".ckpt", ".pt", ".bin", ".pth", ".onnx")
 
 
+# --- Download Engine Constants ---
+# Number of parallel byte-range connections used for a single file by default.
+DEFAULT_DOWNLOAD_SEGMENTS = 4
+MAX_DOWNLOAD_SEGMENTS = 16
+# Files smaller than two segments of this size are always fetched over a single stream.
+MIN_SEGMENT_SIZE_BYTES = 16 * 1024 * 1024
+# Larger files are split into pieces of this size, handed to the connections in file
+# order, so data written ahead of the hash frontier stays within about one piece each.
+DOWNLOAD_PIECE_BYTES = 32 * 1024 * 1024
+
+# Downloads beyond these limits wait in the scheduler's queue.
+DEFAULT_MAX_ACTIVE_DOWNLOADS = 3
+DEFAULT_MAX_DOWNLOADS_PER_HOST = 3
+
+# How many files of one snapshot (multi-file) download are fetched at the same time.
+SNAPSHOT_MAX_PARALLEL_FILES = 4
+
+# Progress of a job is broadcast at most this many times per second by default; updates
+# in between are merged into the next broadcast. State changes are always sent at once.
+DEFAULT_PROGRESS_BROADCAST_RATE = 5.0
+MAX_PROGRESS_BROADCAST_RATE = 30.0
+# A progress change of at least this many percentage points is broadcast immediately.
+PROGRESS_BROADCAST_MIN_STEP_PERCENT = 5.0
+
+# Time constant of the exponentially weighted transfer rate of a download.
+THROUGHPUT_EWMA_SECONDS = 5.0
+# A running download that has received no data for this long is flagged as stalled.
+DOWNLOAD_STALL_FLAG_SECONDS = 10.0
+# How often transfer metrics are refreshed (and engine totals broadcast) while downloading.
+DOWNLOAD_METRICS_INTERVAL_SECONDS = 1.0
+
+# Global download bandwidth cap in bytes per second; 0 means unlimited.
+DEFAULT_BANDWIDTH_LIMIT = 0
+# How many seconds worth of traffic a bandwidth bucket may accumulate as a burst.
+BANDWIDTH_BURST_SECONDS = 1.0
+
+# Partial downloads live next to their target as "<name>.part" with a "<name>.part.json" sidecar.
+PARTIAL_DOWNLOAD_SUFFIX = ".part"
+PARTIAL_SIDECAR_SUFFIX = ".json"
+# How many new bytes must arrive before the sidecar is rewritten during a download.
+PARTIAL_SIDECAR_SAVE_INTERVAL_BYTES = 64 * 1024 * 1024
+# Unowned partial downloads older than this are removed by the startup sweeper.
+PARTIAL_DOWNLOAD_MAX_AGE_SECONDS = 7 * 24 * 60 * 60
+# Downloaded chunks are coalesced into buffers of this size before a writer thread
+# writes them; each download keeps at most (segments + WRITE_QUEUE_DEPTH) buffers.
+WRITE_BUFFER_SIZE_BYTES = 4 * 1024 * 1024
+WRITE_QUEUE_DEPTH = 4
+# Space always left free on a filesystem when admitting downloads.
+DISK_SPACE_MARGIN_BYTES = 512 * 1024 * 1024
+# How often free space is re-checked while downloads are queued or running.
+DISK_SPACE_CHECK_INTERVAL_SECONDS = 30.0
+# Step size of file copies; progress is reported after each step.
+COPY_STEP_BYTES = 64 * 1024 * 1024
+# Read size used when already-written data has to be hashed from disk.
+HASH_READ_CHUNK_BYTES = 8 * 1024 * 1024
+# Data written ahead of the hash frontier (by later segments) that is kept in memory, by
+# all downloads together, until the frontier reaches it; the rest is read back from disk.
+INLINE_HASH_HOLD_BYTES = 256 * 1024 * 1024
+# Download records are written to the history database in batches at this interval.
+DOWNLOAD_HISTORY_FLUSH_INTERVAL_SECONDS = 2.0
+# Changes to the file hash index are written to disk at most this often.
+FILE_HASH_INDEX_FLUSH_INTERVAL_SECONDS = 5.0
+# Finished downloads kept in memory (and shown in the UI) before the oldest are evicted.
+DOWNLOAD_HISTORY_RECENT_LIMIT = 50
+
+
+# --- WebSocket Constants ---
+# Messages waiting to be sent to one client. Progress messages already superseded by
+# a newer one are dropped when it is full; a client that still cannot keep up is closed.
+WS_SEND_QUEUE_SIZE = 256
+# A client that does not accept a message within this time is disconnected.
+WS_SEND_TIMEOUT_SECONDS = 10.0
+# Broadcast events kept for replay to reconnecting clients. A client that missed
+# more than this is sent a fresh snapshot instead, in pages of WS_SNAPSHOT_PAGE_SIZE items.
+WS_REPLAY_BUFFER_SIZE = 2048
+WS_SNAPSHOT_PAGE_SIZE = 100
+
+
+# --- UI Process Log Constants ---
+# Output of UI installs and runs is kept per task in files under this directory.
+PROCESS_LOG_DIR = CONFIG_FILE_DIR / "process_logs"
+# Process output is read in chunks of up to this size instead of line by line.
+PROCESS_LOG_READ_CHUNK_BYTES = 64 * 1024
+# Recent lines of each task kept in memory for clients that start watching late.
+PROCESS_LOG_BUFFER_LINES = 1000
+# New lines are sent to clients in one message per task at this interval.
+PROCESS_LOG_FLUSH_INTERVAL_SECONDS = 0.25
+# A task's log file is rotated at this size; older rotated files beyond the limit are deleted.
+PROCESS_LOG_SEGMENT_BYTES = 4 * 1024 * 1024
+PROCESS_LOG_MAX_SEGMENTS = 4
+# Logs of this many tasks are kept (in memory and on disk); the oldest are removed first.
+PROCESS_LOG_MAX_TASKS = 20
+# Upper limit of a single byte-range read from a task's log.
+PROCESS_LOG_RANGE_MAX_BYTES = 1024 * 1024
+
+
+# --- Shared HTTP Client Constants ---
+# Defaults for the application-scoped HTTP connection pools. Any key can be
+# overridden through the "http_settings" object in the configuration file.
+DEFAULT_HTTP_SETTINGS: Dict[str, Any] = {
+    "http2": True,
+    "max_connections": 64,
+    "max_keepalive_connections": 32,
+    "keepalive_expiry_seconds": 30.0,
+    "connect_timeout_seconds": 10.0,
+    "read_timeout_seconds": 60.0,
+    # Failed download requests (connection errors, timeouts, 429 and 5xx) are retried
+    # this many times in a row, waiting a jittered, doubling backoff in between.
+    "max_retries": 5,
+    "retry_backoff_seconds": 1.0,
+    "retry_backoff_max_seconds": 60.0,
+    # A download stream that delivers no data for this long is reconnected (0 disables).
+    "stall_timeout_seconds": 30.0,
+}
+
+
+# --- Hub Endpoint Constants ---
+# Mirrors of the Hugging Face Hub are probed this often; unhealthy ones are retried then.
+HUB_PROBE_INTERVAL_SECONDS = 300.0
+# Timeout of a single endpoint probe.
+HUB_PROBE_TIMEOUT_SECONDS = 10.0
+# Endpoints are ranked by the estimated time to fetch this many bytes
+# (probe latency plus the size over the measured throughput).
+HUB_RANKING_REFERENCE_BYTES = 16 * 1024 * 1024
+# Weight of the newest sample in an endpoint's throughput average.
+HUB_THROUGHPUT_SMOOTHING = 0.3
+
+
+# --- Source Cache Constants ---
+# Search results and model details from the sources are reused for this long.
+SEARCH_CACHE_TTL_SECONDS = 120.0
+DETAILS_CACHE_TTL_SECONDS = 600.0
+# For this long after expiring, an entry is still served at once while it is refreshed
+# in the background; older entries are fetched again before answering.
+SOURCE_CACHE_MAX_STALE_SECONDS = 3600.0
+# Approximate memory the cache may use; the least recently used entries are evicted first.
+SOURCE_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+
 # --- UI Profile Path Definitions ---
 # Defines the subfolder structure for different UI profiles.
 KNOWN_UI_PROFILES: Dict[UiProfileType, Dict[str, str]] = {
@@ -0,0 +1,88 @@
+# backend/core/file_management/bandwidth_limiter.py
+import asyncio
+import logging
+import time
+from typing import Dict, Optional
+
+from ..constants.constants import BANDWIDTH_BURST_SECONDS
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """
+    An asyncio token bucket that limits throughput to `rate` bytes per second.
+
+    Consumers take tokens first and then sleep off any deficit, so many
+    concurrent streams sharing one bucket stay within the rate in aggregate.
+    A rate of None (or 0) means unlimited. The rate can be changed at any time.
+    """
+
+    def __init__(self, rate: Optional[int] = None):
+        self.rate: Optional[int] = rate or None
+        self._tokens: float = self.capacity
+        self._last_refill = time.monotonic()
+
+    @property
+    def capacity(self) -> float:
+        return (self.rate or 0) * BANDWIDTH_BURST_SECONDS
+
+    def _refill(self):
+        now = time.monotonic()
+        if self.rate:
+            elapsed = now - self._last_refill
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._last_refill = now
+
+    def set_rate(self, rate: Optional[int]):
+        self._refill()
+        self.rate = rate or None
+        self._tokens = min(self._tokens, self.capacity)
+
+    async def consume(self, amount: int):
+        """Takes `amount` tokens, sleeping as long as needed to stay within the rate."""
+        if not self.rate:
+            return
+        self._refill()
+        self._tokens -= amount
+        if self._tokens < 0:
+            await asyncio.sleep(-self._tokens / self.rate)
+
+
+class BandwidthLimiter:
+    """
+    Holds the engine-wide bandwidth bucket and one bucket per download.
+    Every chunk received passes through both, so all segments of a download
+    (and all files of a multi-file job sharing its key) stay under their own
+    limit while the engine as a whole stays under the global one.
+    """
+
+    def __init__(self):
+        self.global_bucket = TokenBucket()
+        self.download_buckets: Dict[str, TokenBucket] = {}
+
+    def set_global_rate(self, rate: Optional[int]):
+        self.global_bucket.set_rate(rate)
+        logger.info(f"Global bandwidth limit set to {rate or 'unlimited'} B/s.")
+
+    def set_download_rate(self, key: str, rate: Optional[int]):
+        """Sets (or, with None/0, lifts) the limit for one download. Applies to running streams."""
+        bucket = self.download_buckets.get(key)
+        if bucket:
+            bucket.set_rate(rate)
+        elif rate:
+            self.download_buckets[key] = TokenBucket(rate)
+
+    def release(self, key: str):
+        """Forgets the bucket of a finished download."""
+        self.download_buckets.pop(key, None)
+
+    async def throttle(self, key: str, amount: int):
+        """Waits until `amount` bytes may pass for the given download and globally."""
+        bucket = self.download_buckets.get(key)
+        if bucket:
+            await bucket.consume(amount)
+        await self.global_bucket.consume(amount)
+
+
+bandwidth_limiter = BandwidthLimiter()
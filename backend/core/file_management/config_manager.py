@@ -2,11 +2,19 @@
 import json
 import logging
 import pathlib
-from typing import Dict, Any, Optional, Tuple, Literal
+from typing import Dict, Any, Optional, Tuple, Literal, List
 
 from ..constants.constants import (
     CONFIG_FILE_PATH,
     MANAGED_UIS_ROOT_PATH,
+    DEFAULT_DOWNLOAD_SEGMENTS,
+    MAX_DOWNLOAD_SEGMENTS,
+    DEFAULT_MAX_ACTIVE_DOWNLOADS,
+    DEFAULT_MAX_DOWNLOADS_PER_HOST,
+    DEFAULT_BANDWIDTH_LIMIT,
+    DEFAULT_PROGRESS_BROADCAST_RATE,
+    MAX_PROGRESS_BROADCAST_RATE,
+    DEFAULT_HTTP_SETTINGS,
     UiProfileType,
     ColorThemeType,
     UiNameType,
@@ -35,6 +43,21 @@ class ConfigManager:
         self.custom_model_type_paths: Dict[str, str] = {}
         self.color_theme: ColorThemeType = "dark"
         self.config_mode: ConfigurationMode = "automatic"
+        # Number of parallel range connections used per file download.
+        self.download_segments: int = DEFAULT_DOWNLOAD_SEGMENTS
+        # Limits for how many downloads the scheduler runs at once, overall and per host.
+        self.max_active_downloads: int = DEFAULT_MAX_ACTIVE_DOWNLOADS
+        self.max_downloads_per_host: int = DEFAULT_MAX_DOWNLOADS_PER_HOST
+        # Global download bandwidth cap in bytes per second (0 means unlimited).
+        self.bandwidth_limit: int = DEFAULT_BANDWIDTH_LIMIT
+        # Hugging Face Hub endpoints (mirrors) in order of preference; empty means the default.
+        self.hub_endpoints: List[str] = []
+        # Mirrors trusted with the Hugging Face token; the official Hub endpoint always is.
+        self.trusted_hub_endpoints: List[str] = []
+        # How many progress updates per second are broadcast for each download.
+        self.progress_broadcast_rate: float = DEFAULT_PROGRESS_BROADCAST_RATE
+        # Connection pool limits and timeouts for the shared HTTP client.
+        self.http_settings: Dict[str, Any] = dict(DEFAULT_HTTP_SETTINGS)
         self._load_config()
 
     @property
@@ -69,6 +92,20 @@ class ConfigManager:
             self.color_theme = config_data.get("color_theme", "dark")
             self.config_mode = config_data.get("config_mode", "automatic")
             self.automatic_mode_ui = config_data.get("automatic_mode_ui")
+            self.download_segments = config_data.get("download_segments", DEFAULT_DOWNLOAD_SEGMENTS)
+            self.max_active_downloads = config_data.get(
+                "max_active_downloads", DEFAULT_MAX_ACTIVE_DOWNLOADS
+            )
+            self.max_downloads_per_host = config_data.get(
+                "max_downloads_per_host", DEFAULT_MAX_DOWNLOADS_PER_HOST
+            )
+            self.bandwidth_limit = config_data.get("bandwidth_limit", DEFAULT_BANDWIDTH_LIMIT)
+            self.hub_endpoints = config_data.get("hub_endpoints", [])
+            self.trusted_hub_endpoints = config_data.get("trusted_hub_endpoints", [])
+            self.progress_broadcast_rate = config_data.get(
+                "progress_broadcast_rate", DEFAULT_PROGRESS_BROADCAST_RATE
+            )
+            self.http_settings = {**DEFAULT_HTTP_SETTINGS, **config_data.get("http_settings", {})}
 
             # Load the base path only if it exists (for manual mode persistence)
             base_path_str = config_data.get("base_path")
@@ -101,6 +138,14 @@ class ConfigManager:
         self.custom_model_type_paths = {}
         self.color_theme = "dark"
         self.config_mode = "automatic"
+        self.download_segments = DEFAULT_DOWNLOAD_SEGMENTS
+        self.max_active_downloads = DEFAULT_MAX_ACTIVE_DOWNLOADS
+        self.max_downloads_per_host = DEFAULT_MAX_DOWNLOADS_PER_HOST
+        self.bandwidth_limit = DEFAULT_BANDWIDTH_LIMIT
+        self.hub_endpoints = []
+        self.trusted_hub_endpoints = []
+        self.progress_broadcast_rate = DEFAULT_PROGRESS_BROADCAST_RATE
+        self.http_settings = dict(DEFAULT_HTTP_SETTINGS)
 
     def get_current_configuration(self) -> Dict[str, Any]:
         """Returns the current configuration state as a dictionary."""
@@ -115,6 +160,14 @@ class ConfigManager:
             "color_theme": self.color_theme,
             "config_mode": self.config_mode,
             "automatic_mode_ui": self.automatic_mode_ui,
+            "download_segments": self.download_segments,
+            "max_active_downloads": self.max_active_downloads,
+            "max_downloads_per_host": self.max_downloads_per_host,
+            "bandwidth_limit": self.bandwidth_limit,
+            "hub_endpoints": self.hub_endpoints,
+            "trusted_hub_endpoints": self.trusted_hub_endpoints,
+            "progress_broadcast_rate": self.progress_broadcast_rate,
+            "http_settings": self.http_settings,
         }
 
     def update_configuration(
@@ -125,6 +178,9 @@ class ConfigManager:
         color_theme: Optional[ColorThemeType],
         config_mode: Optional[ConfigurationMode],
         automatic_mode_ui: Optional[UiNameType],
+        download_segments: Optional[int] = None,
+        max_active_downloads: Optional[int] = None,
+        max_downloads_per_host: Optional[int] = None,
     ) -> Tuple[bool, str]:
         """
         Updates and saves the configuration based on user input from the settings page.
@@ -174,8 +230,110 @@ class ConfigManager:
             self.color_theme = color_theme
             changed = True
 
+        # Update the download engine settings
+        if self._apply_download_settings(
+            download_segments, max_active_downloads, max_downloads_per_host
+        ):
+            changed = True
+
         if changed:
             self._save_config()
             return True, "Configuration updated successfully."
 
         return False, "No changes detected in configuration."
+
+    def _apply_download_settings(
+        self,
+        download_segments: Optional[int] = None,
+        max_active_downloads: Optional[int] = None,
+        max_downloads_per_host: Optional[int] = None,
+        bandwidth_limit: Optional[int] = None,
+        hub_endpoints: Optional[List[str]] = None,
+        progress_broadcast_rate: Optional[float] = None,
+        trusted_hub_endpoints: Optional[List[str]] = None,
+    ) -> bool:
+        """Applies download engine settings in memory. Returns True if anything changed."""
+        changed = False
+
+        # Update the default number of download segments
+        if download_segments is not None:
+            clamped_segments = max(1, min(download_segments, MAX_DOWNLOAD_SEGMENTS))
+            if clamped_segments != self.download_segments:
+                self.download_segments = clamped_segments
+                changed = True
+
+        # Update the download scheduler limits
+        if max_active_downloads is not None and max_active_downloads != self.max_active_downloads:
+            self.max_active_downloads = max(1, max_active_downloads)
+            changed = True
+        if (
+            max_downloads_per_host is not None
+            and max_downloads_per_host != self.max_downloads_per_host
+        ):
+            self.max_downloads_per_host = max(1, max_downloads_per_host)
+            changed = True
+
+        # Update the global bandwidth limit (0 means unlimited)
+        if bandwidth_limit is not None and max(0, bandwidth_limit) != self.bandwidth_limit:
+            self.bandwidth_limit = max(0, bandwidth_limit)
+            changed = True
+
+        # Update the Hub endpoints
+        if hub_endpoints is not None:
+            cleaned = [url.strip().rstrip("/") for url in hub_endpoints if url.strip()]
+            if cleaned != self.hub_endpoints:
+                self.hub_endpoints = cleaned
+                changed = True
+        if trusted_hub_endpoints is not None:
+            cleaned = [url.strip().rstrip("/") for url in trusted_hub_endpoints if url.strip()]
+            if cleaned != self.trusted_hub_endpoints:
+                self.trusted_hub_endpoints = cleaned
+                changed = True
+
+        # Update the progress broadcast rate
+        if progress_broadcast_rate is not None:
+            clamped_rate = max(1.0, min(progress_broadcast_rate, MAX_PROGRESS_BROADCAST_RATE))
+            if clamped_rate != self.progress_broadcast_rate:
+                self.progress_broadcast_rate = clamped_rate
+                changed = True
+
+        return changed
+
+    def update_download_settings(
+        self,
+        download_segments: Optional[int] = None,
+        max_active_downloads: Optional[int] = None,
+        max_downloads_per_host: Optional[int] = None,
+        bandwidth_limit: Optional[int] = None,
+        hub_endpoints: Optional[List[str]] = None,
+        progress_broadcast_rate: Optional[float] = None,
+        trusted_hub_endpoints: Optional[List[str]] = None,
+    ) -> bool:
+        """
+        Updates and saves only the download engine settings. Fields left as None
+        are unchanged. Returns True if anything changed.
+        """
+        changed = self._apply_download_settings(
+            download_segments,
+            max_active_downloads,
+            max_downloads_per_host,
+            bandwidth_limit,
+            hub_endpoints,
+            progress_broadcast_rate,
+            trusted_hub_endpoints,
+        )
+        if changed:
+            self._save_config()
+        return changed
+
+    def get_download_settings(self) -> Dict[str, Any]:
+        """Returns the download engine settings that can be changed at runtime."""
+        return {
+            "download_segments": self.download_segments,
+            "max_active_downloads": self.max_active_downloads,
+            "max_downloads_per_host": self.max_downloads_per_host,
+            "bandwidth_limit": self.bandwidth_limit,
+            "hub_endpoints": self.hub_endpoints,
+            "trusted_hub_endpoints": self.trusted_hub_endpoints,
+            "progress_broadcast_rate": self.progress_broadcast_rate,
+        }
@@ -0,0 +1,185 @@
+# backend/core/file_management/disk_space.py
+import logging
+import os
+import pathlib
+import shutil
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, Any, Optional, List, Set
+
+from .partial_download import partial_paths_for
+from ..constants.constants import DISK_SPACE_MARGIN_BYTES
+
+logger = logging.getLogger(__name__)
+
+
+class InsufficientDiskSpaceError(IOError):
+    """Raised when a download no longer fits on its target filesystem."""
+
+
+def format_bytes(num_bytes: float) -> str:
+    """Formats a byte count for messages, e.g. '9.3 GB'."""
+    if num_bytes < 1024:
+        return f"{int(num_bytes)} B"
+    for unit in ("KB", "MB", "GB"):
+        num_bytes /= 1024
+        if num_bytes < 1024:
+            return f"{num_bytes:.1f} {unit}"
+    return f"{num_bytes / 1024:.1f} TB"
+
+
+def _existing_ancestor(path: pathlib.Path) -> pathlib.Path:
+    """Returns `path` or its closest parent that exists, to query its filesystem."""
+    for candidate in (path, *path.parents):
+        if candidate.exists():
+            return candidate
+    return pathlib.Path(path.anchor or ".")
+
+
+def _allocated_bytes(path: pathlib.Path) -> int:
+    """(Blocking) Bytes a file actually occupies on disk; 0 if it does not exist."""
+    try:
+        stat = path.stat()
+    except OSError:
+        return 0
+    blocks = getattr(stat, "st_blocks", None)
+    return min(stat.st_size, blocks * 512) if blocks is not None else stat.st_size
+
+
+@dataclass
+class _ReservedFile:
+    path: pathlib.Path
+    size: int  # Expected final size; 0 while unknown
+    device: int
+    probe_path: pathlib.Path  # Existing directory on the same filesystem
+
+    def outstanding(self) -> int:
+        """(Blocking) Bytes this file still needs: its size minus what its partial holds."""
+        if self.size <= 0:
+            return 0
+        partial_path, _ = partial_paths_for(self.path)
+        return max(0, self.size - _allocated_bytes(partial_path))
+
+
+@dataclass
+class SpaceReservation:
+    """The files a download job will write, with their expected sizes."""
+
+    download_id: str
+    files: Dict[pathlib.Path, _ReservedFile] = field(default_factory=dict)
+
+
+class DiskSpaceLedger:
+    """
+    Keeps track of the disk space that queued and running downloads still need on
+    each filesystem, so a job is only started when it fits next to every running
+    job, and one that can never fit is turned away up front.
+
+    Partial files are preallocated, so a running download's reservation shrinks
+    as its space is actually taken on disk; only the remainder is counted against
+    the free space. DISK_SPACE_MARGIN_BYTES are always left free.
+    """
+
+    def __init__(self, margin: int = DISK_SPACE_MARGIN_BYTES):
+        self.margin = margin
+        self.reservations: Dict[str, SpaceReservation] = {}
+        # Jobs whose reservations count against the free space (the running ones).
+        self.active: Set[str] = set()
+        self._lock = threading.Lock()
+
+    def reserve(self, download_id: str, files: Dict[pathlib.Path, Optional[int]]):
+        """(Blocking) Records the target paths and expected sizes (None if unknown) of a job."""
+        reservation = SpaceReservation(download_id)
+        for path, size in files.items():
+            probe_path = _existing_ancestor(path.parent)
+            reservation.files[path] = _ReservedFile(
+                path, size or 0, os.stat(probe_path).st_dev, probe_path
+            )
+        with self._lock:
+            self.reservations[download_id] = reservation
+
+    def set_file_size(self, download_id: str, path: pathlib.Path, size: int):
+        """Corrects the expected size of a file once the remote size is known."""
+        with self._lock:
+            reservation = self.reservations.get(download_id)
+            if reservation and path in reservation.files:
+                reservation.files[path].size = max(0, size)
+
+    def activate(self, download_id: str):
+        with self._lock:
+            self.active.add(download_id)
+
+    def deactivate(self, download_id: str):
+        with self._lock:
+            self.active.discard(download_id)
+
+    def release(self, download_id: str):
+        with self._lock:
+            self.reservations.pop(download_id, None)
+            self.active.discard(download_id)
+
+    def check(self, download_id: str, alone: bool = False) -> Optional[str]:
+        """
+        (Blocking) Checks whether the rest of a job fits on its filesystems next to
+        the running jobs (or, with `alone`, on its own). Returns a reason if it does
+        not, None if it fits.
+        """
+        with self._lock:
+            reservation = self.reservations.get(download_id)
+            if not reservation:
+                return None
+            competing = (
+                []
+                if alone
+                else [
+                    self.reservations[other]
+                    for other in self.active
+                    if other != download_id and other in self.reservations
+                ]
+            )
+            own_files = list(reservation.files.values())
+            other_files = [f for other in competing for f in other.files.values()]
+
+        needed: Dict[int, int] = {}
+        probe_paths: Dict[int, pathlib.Path] = {}
+        for reserved in own_files:
+            needed[reserved.device] = needed.get(reserved.device, 0) + reserved.outstanding()
+            probe_paths.setdefault(reserved.device, reserved.probe_path)
+
+        for device, need in needed.items():
+            if need <= 0:
+                continue
+            reserved_by_others = sum(f.outstanding() for f in other_files if f.device == device)
+            free = shutil.disk_usage(probe_paths[device]).free
+            if need + reserved_by_others + self.margin > free:
+                reason = (
+                    f"Not enough disk space: needs {format_bytes(need)} on '{probe_paths[device]}', "
+                    f"{format_bytes(max(0, free - self.margin))} free"
+                )
+                if reserved_by_others:
+                    reason += f" ({format_bytes(reserved_by_others)} reserved by other downloads)"
+                return reason
+        return None
+
+    def get_status(self) -> List[Dict[str, Any]]:
+        """(Blocking) Free and reserved space per filesystem that has reservations."""
+        with self._lock:
+            snapshot = [
+                (download_id in self.active, reserved)
+                for download_id, reservation in self.reservations.items()
+                for reserved in reservation.files.values()
+            ]
+        filesystems: Dict[int, Dict[str, Any]] = {}
+        for active, reserved in snapshot:
+            entry = filesystems.setdefault(
+                reserved.device,
+                {
+                    "path": str(reserved.probe_path),
+                    "free_bytes": shutil.disk_usage(reserved.probe_path).free,
+                    "reserved_active_bytes": 0,
+                    "reserved_queued_bytes": 0,
+                },
+            )
+            key = "reserved_active_bytes" if active else "reserved_queued_bytes"
+            entry[key] += reserved.outstanding()
+        return list(filesystems.values())
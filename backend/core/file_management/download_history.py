@@ -0,0 +1,256 @@
+# backend/core/file_management/download_history.py
+import asyncio
+import json
+import logging
+import pathlib
+import sqlite3
+import threading
+import time
+from typing import Dict, Any, Optional, List, Iterable, Tuple
+
+from ..constants.constants import (
+    DOWNLOAD_HISTORY_DB_PATH,
+    DOWNLOAD_HISTORY_FLUSH_INTERVAL_SECONDS,
+)
+
+logger = logging.getLogger(__name__)
+
+# States in which a download or task will not change anymore.
+FINISHED_STATES = ("completed", "error", "cancelled")
+_FINISHED_PLACEHOLDERS = ", ".join("?" for _ in FINISHED_STATES)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS downloads (
+    download_id TEXT PRIMARY KEY,
+    repo_id TEXT NOT NULL,
+    filename TEXT NOT NULL,
+    status TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    finished_at REAL,
+    record TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS downloads_created_at ON downloads (created_at);
+CREATE INDEX IF NOT EXISTS downloads_status ON downloads (status);
+CREATE INDEX IF NOT EXISTS downloads_repo_id ON downloads (repo_id);
+CREATE TABLE IF NOT EXISTS download_queue (
+    download_id TEXT PRIMARY KEY,
+    job TEXT NOT NULL
+);
+"""
+
+_UPSERT = """
+INSERT INTO downloads
+    (download_id, repo_id, filename, status, created_at, updated_at, finished_at, record)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (download_id) DO UPDATE SET
+    repo_id = excluded.repo_id,
+    filename = excluded.filename,
+    status = excluded.status,
+    updated_at = excluded.updated_at,
+    finished_at = excluded.finished_at,
+    record = excluded.record
+"""
+
+_QUEUE_UPSERT = """
+INSERT INTO download_queue (download_id, job) VALUES (?, ?)
+ON CONFLICT (download_id) DO UPDATE SET job = excluded.job
+"""
+
+
+class DownloadHistoryStore:
+    """
+    Keeps the record of every download and background task in an SQLite database,
+    so queue state, finished jobs and their errors survive a restart.
+
+    Records are written behind: `record` only remembers the latest state of each
+    job, and the pending states are written in one transaction every
+    DOWNLOAD_HISTORY_FLUSH_INTERVAL_SECONDS, so progress updates cost no disk write.
+    The journal of unfinished download jobs (see DownloadQueueStore) is kept in the
+    same database and written in the same transactions.
+    """
+
+    def __init__(
+        self,
+        db_path: pathlib.Path = DOWNLOAD_HISTORY_DB_PATH,
+        flush_interval: float = DOWNLOAD_HISTORY_FLUSH_INTERVAL_SECONDS,
+    ):
+        self.db_path = db_path
+        self.flush_interval = flush_interval
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        # Queue journal changes: the serialized job to write, or None to delete it.
+        self._queue_pending: Dict[str, Optional[str]] = {}
+        self._pending_lock = threading.Lock()
+        self._db_lock = threading.Lock()
+        self._connection: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        """(Blocking) Opens the database on first use, creating it if needed. Needs `_db_lock`."""
+        if self._connection is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(self.db_path, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.executescript(_SCHEMA)
+            self._connection = connection
+        return self._connection
+
+    def record(self, status: Dict[str, Any]):
+        """Queues the current state of a job (a DownloadStatus dict) for the next flush."""
+        with self._pending_lock:
+            self._pending[status["download_id"]] = status
+
+    def record_queued(self, download_id: str, job: Optional[str]):
+        """Queues a change to the queue journal: a job (as JSON) to keep, or None to drop it."""
+        with self._pending_lock:
+            self._queue_pending[download_id] = job
+
+    def load_queue(self) -> List[Dict[str, Any]]:
+        """(Blocking) Returns the journaled download jobs in the order they were added."""
+        rows = self._select("SELECT job FROM download_queue ORDER BY rowid")
+        return [json.loads(job) for (job,) in rows]
+
+    def flush(self) -> int:
+        """
+        (Blocking) Writes all pending job states and queue journal changes in one
+        transaction. Returns how many.
+        """
+        with self._pending_lock:
+            pending, self._pending = self._pending, {}
+            queue_pending, self._queue_pending = self._queue_pending, {}
+        if not pending and not queue_pending:
+            return 0
+        now = time.time()
+        rows = [
+            (
+                status["download_id"],
+                status.get("repo_id") or "",
+                status.get("filename") or "",
+                status["status"],
+                status.get("created_at") or now,
+                now,
+                status.get("finished_at"),
+                json.dumps(status, default=str),
+            )
+            for status in pending.values()
+        ]
+        queued = [(download_id, job) for download_id, job in queue_pending.items() if job]
+        dropped = [(download_id,) for download_id, job in queue_pending.items() if job is None]
+        try:
+            with self._db_lock:
+                connection = self._connect()
+                with connection:
+                    connection.executemany(_UPSERT, rows)
+                    connection.executemany(_QUEUE_UPSERT, queued)
+                    connection.executemany(
+                        "DELETE FROM download_queue WHERE download_id = ?", dropped
+                    )
+        except sqlite3.Error as e:
+            logger.error(f"Error writing download history: {e}")
+            # Keep the changes for the next attempt unless newer ones arrived meanwhile.
+            with self._pending_lock:
+                for download_id, status in pending.items():
+                    self._pending.setdefault(download_id, status)
+                for download_id, job in queue_pending.items():
+                    self._queue_pending.setdefault(download_id, job)
+            return 0
+        return len(rows) + len(queue_pending)
+
+    async def run_flusher(self):
+        """Flushes pending records periodically. Meant to run as a background task."""
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            if self._pending or self._queue_pending:
+                await asyncio.to_thread(self.flush)
+
+    def close(self):
+        """(Blocking) Writes what is pending and closes the database."""
+        self.flush()
+        with self._db_lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def _select(self, sql: str, params: Iterable[Any] = ()) -> List[Tuple]:
+        """(Blocking) Runs a query after writing pending records, so results are current."""
+        self.flush()
+        try:
+            with self._db_lock:
+                return self._connect().execute(sql, tuple(params)).fetchall()
+        except sqlite3.Error as e:
+            logger.error(f"Error reading download history: {e}")
+            return []
+
+    def query(
+        self,
+        statuses: Optional[List[str]] = None,
+        repo_id: Optional[str] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        page: int = 1,
+        limit: int = 50,
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        (Blocking) Returns one page of job records, newest first, and the total number
+        of records matching the filters. `since`/`until` bound the creation time.
+        """
+        conditions, params = [], []
+        if statuses:
+            conditions.append(f"status IN ({', '.join('?' for _ in statuses)})")
+            params.extend(statuses)
+        if repo_id:
+            conditions.append("repo_id = ?")
+            params.append(repo_id)
+        if since is not None:
+            conditions.append("created_at >= ?")
+            params.append(since)
+        if until is not None:
+            conditions.append("created_at < ?")
+            params.append(until)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        total_rows = self._select(f"SELECT COUNT(*) FROM downloads {where}", params)
+        rows = self._select(
+            f"SELECT record FROM downloads {where} "
+            "ORDER BY created_at DESC, rowid DESC LIMIT ? OFFSET ?",
+            [*params, limit, (page - 1) * limit],
+        )
+        total = total_rows[0][0] if total_rows else 0
+        return [json.loads(record) for (record,) in rows], total
+
+    def get_recent_finished(self, limit: int) -> List[Dict[str, Any]]:
+        """(Blocking) Returns the most recently finished job records, newest first."""
+        rows = self._select(
+            f"SELECT record FROM downloads WHERE status IN ({_FINISHED_PLACEHOLDERS}) "
+            "ORDER BY finished_at DESC LIMIT ?",
+            [*FINISHED_STATES, limit],
+        )
+        return [json.loads(record) for (record,) in rows]
+
+    def mark_interrupted(self, keep: Iterable[str]) -> int:
+        """
+        (Blocking) Marks jobs that were still unfinished when the app stopped as failed,
+        except the `keep` ones (downloads being restored from the queue journal).
+        """
+        keep = set(keep)
+        rows = self._select(
+            f"SELECT record FROM downloads WHERE status NOT IN ({_FINISHED_PLACEHOLDERS})",
+            FINISHED_STATES,
+        )
+        now = time.time()
+        interrupted = 0
+        for (record,) in rows:
+            status = json.loads(record)
+            if status["download_id"] in keep:
+                continue
+            status.update(
+                status="error",
+                error_message="Interrupted by an application restart.",
+                status_text="Interrupted",
+                queue_position=None,
+                finished_at=now,
+            )
+            self.record(status)
+            interrupted += 1
+        self.flush()
+        return interrupted
@@ -0,0 +1,63 @@
+# backend/core/file_management/download_queue_store.py
+import json
+import logging
+import pathlib
+from typing import Dict, Any, List
+
+from ..constants.constants import LEGACY_DOWNLOAD_QUEUE_FILE_PATH
+from .download_history import DownloadHistoryStore
+
+logger = logging.getLogger(__name__)
+
+
+class DownloadQueueStore:
+    """
+    Journals unfinished download jobs so that queued and running downloads can be
+    restored after the backend restarts.
+
+    The journal lives in the download history database and is written behind with
+    the history records (see DownloadHistoryStore), so adding or removing a job
+    never writes to disk on the event loop. The jobs themselves are kept in memory.
+    """
+
+    def __init__(
+        self,
+        history: DownloadHistoryStore,
+        legacy_file_path: pathlib.Path = LEGACY_DOWNLOAD_QUEUE_FILE_PATH,
+    ):
+        self.history = history
+        self.jobs: Dict[str, Dict[str, Any]] = {
+            job["download_id"]: job for job in history.load_queue()
+        }
+        self._import_legacy_journal(legacy_file_path)
+
+    def _import_legacy_journal(self, file_path: pathlib.Path):
+        """(Blocking) Moves the jobs of an older JSON queue journal into the database."""
+        if not file_path.exists():
+            return
+        try:
+            with open(file_path, "r") as f:
+                jobs = [job for job in json.load(f) if job["download_id"] not in self.jobs]
+        except (json.JSONDecodeError, TypeError, KeyError) as e:
+            logger.error(f"Error reading legacy download queue file: {e}. Ignoring it.")
+            return
+        for job in jobs:
+            self.add(job)
+        if jobs and not self.history.flush():
+            return  # Not written; try again on the next start.
+        file_path.unlink(missing_ok=True)
+        logger.info(f"Moved the download queue from {file_path} into the history database.")
+
+    def add(self, job: Dict[str, Any]):
+        """Records a job. The job dict must be JSON-serializable and contain a 'download_id'."""
+        self.jobs[job["download_id"]] = job
+        # Serialized now, since the scheduler keeps changing the job dict in place.
+        self.history.record_queued(job["download_id"], json.dumps(job, default=str))
+
+    def remove(self, download_id: str):
+        """Forgets a job once it has finished or was cancelled by the user."""
+        if self.jobs.pop(download_id, None) is not None:
+            self.history.record_queued(download_id, None)
+
+    def get_all(self) -> List[Dict[str, Any]]:
+        return list(self.jobs.values())
@@ -0,0 +1,295 @@
+# backend/core/file_management/download_scheduler.py
+import asyncio
+import itertools
+import logging
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, Any, Optional, List, Callable, Coroutine, Literal
+
+from .download_tracker import download_tracker
+
+logger = logging.getLogger(__name__)
+
+JobRunner = Callable[[Dict[str, Any]], Coroutine[Any, Any, None]]
+JobChangeCallback = Callable[[Dict[str, Any]], None]
+# Returns why a job cannot start yet, or None if it may start.
+AdmissionCheck = Callable[[Dict[str, Any]], Optional[str]]
+MoveDirection = Literal["up", "down"]
+
+
+@dataclass
+class ScheduledJob:
+    """A download job waiting for, or occupying, an active download slot."""
+
+    job: Dict[str, Any]
+    sequence: int
+    task: Optional[asyncio.Task] = field(default=None, repr=False)
+    hold_reason: Optional[str] = None  # Why the admission check keeps it waiting
+    # Set while the running task is being stopped to put the job back in the queue
+    # (paused or held); `cancelled` wins over it.
+    requeue: bool = False
+    cancelled: bool = False  # Cancelled by the user; never queued again
+
+    @property
+    def download_id(self) -> str:
+        return self.job["download_id"]
+
+    @property
+    def host(self) -> str:
+        return self.job.get("host") or ""
+
+    @property
+    def priority(self) -> int:
+        return self.job.get("priority", 0)
+
+    @property
+    def paused(self) -> bool:
+        return self.job.get("paused", False)
+
+    def sort_key(self):
+        # Higher priority first, then first-come-first-served.
+        return (-self.priority, self.sequence)
+
+
+class DownloadScheduler:
+    """
+    Admits download jobs into a bounded number of active slots, overall and per
+    host. Jobs beyond the limits wait in a priority queue in the tracker's
+    'pending' state and can be reprioritized, reordered, paused and resumed.
+    An optional admission check can hold back a job that would otherwise start
+    (e.g. for lack of disk space); it is asked again on every dispatch. A running
+    job can be held the same way (see `hold`), which unlike pausing needs no user
+    action to resume it.
+    """
+
+    def __init__(
+        self,
+        run_job: JobRunner,
+        max_active: int,
+        max_per_host: int,
+        on_job_changed: Optional[JobChangeCallback] = None,
+        can_start: Optional[AdmissionCheck] = None,
+    ):
+        """
+        Args:
+            run_job: Coroutine function that performs a job's download.
+            max_active: Maximum number of downloads running at the same time.
+            max_per_host: Maximum number of running downloads against one host.
+            on_job_changed: Called with the job dict whenever its priority or paused
+                            flag changes, so the caller can persist it.
+            can_start: Admission check run before a job starts; a returned reason
+                       keeps the job queued and is shown as its status text.
+        """
+        self._run_job = run_job
+        self.max_active = max_active
+        self.max_per_host = max_per_host
+        self._on_job_changed = on_job_changed
+        self._can_start = can_start
+        self._sequence = itertools.count()
+        self.queued: Dict[str, ScheduledJob] = {}
+        self.active: Dict[str, ScheduledJob] = {}
+
+    def _ordered_queue(self) -> List[ScheduledJob]:
+        return sorted(self.queued.values(), key=ScheduledJob.sort_key)
+
+    def _job_changed(self, entry: ScheduledJob):
+        if self._on_job_changed:
+            self._on_job_changed(entry.job)
+
+    def submit(self, job: Dict[str, Any]):
+        """Queues a job (already registered with the tracker) and starts it if a slot is free."""
+        entry = ScheduledJob(job=job, sequence=next(self._sequence))
+        self.queued[entry.download_id] = entry
+        if entry.paused:
+            download_tracker.set_queue_state(entry.download_id, None, paused=True)
+        self._dispatch()
+
+    def get_job(self, download_id: str) -> Optional[Dict[str, Any]]:
+        """Returns the job dict of a queued or running download."""
+        entry = self.queued.get(download_id) or self.active.get(download_id)
+        return entry.job if entry else None
+
+    def update_limits(self, max_active: Optional[int] = None, max_per_host: Optional[int] = None):
+        """Changes the concurrency limits. Running jobs are never interrupted."""
+        if max_active is not None:
+            self.max_active = max(1, max_active)
+        if max_per_host is not None:
+            self.max_per_host = max(1, max_per_host)
+        self._dispatch()
+
+    def dispatch(self):
+        """Re-runs admission, e.g. after conditions checked by `can_start` changed."""
+        self._dispatch()
+
+    def _dispatch(self):
+        """Starts as many queued jobs as the limits allow, then refreshes queue positions."""
+        active_per_host = Counter(entry.host for entry in self.active.values())
+        for entry in self._ordered_queue():
+            if len(self.active) >= self.max_active:
+                break
+            if entry.paused or active_per_host[entry.host] >= self.max_per_host:
+                continue
+            entry.hold_reason = self._can_start(entry.job) if self._can_start else None
+            if entry.hold_reason:
+                continue
+            del self.queued[entry.download_id]
+            self.active[entry.download_id] = entry
+            active_per_host[entry.host] += 1
+            entry.task = asyncio.create_task(self._run(entry))
+            download_tracker.attach_task(entry.download_id, entry.task)
+            logger.info(f"Scheduler started download {entry.download_id}.")
+
+        position = 0
+        for entry in self._ordered_queue():
+            if not entry.paused:
+                position += 1
+                download_tracker.set_queue_state(
+                    entry.download_id, position, reason=entry.hold_reason
+                )
+
+    async def _run(self, entry: ScheduledJob):
+        requeue = False
+        try:
+            await self._run_job(entry.job)
+        except asyncio.CancelledError:
+            requeue = entry.requeue and not entry.cancelled
+            raise
+        finally:
+            self.active.pop(entry.download_id, None)
+            entry.task = None
+            entry.requeue = False
+            if requeue:
+                # A paused or held job goes back to the queue; its partial file lets it resume later.
+                self.queued[entry.download_id] = entry
+            elif entry.cancelled and not download_tracker.is_finished(entry.download_id):
+                # Cancelled while it was being stopped, after it had reported the stop.
+                download_tracker.set_stopping(entry.download_id, False)
+                await download_tracker.fail_download(
+                    entry.download_id, "Download cancelled by user.", cancelled=True
+                )
+            self._dispatch()
+
+    async def cancel(self, download_id: str) -> bool:
+        """
+        Cancels a job. A queued job is cancelled immediately; the task of a running
+        one (even one being paused or held) is cancelled and the job is not queued
+        again. Returns False if the job is not scheduled here.
+        """
+        entry = self.active.get(download_id)
+        if entry:
+            entry.cancelled = True
+            entry.requeue = False
+            download_tracker.set_stopping(download_id, False)
+            if entry.task and not entry.task.done():
+                entry.task.cancel()
+            return True
+        entry = self.queued.pop(download_id, None)
+        if not entry:
+            return False
+        await download_tracker.fail_download(
+            download_id, "Download cancelled by user.", cancelled=True
+        )
+        self._dispatch()
+        return True
+
+    def set_priority(self, download_id: str, priority: int) -> bool:
+        entry = self.queued.get(download_id) or self.active.get(download_id)
+        if not entry:
+            return False
+        entry.job["priority"] = priority
+        download_tracker.set_priority(download_id, priority)
+        self._job_changed(entry)
+        self._dispatch()
+        return True
+
+    def move(self, download_id: str, direction: MoveDirection) -> bool:
+        """Swaps a queued job with its neighbour in the queue order."""
+        ordered = [entry for entry in self._ordered_queue() if not entry.paused]
+        index = next((i for i, e in enumerate(ordered) if e.download_id == download_id), None)
+        if index is None:
+            return False
+        neighbour_index = index - 1 if direction == "up" else index + 1
+        if not 0 <= neighbour_index < len(ordered):
+            return True  # Already at the edge of the queue.
+
+        entry, neighbour = ordered[index], ordered[neighbour_index]
+        entry.sequence, neighbour.sequence = neighbour.sequence, entry.sequence
+        if entry.priority != neighbour.priority:
+            entry_priority = entry.priority
+            entry.job["priority"] = neighbour.priority
+            neighbour.job["priority"] = entry_priority
+            for changed in (entry, neighbour):
+                download_tracker.set_priority(changed.download_id, changed.priority)
+                self._job_changed(changed)
+        self._dispatch()
+        return True
+
+    def pause(self, download_id: str, reason: Optional[str] = None) -> bool:
+        """
+        Pauses a queued or running job. A running job is stopped and keeps its partial
+        file. `reason` is shown instead of the plain 'Paused' status text.
+        """
+        entry = self.queued.get(download_id) or self.active.get(download_id)
+        if not entry or entry.paused:
+            return False
+        entry.job["paused"] = True
+        self._job_changed(entry)
+        download_tracker.set_queue_state(download_id, None, paused=True, reason=reason)
+        if entry.task and not entry.task.done():
+            entry.requeue = True
+            download_tracker.set_stopping(download_id, True)
+            entry.task.cancel()
+        else:
+            self._dispatch()
+        return True
+
+    def hold(self, download_id: str, reason: str) -> bool:
+        """
+        Stops a running job and queues it again, not paused, with `reason` as its
+        hold reason. It keeps its partial file and starts again as soon as the
+        admission check lets it on a later dispatch.
+        """
+        entry = self.active.get(download_id)
+        if not entry or entry.paused or entry.requeue or entry.cancelled:
+            return False
+        if not entry.task or entry.task.done():
+            return False
+        entry.requeue = True
+        entry.hold_reason = reason
+        download_tracker.set_queue_state(download_id, None, reason=reason)
+        download_tracker.set_stopping(download_id, True)
+        entry.task.cancel()
+        return True
+
+    async def recheck_running(
+        self, check: AdmissionCheck, on_held: Optional[JobChangeCallback] = None
+    ) -> List[str]:
+        """
+        (Blocking `check`) Asks `check` again for every running job, newest and least
+        important first so the oldest jobs keep running, and holds the jobs it
+        rejects. `on_held` is called for each job actually held, before the next
+        job is checked. Returns the ids of the held jobs.
+        """
+        held = []
+        for entry in sorted(self.active.values(), key=ScheduledJob.sort_key, reverse=True):
+            reason = await asyncio.to_thread(check, entry.job)
+            if reason and self.hold(entry.download_id, reason):
+                held.append(entry.download_id)
+                if on_held:
+                    on_held(entry.job)
+        self._dispatch()
+        return held
+
+    def resume(self, download_id: str) -> bool:
+        """
+        Resumes a paused job. One whose task is still being stopped stays unpaused
+        and is queued again (and started as soon as admitted) once the task is done.
+        """
+        entry = self.queued.get(download_id) or self.active.get(download_id)
+        if not entry or not entry.paused or entry.cancelled:
+            return False
+        entry.job["paused"] = False
+        self._job_changed(entry)
+        download_tracker.set_queue_state(download_id, None)
+        self._dispatch()
+        return True
@@ -2,6 +2,8 @@
 import uuid
 import logging
 import asyncio
+import math
+import time
 from typing import (
     Dict,
     Any,
@@ -10,17 +12,133 @@ from typing import (
     Coroutine,
     List,
     Literal,
+    Set,
+    Tuple,
+)
+from dataclasses import dataclass, field, fields
+
+from .download_history import DownloadHistoryStore, FINISHED_STATES
+from ..constants.constants import (
+    DOWNLOAD_HISTORY_RECENT_LIMIT,
+    DEFAULT_PROGRESS_BROADCAST_RATE,
+    PROGRESS_BROADCAST_MIN_STEP_PERCENT,
+    THROUGHPUT_EWMA_SECONDS,
+    DOWNLOAD_STALL_FLAG_SECONDS,
+    DOWNLOAD_METRICS_INTERVAL_SECONDS,
 )
-from dataclasses import dataclass, field
 
 logger = logging.getLogger(__name__)
 
 # --- Define a strict type for download/task states ---
-DownloadState = Literal["pending", "downloading", "running", "completed", "error", "cancelled"]
+DownloadState = Literal[
+    "pending", "paused", "downloading", "running", "completed", "error", "cancelled"
+]
 
 BroadcastCallable = Callable[[Dict[str, Any]], Coroutine[Any, Any, None]]
 
 
+@dataclass
+class FileProgress:
+    """Progress of one file within a multi-file download."""
+
+    filename: str
+    total_size_bytes: int = 0
+    downloaded_bytes: int = 0
+    status: DownloadState = "pending"
+    error_message: Optional[str] = None
+    status_text: Optional[str] = None
+    deduplicated: bool = False
+    from_hf_cache: bool = False
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "filename": self.filename,
+            "total_size_bytes": self.total_size_bytes,
+            "downloaded_bytes": self.downloaded_bytes,
+            "status": self.status,
+            "error_message": self.error_message,
+            "status_text": self.status_text,
+            "deduplicated": self.deduplicated,
+            "from_hf_cache": self.from_hf_cache,
+        }
+
+
+@dataclass
+class TransferMetrics:
+    """Transfer rate, ETA and timings of a download, sampled from its byte counts."""
+
+    throughput: float = 0.0  # Exponentially weighted bytes per second
+    peak_throughput: float = 0.0
+    eta_seconds: Optional[float] = None
+    elapsed_seconds: float = 0.0  # Time spent transferring, without queueing and pauses
+    write_blocked_seconds: float = 0.0  # Time the network side waited for the disk
+    stalled: bool = False  # No data for DOWNLOAD_STALL_FLAG_SECONDS
+    _sample_time: Optional[float] = field(default=None, repr=False)
+    _sample_bytes: int = field(default=0, repr=False)
+    _data_time: float = field(default=0.0, repr=False)  # When data last arrived
+
+    @property
+    def sampling(self) -> bool:
+        return self._sample_time is not None
+
+    def start(self, downloaded_bytes: int):
+        """Starts (or resumes) sampling from the current byte count."""
+        now = time.monotonic()
+        self._sample_time, self._sample_bytes, self._data_time = now, downloaded_bytes, now
+        self.stalled = False
+
+    def rebase(self, downloaded_bytes: int):
+        """Accepts a jump of the byte count that was not transferred, e.g. a deduplicated file."""
+        self._sample_bytes = downloaded_bytes
+
+    def sample(self, downloaded_bytes: int, total_size: int) -> bool:
+        """
+        Folds the bytes received since the last sample into the rate, which decays
+        towards zero while nothing arrives. Returns True if the stall flag changed.
+        """
+        if self._sample_time is None:
+            self.start(downloaded_bytes)
+            return False
+        now = time.monotonic()
+        elapsed = now - self._sample_time
+        received = max(0, downloaded_bytes - self._sample_bytes)
+        self._sample_time, self._sample_bytes = now, downloaded_bytes
+        self.elapsed_seconds += elapsed
+        if elapsed > 0:
+            weight = 1 - math.exp(-elapsed / THROUGHPUT_EWMA_SECONDS)
+            self.throughput += weight * (received / elapsed - self.throughput)
+            self.peak_throughput = max(self.peak_throughput, self.throughput)
+        if received:
+            self._data_time = now
+
+        was_stalled = self.stalled
+        self.stalled = now - self._data_time >= DOWNLOAD_STALL_FLAG_SECONDS
+        remaining = total_size - downloaded_bytes
+        self.eta_seconds = (
+            remaining / self.throughput
+            if total_size > 0 and self.throughput >= 1 and not self.stalled
+            else None
+        )
+        return self.stalled != was_stalled
+
+    def stop(self):
+        """Ends sampling when the download finishes or leaves its slot. Totals are kept."""
+        self._sample_time = None
+        self.throughput = 0.0
+        self.eta_seconds = None
+        self.stalled = False
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "throughput": round(self.throughput, 1),
+            "peak_throughput": round(self.peak_throughput, 1),
+            "eta_seconds": round(self.eta_seconds, 1) if self.eta_seconds is not None else None,
+            "elapsed_seconds": round(self.elapsed_seconds, 1),
+            "write_blocked_seconds": round(self.write_blocked_seconds, 2),
+            "stalled": self.stalled,
+        }
+
+
 @dataclass
 class DownloadStatus:
     """Holds the state and metadata of a single download or background task."""
@@ -35,7 +153,23 @@ class DownloadStatus:
     error_message: Optional[str] = None
     status_text: Optional[str] = None  # ADDED: For in-progress status messages
     target_path: Optional[str] = None
+    queue_position: Optional[int] = None  # 1-based position while waiting for a download slot
+    priority: int = 0
+    sha256: Optional[str] = None  # Hash of the finished file, computed while downloading
+    deduplicated: bool = False  # Completed from an identical local file instead of downloading
+    from_hf_cache: bool = False  # Completed from the local huggingface_hub cache
+    # Per-file progress of a multi-file (snapshot) download, keyed by repo filename.
+    files: Optional[Dict[str, FileProgress]] = None
+    # Files found in (hits) or missing from (misses) the local huggingface_hub cache.
+    cache_hits: int = 0
+    cache_misses: int = 0
+    created_at: float = field(default_factory=time.time)
+    finished_at: Optional[float] = None
+    metrics: TransferMetrics = field(default_factory=TransferMetrics)
     task: Optional[asyncio.Task] = field(default=None, repr=False, compare=False)
+    # Set while the scheduler stops the task to put the job back in its queue (a pause
+    # or a hold), so the task's cancellation is not taken for a user cancellation.
+    stopping: bool = field(default=False, repr=False, compare=False)
 
     def to_dict(self) -> Dict[str, Any]:
         """Converts the dataclass to a dictionary, excluding the task object."""
@@ -50,7 +184,45 @@ class DownloadStatus:
             "error_message": self.error_message,
             "status_text": self.status_text,  # ADDED
             "target_path": self.target_path,
+            "queue_position": self.queue_position,
+            "priority": self.priority,
+            "sha256": self.sha256,
+            "deduplicated": self.deduplicated,
+            "from_hf_cache": self.from_hf_cache,
+            "files": [f.to_dict() for f in self.files.values()] if self.files else None,
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+            **self.metrics.to_dict(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "DownloadStatus":
+        """Rebuilds a status from its `to_dict` form, e.g. a record from the history."""
+        values = {
+            k: v
+            for k, v in data.items()
+            if k in cls.__dataclass_fields__ and k not in ("task", "metrics")
         }
+        if data.get("files"):
+            values["files"] = {f["filename"]: FileProgress(**f) for f in data["files"]}
+        values["metrics"] = TransferMetrics(
+            **{f.name: data[f.name] for f in fields(TransferMetrics) if f.name in data}
+        )
+        return cls(**values)
+
+    def refresh_file_totals(self):
+        """Recomputes the aggregate byte counts and status text of a multi-file download."""
+        self.downloaded_bytes = sum(f.downloaded_bytes for f in self.files.values())
+        self.total_size_bytes = sum(f.total_size_bytes for f in self.files.values())
+        self.progress = (
+            round((self.downloaded_bytes / self.total_size_bytes) * 100, 2)
+            if self.total_size_bytes > 0
+            else 0
+        )
+        done = sum(1 for f in self.files.values() if f.status == "completed")
+        self.status_text = f"{done}/{len(self.files)} files"
 
 
 class DownloadTracker:
@@ -63,8 +235,102 @@ class DownloadTracker:
             cls._instance = super(DownloadTracker, cls).__new__(cls)
             cls._instance.active_downloads = {}
             cls._instance.broadcast_callback = None
+            cls._instance.history = None
+            cls._instance.progress_interval = 1 / DEFAULT_PROGRESS_BROADCAST_RATE
+            # Jobs with progress that has not been broadcast yet.
+            cls._instance._progress_dirty: Set[str] = set()
+            # Time and progress of the last broadcast of each job.
+            cls._instance._last_broadcast: Dict[str, Tuple[float, float]] = {}
+            cls._instance._progress_flush_task: Optional[asyncio.Task] = None
+            cls._instance._engine_peak_throughput = 0.0
+            cls._instance.broadcast_stats = {
+                "progress_updates": 0,
+                "messages_sent": 0,
+                "messages_saved": 0,
+            }
         return cls._instance
 
+    def set_progress_broadcast_rate(self, rate: float):
+        """Limits progress broadcasts to `rate` per second and job."""
+        self.progress_interval = 1 / rate
+
+    def add_write_blocked_time(self, download_id: str, seconds: float):
+        """Adds time a download's network side spent waiting for its disk writes."""
+        if download_id in self.active_downloads:
+            self.active_downloads[download_id].metrics.write_blocked_seconds += seconds
+
+    def get_engine_metrics(self) -> Dict[str, Any]:
+        """Aggregate transfer metrics of all running downloads."""
+        running = [s for s in self.active_downloads.values() if s.metrics.sampling]
+        throughput = sum(s.metrics.throughput for s in running)
+        remaining = sum(
+            max(0, s.total_size_bytes - s.downloaded_bytes)
+            for s in running
+            if s.total_size_bytes > 0
+        )
+        self._engine_peak_throughput = max(self._engine_peak_throughput, throughput)
+        return {
+            "active_downloads": len(running),
+            "stalled_downloads": sum(1 for s in running if s.metrics.stalled),
+            "throughput": round(throughput, 1),
+            "peak_throughput": round(self._engine_peak_throughput, 1),
+            "remaining_bytes": remaining,
+            "eta_seconds": round(remaining / throughput, 1) if throughput >= 1 else None,
+            "write_blocked_seconds": round(
+                sum(s.metrics.write_blocked_seconds for s in running), 2
+            ),
+        }
+
+    async def run_metrics_monitor(self):
+        """
+        Refreshes the metrics of running downloads, so rates decay and stalls are
+        flagged while no data arrives, and broadcasts the engine totals while anything
+        runs. Meant to run as a background task.
+        """
+        was_running = False
+        while True:
+            await asyncio.sleep(DOWNLOAD_METRICS_INTERVAL_SECONDS)
+            for status in list(self.active_downloads.values()):
+                if not status.metrics.sampling:
+                    continue
+                if status.metrics.sample(status.downloaded_bytes, status.total_size_bytes):
+                    if status.metrics.stalled:
+                        logger.warning(f"Download {status.download_id} stalled.")
+                    await self._broadcast({"type": "update", "data": status.to_dict()})
+                else:
+                    await self._broadcast_progress(status)
+            metrics = self.get_engine_metrics()
+            running = metrics["active_downloads"] > 0
+            if running or was_running:
+                await self._broadcast({"type": "engine_metrics", "data": metrics})
+            was_running = running
+
+    def get_broadcast_stats(self) -> Dict[str, Any]:
+        return {**self.broadcast_stats, "progress_broadcast_rate": 1 / self.progress_interval}
+
+    def set_history_store(self, history: Optional[DownloadHistoryStore]):
+        """Every state change is recorded in `history` from now on."""
+        self.history = history
+
+    def restore_finished(self, records: List[Dict[str, Any]]):
+        """Shows finished downloads of an earlier session again, e.g. after a restart."""
+        for record in records:
+            if record["download_id"] not in self.active_downloads:
+                self.active_downloads[record["download_id"]] = DownloadStatus.from_dict(record)
+
+    async def _evict_finished(self):
+        """
+        Forgets the oldest finished downloads beyond DOWNLOAD_HISTORY_RECENT_LIMIT.
+        They stay in the history, so only the in-memory window is bounded.
+        """
+        finished = [s for s in self.active_downloads.values() if s.status in FINISHED_STATES]
+        excess = len(finished) - DOWNLOAD_HISTORY_RECENT_LIMIT
+        if excess <= 0:
+            return
+        finished.sort(key=lambda s: s.finished_at or s.created_at)
+        for status in finished[:excess]:
+            await self.remove_download(status.download_id)
+
     def set_broadcast_callback(self, callback: Optional[BroadcastCallable]):
         self.broadcast_callback = callback
         logger.info(
@@ -72,39 +338,224 @@ class DownloadTracker:
         )
 
     async def _broadcast(self, data: Dict[str, Any]):
+        if data.get("type") == "update":
+            download_id = data["data"]["download_id"]
+            self._last_broadcast[download_id] = (time.monotonic(), data["data"]["progress"])
+            if download_id in self._progress_dirty:
+                # Pending progress goes out with this message instead of on its own.
+                self._progress_dirty.discard(download_id)
+                self.broadcast_stats["messages_saved"] += 1
+            if self.history:
+                self.history.record(data["data"])
+        self.broadcast_stats["messages_sent"] += 1
         if self.broadcast_callback:
             try:
                 await self.broadcast_callback(data)
             except Exception as e:
                 logger.error(f"Error during broadcast: {e}", exc_info=True)
 
+    async def _broadcast_progress(self, status: DownloadStatus):
+        """
+        Broadcasts a progress change, at most once per progress interval and job
+        unless progress moved by PROGRESS_BROADCAST_MIN_STEP_PERCENT. Updates in
+        between are merged: the job's latest state is sent when the interval ends.
+        """
+        self.broadcast_stats["progress_updates"] += 1
+        last_time, last_progress = self._last_broadcast.get(status.download_id, (0.0, 0.0))
+        if (
+            time.monotonic() - last_time >= self.progress_interval
+            or abs(status.progress - last_progress) >= PROGRESS_BROADCAST_MIN_STEP_PERCENT
+        ):
+            await self._broadcast({"type": "update", "data": status.to_dict()})
+            return
+        if status.download_id in self._progress_dirty:
+            self.broadcast_stats["messages_saved"] += 1
+        else:
+            self._progress_dirty.add(status.download_id)
+        if self._progress_flush_task is None or self._progress_flush_task.done():
+            self._progress_flush_task = asyncio.create_task(self._flush_progress())
+
+    async def _flush_progress(self):
+        """Broadcasts the latest state of every job with merged progress once it is due."""
+        while self._progress_dirty:
+            now = time.monotonic()
+            next_due = now + self.progress_interval
+            for download_id in list(self._progress_dirty):
+                status = self.active_downloads.get(download_id)
+                if status is None:
+                    self._progress_dirty.discard(download_id)
+                    continue
+                due = self._last_broadcast.get(download_id, (0.0, 0.0))[0] + self.progress_interval
+                if due <= now:
+                    self._progress_dirty.discard(download_id)
+                    await self._broadcast({"type": "update", "data": status.to_dict()})
+                else:
+                    next_due = min(next_due, due)
+            if self._progress_dirty:
+                await asyncio.sleep(max(0.0, next_due - time.monotonic()))
+
     def start_tracking(
-        self, download_id: str, repo_id: str, filename: str, task: asyncio.Task
+        self,
+        download_id: str,
+        repo_id: str,
+        filename: str,
+        task: Optional[asyncio.Task],
+        priority: int = 0,
     ) -> DownloadStatus:
-        """Registers a new download/task. This is a synchronous operation."""
+        """
+        Registers a new download/task. This is a synchronous operation.
+        Scheduled downloads are registered without a task and get one via `attach_task`.
+        """
         status = DownloadStatus(
-            download_id=download_id, filename=filename, repo_id=repo_id, status="pending", task=task
+            download_id=download_id,
+            filename=filename,
+            repo_id=repo_id,
+            status="pending",
+            priority=priority,
+            task=task,
         )
         self.active_downloads[download_id] = status
         logger.info(f"Started tracking download {download_id} for '{filename}'.")
         asyncio.create_task(self._broadcast({"type": "update", "data": status.to_dict()}))
         return status
 
+    def attach_task(self, download_id: str, task: asyncio.Task):
+        """Binds the running task of a scheduled download once it leaves the queue."""
+        if download_id in self.active_downloads:
+            status = self.active_downloads[download_id]
+            status.task = task
+            status.stopping = False
+            status.queue_position = None
+            status.status_text = "Starting..."
+            asyncio.create_task(self._broadcast({"type": "update", "data": status.to_dict()}))
+
+    def is_finished(self, download_id: str) -> bool:
+        """Whether a download has reached a final state (or is no longer tracked)."""
+        status = self.active_downloads.get(download_id)
+        return status is None or status.status in FINISHED_STATES
+
+    def set_stopping(self, download_id: str, stopping: bool):
+        """Marks whether the scheduler, not the user, is cancelling the task of a download."""
+        if download_id in self.active_downloads:
+            self.active_downloads[download_id].stopping = stopping
+
+    def set_queue_state(
+        self,
+        download_id: str,
+        position: Optional[int],
+        paused: bool = False,
+        reason: Optional[str] = None,
+    ):
+        """
+        Marks a scheduled download as waiting at a queue position, or as paused.
+        `reason` explains why it is held back and replaces the default status text.
+        """
+        if download_id not in self.active_downloads:
+            return
+        status = self.active_downloads[download_id]
+        new_status: DownloadState = "paused" if paused else "pending"
+        new_text = "Paused" if paused else (f"Queued (#{position})" if position else "Queued")
+        if reason:
+            new_text = f"{new_text}. {reason}"
+        if (status.status, status.queue_position, status.status_text) == (
+            new_status,
+            position,
+            new_text,
+        ):
+            return
+        status.status = new_status
+        status.queue_position = position
+        status.metrics.stop()
+        status.status_text = new_text
+        asyncio.create_task(self._broadcast({"type": "update", "data": status.to_dict()}))
+
+    def set_files(self, download_id: str, files: Dict[str, int]):
+        """Turns a download into a multi-file download of `files` (repo filename -> size)."""
+        if download_id in self.active_downloads:
+            status = self.active_downloads[download_id]
+            status.files = {
+                name: FileProgress(filename=name, total_size_bytes=size or 0)
+                for name, size in files.items()
+            }
+            status.refresh_file_totals()
+
+    def set_priority(self, download_id: str, priority: int):
+        if download_id in self.active_downloads:
+            status = self.active_downloads[download_id]
+            status.priority = priority
+            asyncio.create_task(self._broadcast({"type": "update", "data": status.to_dict()}))
+
     async def update_progress_from_bytes(
-        self, download_id: str, downloaded_bytes: int, total_size: int
+        self,
+        download_id: str,
+        downloaded_bytes: int,
+        total_size: int,
+        file_key: Optional[str] = None,
     ):
-        """Updates progress based on byte counts, for file downloads."""
+        """
+        Updates progress based on byte counts, for file downloads. With `file_key`,
+        only that file of a multi-file download is updated, and the totals follow.
+        """
         if download_id in self.active_downloads:
             status = self.active_downloads[download_id]
-            if status.status not in ["downloading", "running"]:
+            state_changed = status.status not in ["downloading", "running"]
+            if state_changed:
                 status.status = "downloading"
-            status.downloaded_bytes = downloaded_bytes
-            status.total_size_bytes = total_size
-            status.progress = (
-                round((downloaded_bytes / total_size) * 100, 2) if total_size > 0 else 0
+                status.status_text = None
+            if file_key and status.files and file_key in status.files:
+                file_progress = status.files[file_key]
+                state_changed = state_changed or file_progress.status != "downloading"
+                file_progress.status = "downloading"
+                file_progress.downloaded_bytes = downloaded_bytes
+                file_progress.total_size_bytes = total_size
+                status.refresh_file_totals()
+            else:
+                status.downloaded_bytes = downloaded_bytes
+                status.total_size_bytes = total_size
+                status.progress = (
+                    round((downloaded_bytes / total_size) * 100, 2) if total_size > 0 else 0
+                )
+            if status.metrics.sampling:
+                if status.metrics.sample(status.downloaded_bytes, status.total_size_bytes):
+                    state_changed = True  # No longer stalled
+            else:
+                status.metrics.start(status.downloaded_bytes)
+            if state_changed:
+                await self._broadcast({"type": "update", "data": status.to_dict()})
+            else:
+                await self._broadcast_progress(status)
+
+    async def record_cache_lookup(
+        self, download_id: str, hit: bool, file_key: Optional[str] = None
+    ):
+        """Counts a file of a download found in, or missing from, the local HF cache."""
+        if download_id in self.active_downloads:
+            status = self.active_downloads[download_id]
+            if hit:
+                status.cache_hits += 1
+            else:
+                status.cache_misses += 1
+            logger.debug(
+                f"Download {download_id}: HF cache {'hit' if hit else 'miss'}"
+                + (f" for '{file_key}'." if file_key else ".")
             )
             await self._broadcast({"type": "update", "data": status.to_dict()})
 
+    async def set_status_text(
+        self, download_id: str, status_text: Optional[str], file_key: Optional[str] = None
+    ):
+        """
+        Shows a transient message (e.g. a retry notice) for a running download, or
+        for one file of a multi-file download with `file_key`. None clears it.
+        """
+        if download_id in self.active_downloads:
+            status = self.active_downloads[download_id]
+            if file_key and status.files and file_key in status.files:
+                status.files[file_key].status_text = status_text
+            else:
+                status.status_text = status_text
+            await self._broadcast({"type": "update", "data": status.to_dict()})
+
     async def update_task_progress(
         self,
         task_id: str,
@@ -115,6 +566,7 @@ class DownloadTracker:
         """Updates progress for a multi-step task and can optionally update its state."""
         if task_id in self.active_downloads:
             status = self.active_downloads[task_id]
+            previous_status = status.status
 
             if new_status:
                 status.status = new_status
@@ -125,26 +577,75 @@ class DownloadTracker:
             # CHANGED: Use the new dedicated field for status text.
             status.status_text = status_text
 
-            await self._broadcast({"type": "update", "data": status.to_dict()})
+            if status.status != previous_status:
+                await self._broadcast({"type": "update", "data": status.to_dict()})
+            else:
+                await self._broadcast_progress(status)
 
-    async def complete_download(self, download_id: str, final_path: str):
+    async def complete_download(
+        self,
+        download_id: str,
+        final_path: str,
+        sha256: Optional[str] = None,
+        deduplicated: bool = False,
+        file_key: Optional[str] = None,
+        status_text: Optional[str] = None,
+        from_hf_cache: bool = False,
+    ):
         if download_id in self.active_downloads:
             status = self.active_downloads[download_id]
+            if file_key and status.files and file_key in status.files:
+                file_progress = status.files[file_key]
+                file_progress.status = "completed"
+                file_progress.downloaded_bytes = file_progress.total_size_bytes
+                file_progress.deduplicated = deduplicated
+                file_progress.from_hf_cache = from_hf_cache
+                file_progress.status_text = status_text
+                status.refresh_file_totals()
+                status.metrics.rebase(status.downloaded_bytes)
+                await self._broadcast({"type": "update", "data": status.to_dict()})
+                return
             status.status = "completed"
             status.progress = 100.0
             status.target_path = final_path
-            status.status_text = "Completed"
+            status.sha256 = sha256
+            status.deduplicated = deduplicated
+            status.from_hf_cache = from_hf_cache
+            status.status_text = status_text or ("Deduplicated" if deduplicated else "Completed")
+            status.finished_at = time.time()
+            status.metrics.stop()
             logger.info(f"Download {download_id} completed. Path: {final_path}")
             await self._broadcast({"type": "update", "data": status.to_dict()})
+            await self._evict_finished()
 
-    async def fail_download(self, download_id: str, error_message: str, cancelled: bool = False):
+    async def fail_download(
+        self,
+        download_id: str,
+        error_message: str,
+        cancelled: bool = False,
+        file_key: Optional[str] = None,
+    ):
         if download_id in self.active_downloads:
             status = self.active_downloads[download_id]
+            if cancelled and status.stopping:
+                # The task of a paused or held download is being stopped; it is not a cancellation.
+                return
+            if file_key and status.files and file_key in status.files:
+                # Only one file failed; the multi-file job decides the overall outcome.
+                file_progress = status.files[file_key]
+                file_progress.status = "cancelled" if cancelled else "error"
+                file_progress.error_message = error_message
+                logger.error(f"Download {download_id}, file '{file_key}' failed: {error_message}")
+                await self._broadcast({"type": "update", "data": status.to_dict()})
+                return
             status.status = "cancelled" if cancelled else "error"
             status.error_message = error_message
             status.status_text = "Failed" if not cancelled else "Cancelled"
+            status.finished_at = time.time()
+            status.metrics.stop()
             logger.error(f"Download {download_id} failed/cancelled: {error_message}")
             await self._broadcast({"type": "update", "data": status.to_dict()})
+            await self._evict_finished()
 
     async def cancel_and_remove(self, download_id: str):
         if download_id in self.active_downloads:
@@ -160,8 +661,12 @@ class DownloadTracker:
     async def remove_download(self, download_id: str):
         if download_id in self.active_downloads:
             logger.info(f"Removing download {download_id} from tracking.")
-            del self.active_downloads[download_id]
-            await self._broadcast({"type": "remove", "download_id": download_id})
+            status = self.active_downloads.pop(download_id)
+            self._progress_dirty.discard(download_id)
+            self._last_broadcast.pop(download_id, None)
+            await self._broadcast(
+                {"type": "remove", "download_id": download_id, "repo_id": status.repo_id}
+            )
 
     def get_all_statuses(self) -> List[Dict[str, Any]]:
         return [status.to_dict() for status in self.active_downloads.values()]
@@ -0,0 +1,158 @@
+# backend/core/file_management/file_hash_index.py
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import pathlib
+import threading
+from typing import Dict, Any, Optional, Iterable
+
+from ..constants.constants import (
+    FILE_HASH_INDEX_FLUSH_INTERVAL_SECONDS,
+    FILE_HASH_INDEX_PATH,
+    HASH_READ_CHUNK_BYTES,
+    PARTIAL_DOWNLOAD_SUFFIX,
+    PARTIAL_SIDECAR_SUFFIX,
+)
+
+logger = logging.getLogger(__name__)
+
+_SIDECAR_SUFFIX = PARTIAL_DOWNLOAD_SUFFIX + PARTIAL_SIDECAR_SUFFIX
+
+
+def hash_file(path: pathlib.Path) -> str:
+    """(Blocking) Computes the SHA-256 of a whole file."""
+    sha256 = hashlib.sha256()
+    with open(path, "rb") as f:
+        while data := f.read(HASH_READ_CHUNK_BYTES):
+            sha256.update(data)
+    return sha256.hexdigest()
+
+
+class FileHashIndex:
+    """
+    Persists the SHA-256 of local model files together with the size and
+    modification time they had when hashed, so a file's hash can be reused
+    without reading it again for as long as the file is unchanged.
+
+    Changes are written behind: `record` only updates the index in memory, and
+    the index file is rewritten at most every FILE_HASH_INDEX_FLUSH_INTERVAL_SECONDS.
+    """
+
+    def __init__(
+        self,
+        file_path: pathlib.Path = FILE_HASH_INDEX_PATH,
+        flush_interval: float = FILE_HASH_INDEX_FLUSH_INTERVAL_SECONDS,
+    ):
+        self.file_path = file_path
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._dirty = False
+        self.entries: Dict[str, Dict[str, Any]] = self._load()
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        """Loads the index from disk, returning an empty index if it is missing or invalid."""
+        if not self.file_path.exists():
+            return {}
+        try:
+            with open(self.file_path, "r") as f:
+                return json.load(f)
+        except (json.JSONDecodeError, TypeError) as e:
+            logger.error(f"Error reading file hash index: {e}. Starting with an empty index.")
+            return {}
+
+    def flush(self):
+        """(Blocking) Writes the index to disk atomically if it changed since the last write."""
+        with self._lock:
+            if not self._dirty:
+                return
+            self._dirty = False
+            data = json.dumps(self.entries)
+        self.file_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.file_path.with_name(self.file_path.name + ".tmp")
+        try:
+            with open(tmp_path, "w") as f:
+                f.write(data)
+            tmp_path.replace(self.file_path)
+        except IOError as e:
+            logger.error(f"Error saving file hash index: {e}")
+            with self._lock:
+                self._dirty = True
+
+    async def run_flusher(self):
+        """Flushes changes periodically. Meant to run as a background task."""
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            if self._dirty:
+                await asyncio.to_thread(self.flush)
+
+    def record(self, path: pathlib.Path, sha256: str):
+        """(Blocking) Stores the hash of a file as it currently is on disk."""
+        stat = os.stat(path)
+        with self._lock:
+            self.entries[str(path.resolve())] = {
+                "sha256": sha256,
+                "size": stat.st_size,
+                "mtime_ns": stat.st_mtime_ns,
+            }
+            self._dirty = True
+
+    def lookup(self, path: pathlib.Path) -> Optional[str]:
+        """(Blocking) Returns the stored hash of a file if the file has not changed since."""
+        entry = self.entries.get(str(path.resolve()))
+        if not entry:
+            return None
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        if stat.st_size != entry["size"] or stat.st_mtime_ns != entry["mtime_ns"]:
+            return None
+        return entry["sha256"]
+
+    def find_copy(
+        self, sha256: str, size: int, directories: Iterable[pathlib.Path]
+    ) -> Optional[pathlib.Path]:
+        """
+        (Blocking) Finds an indexed, unchanged file under `directories` with the
+        given SHA-256 and size. Files that are not indexed yet are not read here;
+        see `index_unknown`.
+        """
+        directories = [d.resolve() for d in directories if d.is_dir()]
+        for path_str, entry in list(self.entries.items()):
+            if entry["sha256"] != sha256 or entry["size"] != size:
+                continue
+            path = pathlib.Path(path_str)
+            if any(path.is_relative_to(d) for d in directories) and self.lookup(path) == sha256:
+                return path
+        return None
+
+    def index_unknown(self, size: int, directories: Iterable[pathlib.Path]) -> int:
+        """
+        (Blocking) Hashes the files under `directories` of exactly `size` bytes that
+        are not indexed yet (or changed since), so later lookups for content of that
+        size find them. Returns the number of files hashed.
+        """
+        hashed = 0
+        for directory in directories:
+            if not directory.is_dir():
+                continue
+            for root, _, files in os.walk(directory):
+                for name in files:
+                    if name.endswith((PARTIAL_DOWNLOAD_SUFFIX, _SIDECAR_SUFFIX)):
+                        continue
+                    path = pathlib.Path(root) / name
+                    try:
+                        if path.is_symlink() or path.stat().st_size != size:
+                            continue
+                        if self.lookup(path) is not None:
+                            continue
+                        logger.info(f"Hashing '{path}' for the file hash index.")
+                        digest = hash_file(path)
+                        self.record(path, digest)
+                    except OSError as e:
+                        logger.warning(f"Could not hash '{path}': {e}")
+                        continue
+                    hashed += 1
+        return hashed
@@ -0,0 +1,131 @@
+# backend/core/file_management/file_links.py
+import logging
+import os
+import pathlib
+from typing import Callable, Literal, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+from ..constants.constants import COPY_STEP_BYTES
+
+logger = logging.getLogger(__name__)
+
+LinkMethod = Literal["reflink", "hardlink", "copy"]
+
+# ioctl request number of FICLONE on Linux (_IOW(0x94, 9, int)).
+_FICLONE = 0x40049409
+
+# Called with (bytes_copied, total_bytes) while a copy makes progress.
+CopyProgress = Callable[[int, int], None]
+
+
+def copy_file(source: pathlib.Path, target: pathlib.Path, progress: Optional[CopyProgress] = None):
+    """
+    (Blocking) Copies `source` to `target` in the kernel where possible
+    (`copy_file_range`, then `sendfile`), so the data never passes through
+    Python. Falls back to a buffered copy elsewhere. `progress` is called after
+    every step of COPY_STEP_BYTES.
+    """
+    total = os.path.getsize(source)
+    copied = 0
+    with open(source, "rb") as src, open(target, "wb") as dst:
+        in_fd, out_fd = src.fileno(), dst.fileno()
+        for kernel_copy in (getattr(os, "copy_file_range", None), getattr(os, "sendfile", None)):
+            if kernel_copy is None:
+                continue
+            try:
+                while copied < total:
+                    if kernel_copy is os.sendfile:
+                        n = os.sendfile(out_fd, in_fd, copied, min(COPY_STEP_BYTES, total - copied))
+                    else:
+                        n = kernel_copy(in_fd, out_fd, min(COPY_STEP_BYTES, total - copied))
+                    if n == 0:
+                        break
+                    copied += n
+                    if progress:
+                        progress(copied, total)
+                break
+            except OSError as e:
+                if copied:
+                    raise
+                # Not supported for this pair of files; try the next method.
+                logger.debug(f"{kernel_copy.__name__} unavailable for '{source}': {e}")
+        if copied < total:
+            src.seek(copied)
+            dst.seek(copied)
+            while data := src.read(COPY_STEP_BYTES):
+                dst.write(data)
+                copied += len(data)
+                if progress:
+                    progress(copied, total)
+
+
+def _reflink(source: pathlib.Path, target: pathlib.Path) -> bool:
+    """Clones `source` into `target` copy-on-write (Btrfs, XFS, ...). Returns False if unsupported."""
+    if fcntl is None:
+        return False
+    try:
+        with open(source, "rb") as src, open(target, "wb") as dst:
+            fcntl.ioctl(dst.fileno(), _FICLONE, src.fileno())
+        return True
+    except OSError:
+        target.unlink(missing_ok=True)
+        return False
+
+
+def link_or_copy(
+    source: pathlib.Path, target: pathlib.Path, progress: Optional[CopyProgress] = None
+) -> LinkMethod:
+    """
+    (Blocking) Makes `target` have the same content as `source` as cheaply as
+    possible: a copy-on-write reflink, else a hardlink, else (across filesystems
+    or where links are not supported) a full in-kernel copy reporting `progress`.
+    The target only appears once complete; an existing target is replaced.
+    Returns the method that was used.
+    """
+    target.parent.mkdir(parents=True, exist_ok=True)
+    staging_path = target.with_name(f".{target.name}.link")
+    staging_path.unlink(missing_ok=True)
+    try:
+        if _reflink(source, staging_path):
+            method: LinkMethod = "reflink"
+        else:
+            try:
+                os.link(source, staging_path)
+                method = "hardlink"
+            except OSError as e:
+                # Typically EXDEV (another filesystem) or a filesystem without hardlinks.
+                logger.debug(f"Hardlink '{source}' -> '{target}' failed ({e}); copying.")
+                copy_file(source, staging_path, progress)
+                method = "copy"
+        os.replace(staging_path, target)
+    finally:
+        staging_path.unlink(missing_ok=True)
+    logger.info(f"Linked '{source}' -> '{target}' ({method}).")
+    return method
+
+
+def move_file(
+    source: pathlib.Path, target: pathlib.Path, progress: Optional[CopyProgress] = None
+) -> bool:
+    """
+    (Blocking) Moves `source` to `target`. On the same filesystem this is an
+    atomic `os.replace`; across filesystems the file is copied in the kernel
+    next to the target, renamed into place and the source removed. Returns True
+    if the move was a rename.
+    """
+    if os.stat(source).st_dev == os.stat(target.parent).st_dev:
+        os.replace(source, target)
+        return True
+    logger.warning(f"'{source}' is on another filesystem than '{target}'; copying.")
+    staging_path = target.with_name(f".{target.name}.move")
+    try:
+        copy_file(source, staging_path, progress)
+        os.replace(staging_path, target)
+    finally:
+        staging_path.unlink(missing_ok=True)
+    source.unlink()
+    return False
@@ -0,0 +1,185 @@
+# backend/core/file_management/file_writer.py
+import asyncio
+import logging
+import os
+import pathlib
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Tuple
+
+from .inline_hasher import InlineHasher
+from .partial_download import DownloadSegment
+from ..constants.constants import WRITE_BUFFER_SIZE_BYTES, WRITE_QUEUE_DEPTH
+
+logger = logging.getLogger(__name__)
+
+WrittenCallback = Callable[[DownloadSegment, int], None]
+# Called with the seconds `write` had to wait for the disk.
+BlockedCallback = Callable[[float], None]
+
+# (segment, file offset, buffer, number of valid bytes in the buffer)
+_WriteRequest = Tuple[DownloadSegment, int, bytearray, int]
+
+
+@dataclass
+class _FillingBuffer:
+    """A buffer a segment is currently copying its chunks into."""
+
+    segment: DownloadSegment
+    buffer: bytearray
+    offset: int
+    used: int = 0
+
+
+def preallocate(file_obj, size: int):
+    """
+    (Blocking) Reserves `size` bytes for a file so segments can write at their own
+    offsets without fragmenting it. Falls back to a sparse truncate where
+    `posix_fallocate` is unavailable or unsupported by the filesystem.
+    """
+    if hasattr(os, "posix_fallocate"):
+        try:
+            os.posix_fallocate(file_obj.fileno(), 0, size)
+            return
+        except OSError as e:
+            logger.debug(f"posix_fallocate unsupported here ({e}); using truncate.")
+    file_obj.truncate(size)
+
+
+class SegmentFileWriter:
+    """
+    The disk stage of a download. Network chunks are copied into large reusable
+    buffers (one being filled per segment) and full buffers are written by a
+    single dedicated thread, which also feeds the inline hasher. The buffer pool
+    bounds the writer's queue: when the disk falls behind, `write` waits for a
+    free buffer and so holds back the network side.
+
+    `on_written(segment, n)` is invoked on the event loop after `n` bytes of a
+    segment have reached the file, so segment progress only ever counts data
+    that is actually on disk. `on_blocked(seconds)` is invoked whenever `write`
+    had to wait for a free buffer.
+    """
+
+    def __init__(
+        self,
+        partial_path: pathlib.Path,
+        hasher: InlineHasher,
+        segment_count: int,
+        on_written: WrittenCallback,
+        on_blocked: Optional[BlockedCallback] = None,
+    ):
+        self.partial_path = partial_path
+        self.hasher = hasher
+        self._on_written = on_written
+        self._on_blocked = on_blocked
+        self._loop = asyncio.get_running_loop()
+        self._requests: "queue.SimpleQueue[Optional[_WriteRequest]]" = queue.SimpleQueue()
+        self._free_buffers: "asyncio.Queue[bytearray]" = asyncio.Queue()
+        self._buffers_created = 0
+        # Every segment may hold one buffer while filling it, plus the queue depth.
+        self._max_buffers = segment_count + WRITE_QUEUE_DEPTH
+        # Segment start -> the buffer that segment is filling
+        self._filling: Dict[int, _FillingBuffer] = {}
+        self.pending_bytes = 0  # Accepted but not yet on disk
+        self._error: Optional[BaseException] = None
+        self._closed: Optional[asyncio.Future] = None
+        self._thread = threading.Thread(
+            target=self._run, name=f"writer-{partial_path.name}", daemon=True
+        )
+        self._thread.start()
+
+    def _run(self):
+        """Writer thread: applies write requests in order until the stop sentinel arrives."""
+        try:
+            with open(self.partial_path, "r+b", buffering=0) as f:
+                while (request := self._requests.get()) is not None:
+                    segment, offset, buffer, length = request
+                    if self._error is None:
+                        try:
+                            view = memoryview(buffer)[:length]
+                            f.seek(offset)
+                            while view:
+                                view = view[f.write(view) :]
+                            self.hasher.feed(segment.start, offset, memoryview(buffer)[:length])
+                        except BaseException as e:
+                            self._error = e
+                    self._loop.call_soon_threadsafe(self._buffer_done, segment, buffer, length)
+        except BaseException as e:
+            self._error = e
+            # Drain so no producer waits forever for a buffer.
+            while (request := self._requests.get()) is not None:
+                segment, _, buffer, length = request
+                self._loop.call_soon_threadsafe(self._buffer_done, segment, buffer, length)
+        finally:
+            self._loop.call_soon_threadsafe(self._finished)
+
+    def _buffer_done(self, segment: DownloadSegment, buffer: bytearray, length: int):
+        self.pending_bytes -= length
+        if self._error is None:
+            self._on_written(segment, length)
+        self._free_buffers.put_nowait(buffer)
+
+    def _finished(self):
+        if self._closed and not self._closed.done():
+            self._closed.set_result(None)
+
+    def _raise_if_failed(self):
+        if self._error is not None:
+            raise IOError(f"Writing '{self.partial_path.name}' failed: {self._error}")
+
+    async def _acquire_buffer(self) -> bytearray:
+        if self._free_buffers.empty() and self._buffers_created < self._max_buffers:
+            self._buffers_created += 1
+            return bytearray(WRITE_BUFFER_SIZE_BYTES)
+        if not self._free_buffers.empty():
+            return self._free_buffers.get_nowait()
+        # Every buffer is waiting for the disk.
+        started = time.monotonic()
+        buffer = await self._free_buffers.get()
+        if self._on_blocked:
+            self._on_blocked(time.monotonic() - started)
+        return buffer
+
+    def _submit(self, segment_start: int):
+        filling = self._filling.pop(segment_start)
+        if filling.used:
+            self._requests.put((filling.segment, filling.offset, filling.buffer, filling.used))
+        else:
+            self._free_buffers.put_nowait(filling.buffer)
+
+    async def write(self, segment: DownloadSegment, position: int, chunk: bytes):
+        """Queues `chunk` to be written at `position`, waiting if all buffers are in use."""
+        self._raise_if_failed()
+        self.pending_bytes += len(chunk)
+        view = memoryview(chunk)
+        while view:
+            filling = self._filling.get(segment.start)
+            if filling is None:
+                buffer = await self._acquire_buffer()
+                filling = self._filling[segment.start] = _FillingBuffer(segment, buffer, position)
+            n = min(len(view), len(filling.buffer) - filling.used)
+            filling.buffer[filling.used : filling.used + n] = view[:n]
+            filling.used += n
+            position += n
+            view = view[n:]
+            if filling.used == len(filling.buffer):
+                self._submit(segment.start)
+
+    def flush(self, segment: DownloadSegment):
+        """Hands a segment's partially filled buffer to the writer thread."""
+        if segment.start in self._filling:
+            self._submit(segment.start)
+
+    async def close(self):
+        """
+        Writes out everything accepted so far and stops the writer thread. Once this
+        returns, all `on_written` callbacks have run. Raises if a write failed.
+        """
+        for segment_start in list(self._filling):
+            self._submit(segment_start)
+        self._closed = self._loop.create_future()
+        self._requests.put(None)
+        await asyncio.shield(self._closed)
+        self._raise_if_failed()
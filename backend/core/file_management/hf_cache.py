@@ -0,0 +1,81 @@
+# backend/core/file_management/hf_cache.py
+import logging
+import pathlib
+import re
+from typing import Optional, Iterable
+
+from huggingface_hub import constants as hf_constants, try_to_load_from_cache
+
+logger = logging.getLogger(__name__)
+
+_COMMIT_HASH_PATTERN = re.compile(r"^[0-9a-f]{40}$")
+
+
+def is_commit_hash(revision: Optional[str]) -> bool:
+    """Whether `revision` is a full commit hash, i.e. names content that can never change."""
+    return bool(revision and _COMMIT_HASH_PATTERN.match(revision))
+
+
+def _repo_folder(repo_id: str) -> str:
+    """Name of a model repository's folder in the cache, e.g. 'models--org--name'."""
+    return hf_constants.REPO_ID_SEPARATOR.join(["models", *repo_id.split("/")])
+
+
+def find_cached_file(
+    repo_id: str,
+    filename: str,
+    revision: Optional[str] = None,
+    cache_dir: Optional[pathlib.Path] = None,
+) -> Optional[pathlib.Path]:
+    """
+    (Blocking) Looks up a file of a repository revision in the local huggingface_hub
+    cache (`snapshots/<commit>/<filename>`, with branches resolved through `refs/`).
+    Returns the path of the cached blob, or None. Never touches the network.
+
+    A branch or tag is resolved through the cache's own `refs/`, which may be out
+    of date; callers that need the current content should only trust this for
+    commit hashes (see `is_commit_hash`).
+    """
+    try:
+        cached = try_to_load_from_cache(
+            repo_id, filename, cache_dir=cache_dir, revision=revision, repo_type="model"
+        )
+    except Exception as e:  # Malformed ids or revisions are simply cache misses
+        logger.debug(f"HF cache lookup for {repo_id}/{filename} failed: {e}")
+        return None
+    if not isinstance(cached, str):
+        return None
+    blob = pathlib.Path(cached).resolve()
+    return blob if blob.is_file() else None
+
+
+def find_cached_blob(
+    etags: Iterable[Optional[str]],
+    size: int,
+    repo_id: Optional[str] = None,
+    cache_dir: Optional[pathlib.Path] = None,
+) -> Optional[pathlib.Path]:
+    """
+    (Blocking) Looks for a blob stored under one of `etags` (the cache names blobs
+    after the Hub's ETag: the SHA-256 for LFS files, the git hash otherwise) and of
+    exactly `size` bytes. The repository's own folder is checked first, then every
+    other cached model, since blobs are content-addressed.
+    """
+    cache_root = pathlib.Path(cache_dir or hf_constants.HF_HUB_CACHE)
+    names = [etag for etag in dict.fromkeys(etags) if etag]
+    if not names or size <= 0 or not cache_root.is_dir():
+        return None
+
+    candidates = []
+    if repo_id:
+        candidates.append(cache_root / _repo_folder(repo_id) / "blobs")
+    candidates.extend(sorted(cache_root.glob("models--*/blobs")))
+    for blobs_dir in dict.fromkeys(candidates):
+        for name in names:
+            blob = blobs_dir / name
+            try:
+                if blob.is_file() and blob.stat().st_size == size:
+                    return blob
+            except OSError:
+                continue
+    return None
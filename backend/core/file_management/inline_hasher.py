@@ -0,0 +1,165 @@
+# backend/core/file_management/inline_hasher.py
+import hashlib
+import logging
+import pathlib
+import threading
+from collections import deque
+from typing import Deque, Dict, Iterable, Optional, Set, Tuple
+
+from .partial_download import DownloadSegment
+from ..constants.constants import HASH_READ_CHUNK_BYTES, INLINE_HASH_HOLD_BYTES
+
+logger = logging.getLogger(__name__)
+
+
+class IntegrityError(Exception):
+    """Raised when a downloaded file does not match its expected SHA-256."""
+
+
+def normalize_sha256(value: Optional[str]) -> Optional[str]:
+    """
+    Returns `value` as a lowercase hex SHA-256 if it looks like one (e.g. a quoted
+    LFS ETag), otherwise None. Git blob ETags are SHA-1 and are rejected.
+    """
+    if not value:
+        return None
+    value = value.strip().removeprefix("W/").strip('"').lower()
+    if len(value) == 64 and all(c in "0123456789abcdef" for c in value):
+        return value
+    return None
+
+
+class HoldBudget:
+    """The memory all inline hashers together may use for data held ahead of their frontier."""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.used = 0
+        self._lock = threading.Lock()
+
+    def take(self, size: int) -> bool:
+        """Reserves `size` bytes if they fit. Returns False if they do not."""
+        with self._lock:
+            if self.used + size > self.limit:
+                return False
+            self.used += size
+            return True
+
+    def give_back(self, size: int):
+        with self._lock:
+            self.used -= size
+
+
+# Shared by every download, so parallel downloads cannot each hold the full amount.
+hold_budget = HoldBudget(INLINE_HASH_HOLD_BYTES)
+
+
+class InlineHasher:
+    """
+    Computes the SHA-256 of a file while its segments are being written.
+
+    SHA-256 must consume bytes in order, so data written exactly at the hash
+    frontier is hashed straight from the writer's buffer. Data written ahead of
+    the frontier by a later segment is copied and held in memory, from the start
+    of that segment on, until the frontier reaches it, as long as the shared
+    `budget` has room. Only what did not fit (and the existing part of a resumed
+    download) is read back from disk, usually from the page cache.
+
+    `feed` is called from the writer thread, so all state is guarded by a lock.
+    """
+
+    def __init__(
+        self,
+        partial_path: pathlib.Path,
+        segments: Iterable[DownloadSegment],
+        budget: HoldBudget = hold_budget,
+    ):
+        self.partial_path = partial_path
+        self.budget = budget
+        self._hash = hashlib.sha256()
+        self._offset = 0
+        self._lock = threading.Lock()
+        # Segment start -> end (exclusive) of the data known to be on disk.
+        self._written_until: Dict[int, int] = {s.start: s.next_offset for s in segments}
+        # Segment start -> contiguous (position, data) chunks held ahead of the frontier.
+        self._held: Dict[int, Deque[Tuple[int, bytes]]] = {}
+        # Segments that stopped holding because the budget ran out.
+        self._not_holding: Set[int] = set()
+        self.held_size = 0
+        self.bytes_read_back = 0
+
+    def _hash_from_disk(self, end: int):
+        self.bytes_read_back += end - self._offset
+        with open(self.partial_path, "rb") as f:
+            f.seek(self._offset)
+            while self._offset < end:
+                data = f.read(min(HASH_READ_CHUNK_BYTES, end - self._offset))
+                if not data:
+                    raise IOError(f"Unexpected end of '{self.partial_path}' while hashing.")
+                self._hash.update(data)
+                self._offset += len(data)
+
+    def _advance(self):
+        """Hashes held and on-disk data from the frontier for as long as it is contiguous."""
+        while True:
+            segment_start, end = next(
+                (
+                    (start, until)
+                    for start, until in self._written_until.items()
+                    if start <= self._offset < until
+                ),
+                (None, None),
+            )
+            if end is None:
+                return
+            held = self._held.get(segment_start)
+            if held and held[0][0] == self._offset:
+                _, data = held.popleft()
+                self._hash.update(data)
+                self._offset += len(data)
+                self.held_size -= len(data)
+                self.budget.give_back(len(data))
+            else:
+                # Data before the held chunks (a resumed part) or after them (beyond the limit).
+                self._hash_from_disk(min(end, held[0][0]) if held else end)
+
+    def _hold(self, segment_start: int, position: int, chunk: bytes):
+        """Keeps a chunk written ahead of the frontier, while it continues the held data."""
+        if segment_start in self._not_holding:
+            return
+        if not self.budget.take(len(chunk)):
+            # The rest of this segment will be read back from disk.
+            self._not_holding.add(segment_start)
+            return
+        self._held.setdefault(segment_start, deque()).append((position, bytes(chunk)))
+        self.held_size += len(chunk)
+
+    def feed(self, segment_start: int, position: int, chunk: bytes):
+        """(Blocking) Records a chunk that was just written at `position`."""
+        with self._lock:
+            self._advance()
+            if position == self._offset:
+                self._hash.update(chunk)
+                self._offset += len(chunk)
+            elif position > self._offset:
+                self._hold(segment_start, position, chunk)
+            self._written_until[segment_start] = position + len(chunk)
+            self._advance()
+
+    def finish(self, total_size: int) -> str:
+        """(Blocking) Hashes whatever is still behind the frontier and returns the hex digest."""
+        with self._lock:
+            if self._offset < total_size:
+                logger.debug(
+                    f"Hashing {total_size - self._offset} remaining bytes of "
+                    f"'{self.partial_path.name}' from disk."
+                )
+                self._hash_from_disk(total_size)
+            return self._hash.hexdigest()
+
+    def release(self):
+        """Drops the held data of a download that stopped early, returning it to the budget."""
+        with self._lock:
+            self._held.clear()
+            self.budget.give_back(self.held_size)
+            self.held_size = 0
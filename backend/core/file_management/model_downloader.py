@@ -1,11 +1,12 @@
 # backend/core/file_management/model_downloader.py
 import logging
 import os
-import shutil
 import asyncio
-import tempfile
+import random
+import time
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Dict, Optional, List, Tuple
 
 import httpx
 from huggingface_hub import hf_hub_url
@@ -16,12 +17,518 @@ from huggingface_hub.utils import (
 )
 
 from .download_tracker import download_tracker
+from .bandwidth_limiter import bandwidth_limiter
+from .file_hash_index import FileHashIndex
+from .inline_hasher import InlineHasher, IntegrityError, normalize_sha256
+from .file_writer import SegmentFileWriter, preallocate
+from .file_links import CopyProgress, link_or_copy, move_file
+from .disk_space import DiskSpaceLedger, InsufficientDiskSpaceError
+from .hf_cache import find_cached_blob, find_cached_file, is_commit_hash
+from ..http_client import http_client_manager
+from ..hub_endpoints import hub_endpoints, is_endpoint_failure
+from .partial_download import (
+    DownloadSegment,
+    PartialDownload,
+    partial_paths_for,
+    remove_partial,
+    write_sidecar,
+)
+from ..constants.constants import (
+    DOWNLOAD_PIECE_BYTES,
+    MIN_SEGMENT_SIZE_BYTES,
+    PARTIAL_SIDECAR_SAVE_INTERVAL_BYTES,
+)
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class RemoteFileInfo:
+    """What a probe request learned about the remote file."""
+
+    total_size: int
+    accepts_ranges: bool
+    etag: Optional[str]
+    sha256: Optional[str] = None  # LFS object id, when the Hub reports one
+
+
+def _linked_sha256(response: httpx.Response) -> Optional[str]:
+    """
+    Finds the LFS SHA-256 of a Hub file. The Hub sends it as `X-Linked-Etag` on
+    the `resolve` response, which is usually a redirect to the CDN.
+    """
+    for hop in (*response.history, response):
+        sha256 = normalize_sha256(hop.headers.get("x-linked-etag"))
+        if sha256:
+            return sha256
+    return None
+
+
+def _is_retryable(error: BaseException) -> bool:
+    """Whether a failed request is worth repeating: connection errors, timeouts, 429 and 5xx."""
+    if isinstance(error, httpx.HTTPStatusError):
+        status_code = error.response.status_code
+        return status_code == 429 or status_code >= 500
+    return isinstance(error, httpx.TransportError)
+
+
+def _retry_delay(attempt: int, error: BaseException) -> float:
+    """
+    Seconds to wait before retry number `attempt` (1-based): a doubling backoff
+    with jitter, so parallel segments do not reconnect in lockstep. A numeric
+    `Retry-After` from the server takes precedence.
+    """
+    settings = http_client_manager.settings
+    max_delay = settings["retry_backoff_max_seconds"]
+    if isinstance(error, httpx.HTTPStatusError):
+        retry_after = error.response.headers.get("retry-after", "")
+        if retry_after.isdigit():
+            return min(float(retry_after), max_delay)
+    delay = min(max_delay, settings["retry_backoff_seconds"] * 2 ** (attempt - 1))
+    return random.uniform(delay / 2, delay)
+
+
 class ModelDownloader:
-    """Handles the logic of downloading model files, with cancellation support."""
+    """Handles the logic of downloading model files, with cancellation and resume support."""
+
+    def __init__(
+        self,
+        hash_index: Optional[FileHashIndex] = None,
+        disk_space: Optional[DiskSpaceLedger] = None,
+        hf_cache_dir: Optional[Path] = None,
+    ):
+        self.hash_index = hash_index
+        self.disk_space = disk_space
+        # The huggingface_hub cache to reuse files from (its default location if None).
+        self.hf_cache_dir = hf_cache_dir
+        # File size -> background task hashing the unindexed local files of that size
+        self._indexing: Dict[int, asyncio.Task] = {}
+
+    async def _probe_remote_file(self, client: httpx.AsyncClient, url: str) -> RemoteFileInfo:
+        """
+        Requests the first byte of the file to learn its total size, its ETag and
+        whether the server honours `Range` requests.
+        """
+        async with client.stream("GET", url, headers={"Range": "bytes=0-0"}) as response:
+            response.raise_for_status()
+            etag = response.headers.get("etag")
+            sha256 = _linked_sha256(response)
+            if response.status_code == 206:
+                # Expected format: "bytes 0-0/123456"
+                total = response.headers.get("content-range", "").rsplit("/", 1)[-1]
+                if total.isdigit():
+                    return RemoteFileInfo(int(total), True, etag, sha256)
+            # The server ignored the range; closing the stream here discards the body.
+            content_length = int(response.headers.get("content-length", 0))
+            return RemoteFileInfo(content_length, False, etag, sha256)
+
+    async def _wait_before_retry(
+        self,
+        download_id: str,
+        attempt: int,
+        error: BaseException,
+        file_key: Optional[str] = None,
+    ):
+        """Shows the retry in the tracker and sleeps for the backoff delay."""
+        delay = _retry_delay(attempt, error)
+        max_retries = http_client_manager.settings["max_retries"]
+        logger.warning(
+            f"Download {download_id}: {error or type(error).__name__}; "
+            f"retry {attempt}/{max_retries} in {delay:.1f}s."
+        )
+        await download_tracker.set_status_text(
+            download_id, f"Retry {attempt}/{max_retries} in {max(1, round(delay))}s...", file_key
+        )
+        await asyncio.sleep(delay)
+
+    async def _probe_with_failover(
+        self,
+        client: httpx.AsyncClient,
+        url_for: Callable[[str], str],
+        download_id: str,
+        file_key: Optional[str] = None,
+    ) -> Tuple[str, RemoteFileInfo]:
+        """
+        Probes the file on the best Hub endpoint, moving on to the next one while
+        endpoints fail and retrying with backoff once none is left. Returns the
+        endpoint that answered and what it reported.
+        """
+        endpoint = hub_endpoints.best
+        attempt = 0
+        while True:
+            try:
+                remote = await self._probe_remote_file(client, url_for(endpoint))
+                if attempt:
+                    await download_tracker.set_status_text(download_id, None, file_key)
+                return endpoint, remote
+            except httpx.HTTPError as e:
+                if not _is_retryable(e):
+                    raise
+                next_endpoint = is_endpoint_failure(e) and hub_endpoints.failover(endpoint, e)
+                if next_endpoint:
+                    logger.warning(f"Hub endpoint {endpoint} failed ({e}); trying {next_endpoint}.")
+                    endpoint = next_endpoint
+                    continue
+                attempt += 1
+                if attempt > http_client_manager.settings["max_retries"]:
+                    raise
+                await self._wait_before_retry(download_id, attempt, e, file_key)
+
+    def _prepare_partial(
+        self,
+        partial_path: Path,
+        sidecar_path: Path,
+        url: str,
+        repo_id: str,
+        hf_filename: str,
+        revision: Optional[str],
+        remote: RemoteFileInfo,
+        segments: int,
+    ) -> PartialDownload:
+        """
+        (Blocking) Reuses an existing partial download if it matches the remote file,
+        otherwise creates a fresh partial file and sidecar with a new segment plan:
+        DOWNLOAD_PIECE_BYTES pieces when it is worth more than one connection.
+        """
+        existing = PartialDownload.load(sidecar_path)
+        if (
+            existing
+            and remote.accepts_ranges
+            and partial_path.is_file()
+            and existing.matches(url, remote.etag, remote.total_size)
+        ):
+            logger.info(
+                f"Resuming '{partial_path.name}' at {existing.downloaded_bytes} "
+                f"of {existing.total_size} bytes."
+            )
+            return existing
+
+        total_size = remote.total_size
+        # Never split into segments smaller than the minimum segment size.
+        segment_count = 1
+        if remote.accepts_ranges and total_size > 0:
+            segment_count = max(1, min(segments, total_size // MIN_SEGMENT_SIZE_BYTES))
+
+        if segment_count > 1:
+            plan = [
+                DownloadSegment(start, min(start + DOWNLOAD_PIECE_BYTES, total_size) - 1)
+                for start in range(0, total_size, DOWNLOAD_PIECE_BYTES)
+            ]
+        else:
+            if segments > 1:
+                logger.info(
+                    f"Range requests unavailable or '{hf_filename}' too small, "
+                    f"falling back to a single stream."
+                )
+            plan = [DownloadSegment(0, total_size - 1 if total_size > 0 else -1)]
+
+        state = PartialDownload(
+            url=url,
+            repo_id=repo_id,
+            filename=hf_filename,
+            revision=revision,
+            etag=remote.etag,
+            total_size=total_size,
+            segments=plan,
+        )
+        # The sidecar goes first: it is what marks the partial file as ours to the sweeper.
+        write_sidecar(sidecar_path, state.to_dict())
+        with open(partial_path, "wb") as f:
+            if total_size > 0:
+                # Reserve the space up front so each segment can write at its own offset.
+                preallocate(f, total_size)
+        return state
+
+    async def _download_segments(
+        self,
+        client: httpx.AsyncClient,
+        url_for: Callable[[str], str],
+        endpoint: str,
+        partial_path: Path,
+        sidecar_path: Path,
+        download_id: str,
+        state: PartialDownload,
+        accepts_ranges: bool,
+        bandwidth_key: str,
+        hasher: InlineHasher,
+        connections: int,
+        file_key: Optional[str] = None,
+    ):
+        """
+        Fetches every unfinished segment of the partial download over up to
+        `connections` concurrent connections, each taking the next segment in file
+        order once it is done with one, so the data written ahead of the hash
+        frontier stays small. Chunks go through a `SegmentFileWriter`, which writes
+        each segment at its own offset and feeds `hasher`. The sidecar is
+        checkpointed as data reaches the disk. All segments share the bandwidth
+        bucket of `bandwidth_key` and the global one.
+
+        Segments are fetched from `url_for(endpoint)`. When the endpoint fails
+        mid-stream (connection error, read timeout, stall or 5xx), the download
+        switches to the next healthy Hub endpoint. Without one, the request is
+        retried with backoff. Either way the segment reconnects with a `Range` from
+        the byte it had reached. A stream that delivers nothing for
+        `stall_timeout_seconds` counts as timed out.
+        """
+        last_saved_bytes = state.downloaded_bytes
+        settings = http_client_manager.settings
+        stall_timeout = settings["stall_timeout_seconds"] or None
+
+        async def checkpoint():
+            nonlocal last_saved_bytes
+            if state.downloaded_bytes - last_saved_bytes >= PARTIAL_SIDECAR_SAVE_INTERVAL_BYTES:
+                last_saved_bytes = state.downloaded_bytes
+                # Snapshot on the loop thread; only the file write happens in a worker.
+                await asyncio.to_thread(write_sidecar, sidecar_path, state.to_dict())
+
+        def on_written(segment: DownloadSegment, length: int):
+            segment.written += length
+
+        async def fetch_segment(segment: DownloadSegment):
+            nonlocal endpoint
+            position = segment.next_offset
+            attempt = 0
+            retrying = False  # A retry notice is shown until data flows again
+
+            async def stream_from(current: str):
+                nonlocal position, retrying
+                headers = {}
+                if accepts_ranges:
+                    end = str(segment.end) if segment.end >= 0 else ""
+                    headers["Range"] = f"bytes={position}-{end}"
+
+                started, start_position = time.monotonic(), position
+                async with client.stream("GET", url_for(current), headers=headers) as response:
+                    response.raise_for_status()
+                    if accepts_ranges and response.status_code != 206:
+                        raise IOError("Server ignored the range request for a segment.")
+                    if state.total_size <= 0:
+                        state.total_size = int(response.headers.get("content-length", 0))
+
+                    chunks = response.aiter_bytes()
+                    while True:
+                        try:
+                            chunk = await asyncio.wait_for(chunks.__anext__(), stall_timeout)
+                        except StopAsyncIteration:
+                            break
+                        except asyncio.TimeoutError:
+                            raise httpx.ReadTimeout(
+                                f"Stalled: no data for {stall_timeout:.0f}s.",
+                                request=response.request,
+                            )
+                        if retrying:
+                            retrying = False
+                            await download_tracker.set_status_text(download_id, None, file_key)
+                        await bandwidth_limiter.throttle(bandwidth_key, len(chunk))
+                        await writer.write(segment, position, chunk)
+                        position += len(chunk)
+                        await download_tracker.update_progress_from_bytes(
+                            download_id,
+                            state.downloaded_bytes + writer.pending_bytes,
+                            state.total_size,
+                            file_key=file_key,
+                        )
+                        await checkpoint()
+                hub_endpoints.record_transfer(
+                    current, position - start_position, time.monotonic() - started
+                )
+
+            while True:
+                current, reached = endpoint, position
+                try:
+                    await stream_from(current)
+                    break
+                except httpx.HTTPError as e:
+                    # Without range support a stream can only be restarted before any data.
+                    if not (_is_retryable(e) and (accepts_ranges or position == segment.start)):
+                        raise
+                    if position > reached:
+                        attempt = 0  # The connection made progress; count afresh.
+                    if is_endpoint_failure(e):
+                        # Another segment may already have moved the download elsewhere.
+                        next_endpoint = endpoint
+                        if endpoint == current:
+                            next_endpoint = hub_endpoints.failover(current, e)
+                        if next_endpoint:
+                            if next_endpoint != current:
+                                logger.warning(
+                                    f"Download {download_id}: endpoint {current} failed ({e}); "
+                                    f"continuing from {next_endpoint} at byte {position}."
+                                )
+                            endpoint = next_endpoint
+                            continue
+                    attempt += 1
+                    if attempt > settings["max_retries"]:
+                        raise
+                    retrying = True
+                    await self._wait_before_retry(download_id, attempt, e, file_key)
+            writer.flush(segment)
+
+            if segment.end < 0:
+                # Size was unknown up front; the finished stream defines it.
+                segment.end = position - 1
+                state.total_size = position
+            if position != segment.end + 1:
+                raise IOError(
+                    f"Segment {segment.start}-{segment.end} is incomplete: got "
+                    f"{position - segment.start} of {segment.end - segment.start + 1} bytes."
+                )
+
+        pending = sorted(
+            (segment for segment in state.segments if not segment.done), key=lambda s: s.start
+        )
+        connections = max(1, min(connections, len(pending)))
+        if len(pending) > 1:
+            logger.info(
+                f"Download {download_id}: fetching {len(pending)} segments of "
+                f"{state.total_size} bytes over {connections} connections."
+            )
+        await download_tracker.update_progress_from_bytes(
+            download_id, state.downloaded_bytes, state.total_size, file_key=file_key
+        )
+
+        writer = SegmentFileWriter(
+            partial_path,
+            hasher,
+            connections,
+            on_written,
+            on_blocked=lambda seconds: download_tracker.add_write_blocked_time(
+                download_id, seconds
+            ),
+        )
+        remaining = iter(pending)  # Shared, so each connection takes the next segment in order
+
+        async def connection():
+            for segment in remaining:
+                await fetch_segment(segment)
+
+        tasks = [asyncio.create_task(connection()) for _ in range(connections)]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            # One failed (or we were cancelled): stop the sibling connections before propagating.
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        finally:
+            # Whatever was received is written out, so the sidecar can count it as done.
+            await writer.close()
+
+    def _copy_progress(self, download_id: str, file_key: Optional[str] = None) -> CopyProgress:
+        """
+        Returns a progress callback for blocking copies running in a worker thread,
+        which forwards the byte counts to the tracker on the event loop.
+        """
+        loop = asyncio.get_running_loop()
+
+        def progress(copied: int, total: int):
+            asyncio.run_coroutine_threadsafe(
+                download_tracker.update_progress_from_bytes(download_id, copied, total, file_key),
+                loop,
+            )
+
+        return progress
+
+    async def _complete_from_local_copy(
+        self,
+        download_id: str,
+        sha256: str,
+        size: int,
+        final_local_path: Path,
+        directories: List[Path],
+        file_key: Optional[str] = None,
+    ) -> bool:
+        """
+        Looks for a local file with the same content and, if there is one, links it
+        into place and completes the download without transferring anything.
+        """
+        if not file_key:
+            await download_tracker.update_task_progress(
+                download_id, 0, status_text="Checking for a local copy..."
+            )
+        source = await asyncio.to_thread(self.hash_index.find_copy, sha256, size, directories)
+        if not source:
+            self._index_in_background(size, directories)
+            return False
+
+        if source != final_local_path.resolve():
+            method = await asyncio.to_thread(
+                link_or_copy,
+                source,
+                final_local_path,
+                self._copy_progress(download_id, file_key),
+            )
+            await asyncio.to_thread(self.hash_index.record, final_local_path, sha256)
+            logger.info(f"Download {download_id} deduplicated from '{source}' ({method}).")
+        await asyncio.to_thread(remove_partial, final_local_path)
+        await download_tracker.complete_download(
+            download_id,
+            str(final_local_path),
+            sha256=sha256,
+            deduplicated=True,
+            file_key=file_key,
+        )
+        return True
+
+    def _index_in_background(self, size: int, directories: List[Path]):
+        """
+        Hashes the unindexed local files of `size` bytes in a background task, so
+        later downloads of the same content can reuse them without this download
+        waiting for files to be read.
+        """
+        if size in self._indexing:
+            return
+
+        async def index():
+            try:
+                hashed = await asyncio.to_thread(self.hash_index.index_unknown, size, directories)
+                if hashed:
+                    logger.info(f"Indexed {hashed} local file(s) of {size} bytes.")
+            except Exception as e:
+                logger.warning(f"Indexing local files of {size} bytes failed: {e}")
+            finally:
+                self._indexing.pop(size, None)
+
+        self._indexing[size] = asyncio.create_task(index())
+
+    async def _complete_from_hf_cache(
+        self,
+        download_id: str,
+        blob: Path,
+        sha256: Optional[str],
+        final_local_path: Path,
+        file_key: Optional[str] = None,
+    ) -> bool:
+        """
+        Links (or copies) a blob of the huggingface_hub cache into place and
+        completes the download without transferring anything. A blob named after an
+        LFS SHA-256 other than the expected one is not used.
+        """
+        blob_sha256 = normalize_sha256(blob.name)
+        if sha256 and blob_sha256 and blob_sha256 != sha256:
+            logger.warning(f"Ignoring HF cache blob '{blob}': it does not match {sha256}.")
+            return False
+        sha256 = sha256 or blob_sha256
+
+        final_local_path.parent.mkdir(parents=True, exist_ok=True)
+        method = await asyncio.to_thread(
+            link_or_copy, blob, final_local_path, self._copy_progress(download_id, file_key)
+        )
+        if self.hash_index and sha256:
+            await asyncio.to_thread(self.hash_index.record, final_local_path, sha256)
+        await asyncio.to_thread(remove_partial, final_local_path)
+        logger.info(f"Download {download_id} reused '{blob}' from the HF cache ({method}).")
+        await download_tracker.record_cache_lookup(download_id, hit=True, file_key=file_key)
+        await download_tracker.complete_download(
+            download_id,
+            str(final_local_path),
+            sha256=sha256,
+            from_hf_cache=True,
+            file_key=file_key,
+            status_text="Reused from Hugging Face cache",
+        )
+        return True
 
     async def download_model_file(
         self,
@@ -31,72 +538,195 @@ class ModelDownloader:
         target_directory: Path,
         target_filename_override: Optional[str] = None,
         revision: Optional[str] = None,
-    ):
+        segments: int = 1,
+        bandwidth_key: Optional[str] = None,
+        expected_sha256: Optional[str] = None,
+        dedup_directories: Optional[List[Path]] = None,
+        file_key: Optional[str] = None,
+    ) -> bool:
+        """
+        Downloads one file into `target_directory`. `bandwidth_key` selects the
+        bandwidth bucket to draw from (defaults to `download_id`), so several files
+        of one job can share a single per-job limit.
+
+        The file's SHA-256 is computed while it downloads and checked against
+        `expected_sha256` (or the LFS object id reported by the Hub) before the
+        file is moved into place; a mismatch fails the download and discards it.
+
+        A copy in the local huggingface_hub cache (looked up by repository, revision
+        and filename before any request when `revision` is a commit hash, otherwise
+        by the SHA-256 or ETag the Hub reports) is linked into place instead of
+        being downloaded. So is a file with the same SHA-256
+        and size under `dedup_directories`.
+        Otherwise, once the remote size is known, the download fails early if it no
+        longer fits on the disk next to the other running downloads.
+
+        With `file_key`, progress and the outcome are reported for that file of the
+        multi-file download `download_id` rather than for the download as a whole.
+        Returns True if the file is in place.
+        """
         final_filename = target_filename_override or hf_filename
         logger.info(
             f"Starting download task {download_id} for '{hf_filename}' -> '{final_filename}'."
         )
 
-        tmp_file_path: Optional[Path] = None
+        final_local_path = target_directory / final_filename
+        partial_path, sidecar_path = partial_paths_for(final_local_path)
+        state: Optional[PartialDownload] = None
+        hasher: Optional[InlineHasher] = None
         try:
-            download_url = hf_hub_url(
-                repo_id=repo_id, filename=hf_filename, revision=revision, repo_type="model"
-            )
+            expected = normalize_sha256(expected_sha256)
+            # A branch may have moved since the cache was filled; only a commit is immutable.
+            if is_commit_hash(revision):
+                cached = await asyncio.to_thread(
+                    find_cached_file, repo_id, hf_filename, revision, self.hf_cache_dir
+                )
+                if cached and await self._complete_from_hf_cache(
+                    download_id, cached, expected, final_local_path, file_key
+                ):
+                    return True
 
-            async with httpx.AsyncClient(follow_redirects=True, timeout=None) as client:
-                async with client.stream("GET", download_url) as response:
-                    response.raise_for_status()
-                    total_size = int(response.headers.get("content-length", 0))
-
-                    with tempfile.NamedTemporaryFile(
-                        delete=False, mode="wb", dir=target_directory.parent
-                    ) as tmp_file:
-                        tmp_file_path = Path(tmp_file.name)
-                        downloaded_bytes = 0
-
-                        # Define a blocking write function to be run in a thread
-                        def write_chunk(chunk):
-                            tmp_file.write(chunk)
-
-                        async for chunk in response.aiter_bytes():
-                            # --- FIXED: Run the blocking write operation in a separate thread ---
-                            # This unblocks the event loop, allowing it to send WebSocket updates.
-                            await asyncio.to_thread(write_chunk, chunk)
-
-                            downloaded_bytes += len(chunk)
-                            # --- FIXED: Call the correct, purpose-built tracker method ---
-                            await download_tracker.update_progress_from_bytes(
-                                download_id, downloaded_bytes, total_size
-                            )
+            def url_for(endpoint: Optional[str]) -> str:
+                return hf_hub_url(
+                    repo_id=repo_id,
+                    filename=hf_filename,
+                    revision=revision,
+                    repo_type="model",
+                    endpoint=endpoint,
+                )
 
-            final_local_path = target_directory / final_filename
+            # Partials are keyed by the canonical URL, so any mirror can resume them.
+            download_url = url_for(None)
             final_local_path.parent.mkdir(parents=True, exist_ok=True)
 
-            # The move operation can also be blocking for large files
-            await asyncio.to_thread(shutil.move, tmp_file_path, final_local_path)
-            tmp_file_path = None  # Prevent deletion in finally block
+            client = http_client_manager.transfer_client
+            endpoint, remote = await self._probe_with_failover(
+                client, url_for, download_id, file_key
+            )
+            expected = expected or remote.sha256
+            etag = (remote.etag or "").removeprefix("W/").strip('"')
+            cached = await asyncio.to_thread(
+                find_cached_blob,
+                [remote.sha256, etag],
+                remote.total_size,
+                repo_id,
+                self.hf_cache_dir,
+            )
+            if cached and await self._complete_from_hf_cache(
+                download_id, cached, expected, final_local_path, file_key
+            ):
+                return True
+            await download_tracker.record_cache_lookup(download_id, hit=False, file_key=file_key)
+
+            if (
+                self.hash_index
+                and dedup_directories
+                and expected
+                and remote.total_size > 0
+                and await self._complete_from_local_copy(
+                    download_id,
+                    expected,
+                    remote.total_size,
+                    final_local_path,
+                    dedup_directories,
+                    file_key,
+                )
+            ):
+                return True
 
-            await download_tracker.complete_download(download_id, str(final_local_path))
+            if self.disk_space and remote.total_size > 0:
+                # The real size may differ from what was reserved when the job was queued.
+                self.disk_space.set_file_size(download_id, final_local_path, remote.total_size)
+                shortfall = await asyncio.to_thread(self.disk_space.check, download_id)
+                if shortfall:
+                    raise InsufficientDiskSpaceError(shortfall)
+
+            state = await asyncio.to_thread(
+                self._prepare_partial,
+                partial_path,
+                sidecar_path,
+                download_url,
+                repo_id,
+                hf_filename,
+                revision,
+                remote,
+                segments,
+            )
+            hasher = InlineHasher(partial_path, state.segments)
+            await self._download_segments(
+                client,
+                url_for,
+                endpoint,
+                partial_path,
+                sidecar_path,
+                download_id,
+                state,
+                remote.accepts_ranges,
+                bandwidth_key or download_id,
+                hasher,
+                segments,
+                file_key,
+            )
+
+            sha256 = await asyncio.to_thread(hasher.finish, state.total_size)
+            if expected and sha256 != expected:
+                state = None  # Corrupt data must not be resumed
+                raise IntegrityError(
+                    f"Integrity check failed for '{hf_filename}': expected SHA-256 "
+                    f"{expected}, got {sha256}."
+                )
+
+            # The partial is staged next to the target, so this is an atomic rename;
+            # should the two still end up on different devices, it is copied in the kernel.
+            await asyncio.to_thread(
+                move_file,
+                partial_path,
+                final_local_path,
+                self._copy_progress(download_id, file_key),
+            )
+            state = None  # Nothing left to resume
+            await asyncio.to_thread(sidecar_path.unlink, missing_ok=True)
+            if self.hash_index:
+                await asyncio.to_thread(self.hash_index.record, final_local_path, sha256)
+
+            await download_tracker.complete_download(
+                download_id, str(final_local_path), sha256=sha256, file_key=file_key
+            )
+            return True
 
         except asyncio.CancelledError:
-            logger.warning(f"Download {download_id} was cancelled by the user.")
+            logger.warning(f"Download {download_id} was cancelled.")
             await download_tracker.fail_download(
-                download_id, "Download cancelled by user.", cancelled=True
+                download_id, "Download cancelled by user.", cancelled=True, file_key=file_key
             )
             raise
+        except IntegrityError as e:
+            logger.error(str(e))
+            await asyncio.to_thread(remove_partial, final_local_path)
+            await download_tracker.fail_download(download_id, str(e), file_key=file_key)
+        except InsufficientDiskSpaceError as e:
+            logger.error(f"Download {download_id}: {e}")
+            await download_tracker.fail_download(download_id, str(e), file_key=file_key)
         except (RepositoryNotFoundError, EntryNotFoundError, GatedRepoError) as e:
-            await download_tracker.fail_download(download_id, f"Hugging Face API Error: {e}")
+            await download_tracker.fail_download(
+                download_id, f"Hugging Face API Error: {e}", file_key=file_key
+            )
         except httpx.HTTPStatusError as e:
             await download_tracker.fail_download(
-                download_id, f"HTTP Error {e.response.status_code}"
+                download_id, f"HTTP Error {e.response.status_code}", file_key=file_key
             )
         except Exception as e:
             logger.error(f"Unexpected download error for '{hf_filename}': {e}", exc_info=True)
-            await download_tracker.fail_download(download_id, f"An unexpected error occurred: {e}")
+            await download_tracker.fail_download(
+                download_id, f"An unexpected error occurred: {e}", file_key=file_key
+            )
         finally:
-            if tmp_file_path and tmp_file_path.exists():
+            if hasher:
+                hasher.release()
+            if state and partial_path.exists():
+                # Keep the partial file and record how far we got so a later attempt can resume.
                 logger.info(
-                    f"Cleaning up temporary file {tmp_file_path} for cancelled/failed download."
+                    f"Keeping partial download {partial_path} at {state.downloaded_bytes} bytes."
                 )
-                # This is also blocking, so run it in a thread
-                await asyncio.to_thread(os.remove, tmp_file_path)
+                await asyncio.to_thread(write_sidecar, sidecar_path, state.to_dict())
+        return False
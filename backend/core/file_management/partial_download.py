@@ -0,0 +1,172 @@
+# backend/core/file_management/partial_download.py
+import json
+import logging
+import os
+import re
+import time
+import pathlib
+from dataclasses import dataclass, field, asdict
+from typing import Dict, Any, Optional, List, Iterable, Set, Tuple
+
+from ..constants.constants import (
+    PARTIAL_DOWNLOAD_SUFFIX,
+    PARTIAL_SIDECAR_SUFFIX,
+    PARTIAL_DOWNLOAD_MAX_AGE_SECONDS,
+)
+
+logger = logging.getLogger(__name__)
+
+# Matches the names produced by `tempfile.NamedTemporaryFile` (e.g. "tmpa1b2c3d4"),
+# which older versions used as download staging files.
+_LEGACY_TEMP_FILE_PATTERN = re.compile(r"^tmp[a-z0-9_]{8}$")
+
+
+def partial_paths_for(final_path: pathlib.Path) -> Tuple[pathlib.Path, pathlib.Path]:
+    """Returns the (partial_file, sidecar_file) paths that belong to a final target path."""
+    partial_path = final_path.with_name(final_path.name + PARTIAL_DOWNLOAD_SUFFIX)
+    sidecar_path = partial_path.with_name(partial_path.name + PARTIAL_SIDECAR_SUFFIX)
+    return partial_path, sidecar_path
+
+
+@dataclass
+class DownloadSegment:
+    """A byte range of a file and how much of it has already been written."""
+
+    start: int
+    end: int  # Inclusive. -1 when the total size is unknown.
+    written: int = 0
+
+    @property
+    def next_offset(self) -> int:
+        return self.start + self.written
+
+    @property
+    def done(self) -> bool:
+        return self.end >= 0 and self.next_offset > self.end
+
+
+@dataclass
+class PartialDownload:
+    """Sidecar metadata that makes a partially downloaded file resumable."""
+
+    url: str
+    repo_id: str
+    filename: str
+    revision: Optional[str]
+    etag: Optional[str]
+    total_size: int
+    segments: List[DownloadSegment] = field(default_factory=list)
+
+    @property
+    def downloaded_bytes(self) -> int:
+        return sum(segment.written for segment in self.segments)
+
+    def matches(self, url: str, etag: Optional[str], total_size: int) -> bool:
+        """Checks whether this partial belongs to the same remote file version."""
+        return self.url == url and self.etag == etag and self.total_size == total_size
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def load(cls, sidecar_path: pathlib.Path) -> Optional["PartialDownload"]:
+        """Loads a sidecar file, returning None if it is missing or unreadable."""
+        if not sidecar_path.is_file():
+            return None
+        try:
+            with open(sidecar_path, "r") as f:
+                data = json.load(f)
+            data["segments"] = [DownloadSegment(**s) for s in data.get("segments", [])]
+            return cls(**data)
+        except (json.JSONDecodeError, TypeError, KeyError) as e:
+            logger.warning(f"Ignoring unreadable download sidecar '{sidecar_path}': {e}")
+            return None
+
+
+def write_sidecar(sidecar_path: pathlib.Path, data: Dict[str, Any]):
+    """Atomically writes sidecar data (as produced by `PartialDownload.to_dict`)."""
+    tmp_path = sidecar_path.with_name(sidecar_path.name + ".tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(data, f)
+    os.replace(tmp_path, sidecar_path)
+
+
+def remove_partial(final_path: pathlib.Path):
+    """Deletes the partial file and sidecar belonging to a target path, if present."""
+    for path in partial_paths_for(final_path):
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def sweep_orphaned_partials(
+    directories: Iterable[pathlib.Path],
+    legacy_temp_directories: Iterable[pathlib.Path],
+    owned_final_paths: Set[pathlib.Path],
+    max_age_seconds: float = PARTIAL_DOWNLOAD_MAX_AGE_SECONDS,
+) -> int:
+    """
+    Removes download leftovers that no job owns, but only files provably written
+    by this app: a partial file is ours if it has a readable sidecar, a sidecar if
+    it can be read as one. Everything else that looks like a leftover is only
+    reported, since it may belong to another program or to the user.
+
+    `directories` are walked recursively for sidecars whose partial file is gone
+    and for resumable partials that no queued job owns and that have not been
+    touched for `max_age_seconds`. `legacy_temp_directories` are checked
+    (non-recursively) for `NamedTemporaryFile` staging files as older versions left
+    behind, which carry no marker and are never removed. Returns the number of
+    files removed.
+    """
+    owned_partials = {partial_paths_for(p)[0] for p in owned_final_paths}
+    now = time.time()
+    removed = 0
+
+    def _remove(path: pathlib.Path, reason: str):
+        nonlocal removed
+        try:
+            path.unlink()
+            removed += 1
+            logger.info(f"Sweeper removed '{path}' ({reason}).")
+        except OSError as e:
+            logger.warning(f"Sweeper could not remove '{path}': {e}")
+
+    def _report(path: pathlib.Path, reason: str):
+        logger.warning(
+            f"Sweeper left '{path}' in place ({reason}); it cannot tell whether it belongs to "
+            f"this app. Delete it by hand if it is a leftover download."
+        )
+
+    for directory in set(legacy_temp_directories):
+        if not directory.is_dir():
+            continue
+        for entry in os.scandir(directory):
+            if entry.is_file(follow_symlinks=False) and _LEGACY_TEMP_FILE_PATTERN.match(entry.name):
+                _report(pathlib.Path(entry.path), "possible temporary file of an older version")
+
+    for directory in set(directories):
+        if not directory.is_dir():
+            continue
+        for root, _, files in os.walk(directory):
+            root_path = pathlib.Path(root)
+            for name in files:
+                path = root_path / name
+                if name.endswith(PARTIAL_DOWNLOAD_SUFFIX):
+                    if path in owned_partials:
+                        continue
+                    sidecar_path = path.with_name(name + PARTIAL_SIDECAR_SUFFIX)
+                    if PartialDownload.load(sidecar_path) is None:
+                        _report(path, "partial file without a readable sidecar")
+                    elif now - path.stat().st_mtime > max_age_seconds:
+                        _remove(path, "stale partial download")
+                        _remove(sidecar_path, "stale partial download")
+                elif name.endswith(PARTIAL_DOWNLOAD_SUFFIX + PARTIAL_SIDECAR_SUFFIX):
+                    partial_path = path.with_name(name[: -len(PARTIAL_SIDECAR_SUFFIX)])
+                    if partial_path.exists() or not path.exists():
+                        continue
+                    if PartialDownload.load(path) is None:
+                        _report(path, "unreadable sidecar without a partial file")
+                    else:
+                        _remove(path, "sidecar without partial")
+    return removed
@@ -5,7 +5,12 @@ import pathlib
 from typing import Optional
 
 from .config_manager import ConfigManager
-from ..constants.constants import KNOWN_UI_PROFILES, ModelType
+from ..constants.constants import (
+    KNOWN_UI_PROFILES,
+    MANAGED_UIS_ROOT_PATH,
+    ModelType,
+    UiNameType,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -17,17 +22,26 @@ class PathResolver:
         self.config = config_manager
 
     def _get_target_directory(
-        self, model_type: ModelType, custom_sub_path: Optional[str] = None
+        self,
+        model_type: ModelType,
+        custom_sub_path: Optional[str] = None,
+        ui_name: Optional[UiNameType] = None,
     ) -> Optional[pathlib.Path]:
         """
         (Internal) Determines the base target directory for a given model type.
+        With `ui_name`, the directory is resolved inside that managed UI's
+        installation using its own profile instead of the configured base path.
         """
-        if not self.config.base_path:
+        base_path = MANAGED_UIS_ROOT_PATH / ui_name if ui_name else self.config.base_path
+        if not base_path:
             logger.warning("Cannot get target directory: base_path is not configured.")
             return None
 
         if custom_sub_path:
             relative_path_str = custom_sub_path
+        elif ui_name:
+            profile_paths = KNOWN_UI_PROFILES.get(ui_name, {})
+            relative_path_str = profile_paths.get(str(model_type), str(model_type))
         elif self.config.ui_profile == "Custom":
             relative_path_str = self.config.custom_paths.get(
                 str(model_type), str(model_type)
@@ -46,9 +60,9 @@ class PathResolver:
                 )
                 return None
 
-            target_dir = (self.config.base_path / normalized_path).resolve()
+            target_dir = (base_path / normalized_path).resolve()
 
-            if not str(target_dir).startswith(str(self.config.base_path.resolve())):
+            if not str(target_dir).startswith(str(base_path.resolve())):
                 logger.error(
                     f"Security: Resolved path '{target_dir}' is outside base path. Denying."
                 )
@@ -67,13 +81,15 @@ class PathResolver:
         repo_filename: str,
         model_type: ModelType,
         custom_sub_path: Optional[str] = None,
+        ui_name: Optional[UiNameType] = None,
     ) -> Optional[pathlib.Path]:
         """
         Resolves the final, absolute path where a downloaded file should be saved.
-        This is the main public method for this class.
+        This is the main public method for this class. With `ui_name`, the path is
+        resolved inside that managed UI's installation.
         """
         # 1. Get the base directory (e.g., ".../models/checkpoints")
-        target_dir = self._get_target_directory(model_type, custom_sub_path)
+        target_dir = self._get_target_directory(model_type, custom_sub_path, ui_name)
         if not target_dir:
             return None
 
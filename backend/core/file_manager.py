@@ -5,7 +5,11 @@ import asyncio
 import uuid
 import os
 import shutil
-from typing import Dict, Any, Optional, List, Tuple
+from typing import Dict, Any, Optional, List, Set, Tuple
+from urllib.parse import urlparse
+
+from huggingface_hub import hf_hub_url
+from huggingface_hub.utils import filter_repo_objects
 
 # Import specialized managers and helpers
 from .file_management.config_manager import ConfigManager
@@ -13,11 +17,27 @@ from .file_management.path_resolver import PathResolver
 from .file_management.model_downloader import ModelDownloader
 from .file_management.host_scanner import HostScanner
 from .file_management.download_tracker import download_tracker
+from .file_management.download_queue_store import DownloadQueueStore
+from .file_management.download_history import DownloadHistoryStore
+from .file_management.download_scheduler import DownloadScheduler, MoveDirection
+from .file_management.bandwidth_limiter import bandwidth_limiter
+from .file_management.file_hash_index import FileHashIndex
+from .file_management.disk_space import DiskSpaceLedger
+from .file_management.file_links import link_or_copy
+from .hub_endpoints import hub_endpoints
+from .file_management.partial_download import sweep_orphaned_partials
 from .constants.constants import (
     ModelType,
     UiProfileType,
+    UiNameType,
     ColorThemeType,
     MODEL_FILE_EXTENSIONS,
+    MAX_DOWNLOAD_SEGMENTS,
+    KNOWN_UI_PROFILES,
+    MANAGED_UIS_ROOT_PATH,
+    SNAPSHOT_MAX_PARALLEL_FILES,
+    DISK_SPACE_CHECK_INTERVAL_SECONDS,
+    DOWNLOAD_HISTORY_RECENT_LIMIT,
 )
 
 logger = logging.getLogger(__name__)
@@ -32,8 +52,25 @@ class FileManager:
         """Initializes all the specialized manager components."""
         self.config = ConfigManager()
         self.paths = PathResolver(self.config)
-        self.downloader = ModelDownloader()
+        self.hash_index = FileHashIndex()
+        self.disk_space = DiskSpaceLedger()
+        self.downloader = ModelDownloader(hash_index=self.hash_index, disk_space=self.disk_space)
         self.scanner = HostScanner()
+        self.download_history = DownloadHistoryStore()
+        self.download_queue = DownloadQueueStore(self.download_history)
+        download_tracker.set_history_store(self.download_history)
+        # Jobs still scheduled that no longer take requests for their file (see _close_for_attach).
+        self._attach_closed: Set[str] = set()
+        self.scheduler = DownloadScheduler(
+            run_job=self._run_download_job,
+            max_active=self.config.max_active_downloads,
+            max_per_host=self.config.max_downloads_per_host,
+            on_job_changed=self.download_queue.add,
+            can_start=self._admit_download_job,
+        )
+        bandwidth_limiter.set_global_rate(self.config.bandwidth_limit)
+        hub_endpoints.configure(self.config.hub_endpoints, self.config.trusted_hub_endpoints)
+        download_tracker.set_progress_broadcast_rate(self.config.progress_broadcast_rate)
         logger.info(
             f"FileManager initialized. Profile: '{self.config.ui_profile}', Base Path: '{self.config.base_path}'."
         )
@@ -53,6 +90,9 @@ class FileManager:
         color_theme: Optional[ColorThemeType] = None,
         config_mode: Optional[str] = None,
         automatic_mode_ui: Optional[str] = None,
+        download_segments: Optional[int] = None,
+        max_active_downloads: Optional[int] = None,
+        max_downloads_per_host: Optional[int] = None,
     ) -> Tuple[bool, str]:
         """
         Configures the application paths and settings.
@@ -66,10 +106,56 @@ class FileManager:
             color_theme,
             config_mode,
             automatic_mode_ui,
+            download_segments,
+            max_active_downloads,
+            max_downloads_per_host,
         )
+        self._apply_download_settings()
         success = "failed" not in message
         return success, message
 
+    def _apply_download_settings(self):
+        """Pushes the configured download engine settings into the running scheduler and limiter."""
+        self.scheduler.update_limits(
+            self.config.max_active_downloads, self.config.max_downloads_per_host
+        )
+        bandwidth_limiter.set_global_rate(self.config.bandwidth_limit)
+        hub_endpoints.configure(self.config.hub_endpoints, self.config.trusted_hub_endpoints)
+        download_tracker.set_progress_broadcast_rate(self.config.progress_broadcast_rate)
+
+    def get_download_settings(self) -> Dict[str, Any]:
+        return self.config.get_download_settings()
+
+    def get_broadcast_stats(self) -> Dict[str, Any]:
+        return download_tracker.get_broadcast_stats()
+
+    def update_download_settings(
+        self,
+        download_segments: Optional[int] = None,
+        max_active_downloads: Optional[int] = None,
+        max_downloads_per_host: Optional[int] = None,
+        bandwidth_limit: Optional[int] = None,
+        hub_endpoints: Optional[List[str]] = None,
+        progress_broadcast_rate: Optional[float] = None,
+        trusted_hub_endpoints: Optional[List[str]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Changes download engine settings at runtime. Running downloads are not
+        restarted: new limits apply to them immediately, new segment counts apply
+        to downloads started afterwards.
+        """
+        self.config.update_download_settings(
+            download_segments,
+            max_active_downloads,
+            max_downloads_per_host,
+            bandwidth_limit,
+            hub_endpoints,
+            progress_broadcast_rate,
+            trusted_hub_endpoints,
+        )
+        self._apply_download_settings()
+        return self.get_download_settings()
+
     def start_download_model_file(
         self,
         source: str,
@@ -78,7 +164,22 @@ class FileManager:
         model_type: ModelType,
         custom_sub_path: Optional[str] = None,
         revision: Optional[str] = None,
+        segments: Optional[int] = None,
+        priority: int = 0,
+        bandwidth_limit: Optional[int] = None,
+        size: Optional[int] = None,
+        additional_ui_targets: Optional[List[UiNameType]] = None,
     ) -> Dict[str, Any]:
+        """
+        Queues the download of one file. `size`, if the caller knows it, reserves
+        the disk space up front; otherwise it is reserved once the download learns it.
+
+        The file is fetched once even if it is wanted in several places: it is
+        linked into the model folders of the `additional_ui_targets` after the
+        download, and a request for a file that is already being downloaded
+        attaches to that job (adding its target if it differs) instead of starting
+        a second transfer.
+        """
         if source != "huggingface":
             return {
                 "success": False,
@@ -95,23 +196,57 @@ class FileManager:
                 "success": False,
                 "error": f"Could not resolve a valid save path for model type '{model_type}'.",
             }
-        download_id = str(uuid.uuid4())
-        download_task = asyncio.create_task(
-            self.downloader.download_model_file(
-                download_id=download_id,
-                repo_id=repo_id,
-                hf_filename=filename,
-                target_directory=final_save_path.parent,
-                target_filename_override=final_save_path.name,
-                revision=revision,
+        targets = [final_save_path]
+        for ui_name in additional_ui_targets or []:
+            ui_path = self.paths.resolve_final_save_path(
+                filename, model_type, custom_sub_path, ui_name=ui_name
             )
+            if not ui_path:
+                return {
+                    "success": False,
+                    "error": f"Could not resolve a valid save path in '{ui_name}'.",
+                }
+            if ui_path not in targets:
+                targets.append(ui_path)
+
+        existing = self._find_inflight_download(repo_id, filename, revision)
+        if existing:
+            added = self._attach_download_targets(existing, targets)
+            logger.info(
+                f"Request for '{filename}' attached to download {existing['download_id']}"
+                + (f", adding {len(added)} target(s)." if added else ".")
+            )
+            return {
+                "success": True,
+                "message": "Attached to the download already in progress.",
+                "download_id": existing["download_id"],
+                "attached": True,
+            }
+
+        download_id = str(uuid.uuid4())
+        segment_count = max(
+            1, min(segments or self.config.download_segments, MAX_DOWNLOAD_SEGMENTS)
         )
-        download_tracker.start_tracking(
-            download_id=download_id,
-            repo_id=repo_id,
-            filename=final_save_path.name,
-            task=download_task,
-        )
+        job = {
+            "download_id": download_id,
+            "repo_id": repo_id,
+            "hf_filename": filename,
+            "target_directory": str(final_save_path.parent),
+            "target_filename_override": final_save_path.name,
+            "revision": revision,
+            "segments": segment_count,
+            "host": urlparse(hf_hub_url(repo_id, filename, revision=revision)).hostname,
+            "priority": priority,
+            "paused": False,
+            "bandwidth_limit": bandwidth_limit or None,
+            "size": size,
+            # Further places the finished file is linked into.
+            "extra_targets": [str(path) for path in targets[1:]],
+        }
+        shortfall = self._preflight_disk_space(job)
+        if shortfall:
+            return {"success": False, "error": shortfall}
+        self._launch_download_job(job)
         logger.info(
             f"Queued download {download_id} for '{filename}' -> '{final_save_path}' as a background task."
         )
@@ -121,13 +256,486 @@ class FileManager:
             "download_id": download_id,
         }
 
+    def start_snapshot_download(
+        self,
+        snapshot: Dict[str, Any],
+        model_type: ModelType,
+        include_patterns: Optional[List[str]] = None,
+        exclude_patterns: Optional[List[str]] = None,
+        custom_sub_path: Optional[str] = None,
+        segments: Optional[int] = None,
+        priority: int = 0,
+        bandwidth_limit: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        Queues the files of a repository snapshot (as returned by a source's
+        `get_repo_snapshot`) that match the glob patterns as one download job.
+        Every file is fetched from the snapshot's commit sha. For 'diffusers', the
+        repository layout is kept in a folder named after the repository.
+        """
+        if not self.base_path:
+            return {
+                "success": False,
+                "error": "Base path is not configured. Please configure it first.",
+            }
+        repo_id, commit_sha = snapshot["repo_id"], snapshot["sha"]
+        selected = list(
+            filter_repo_objects(
+                snapshot["files"],
+                allow_patterns=include_patterns or None,
+                ignore_patterns=exclude_patterns or None,
+                key=lambda f: f["rfilename"],
+            )
+        )
+        if not selected:
+            return {"success": False, "error": "No files in the repository match the patterns."}
+
+        files = []
+        target_paths = set()
+        for repo_file in selected:
+            repo_filename = repo_file["rfilename"]
+            if model_type == "diffusers" and not custom_sub_path:
+                repo_filename = f"{repo_id.split('/')[-1]}/{repo_filename}"
+            final_save_path = self.paths.resolve_final_save_path(
+                repo_filename, model_type, custom_sub_path
+            )
+            if not final_save_path:
+                return {
+                    "success": False,
+                    "error": f"Could not resolve a valid save path for model type '{model_type}'.",
+                }
+            if final_save_path in target_paths:
+                return {
+                    "success": False,
+                    "error": f"Several files would be saved as '{final_save_path.name}'. "
+                    f"Use the 'diffusers' model type or narrower patterns.",
+                }
+            target_paths.add(final_save_path)
+            files.append(
+                {
+                    "hf_filename": repo_file["rfilename"],
+                    "target_directory": str(final_save_path.parent),
+                    "target_filename_override": final_save_path.name,
+                    "size": repo_file.get("size"),
+                    "sha256": repo_file.get("sha256"),
+                }
+            )
+
+        download_id = str(uuid.uuid4())
+        job = {
+            "download_id": download_id,
+            "kind": "snapshot",
+            "repo_id": repo_id,
+            "display_name": f"{repo_id.split('/')[-1]} ({len(files)} files)",
+            "revision": commit_sha,
+            "files": files,
+            "segments": max(
+                1, min(segments or self.config.download_segments, MAX_DOWNLOAD_SEGMENTS)
+            ),
+            "host": urlparse(hf_hub_url(repo_id, files[0]["hf_filename"])).hostname,
+            "priority": priority,
+            "paused": False,
+            "bandwidth_limit": bandwidth_limit or None,
+        }
+        shortfall = self._preflight_disk_space(job)
+        if shortfall:
+            return {"success": False, "error": shortfall}
+        self._launch_download_job(job)
+        total_size = sum(f["size"] or 0 for f in files)
+        logger.info(
+            f"Queued snapshot download {download_id} of {len(files)} files ({total_size} bytes) "
+            f"from {repo_id}@{commit_sha}."
+        )
+        return {
+            "success": True,
+            "message": "Snapshot download started.",
+            "download_id": download_id,
+            "revision": commit_sha,
+            "file_count": len(files),
+            "total_size_bytes": total_size,
+        }
+
+    def _find_inflight_download(
+        self, repo_id: str, filename: str, revision: Optional[str]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Returns the queued or running single-file job fetching the same file, if any,
+        unless it has already placed its file and takes no more targets.
+        """
+        entries = [*self.scheduler.active.values(), *self.scheduler.queued.values()]
+        for entry in entries:
+            job = entry.job
+            if job.get("kind") == "snapshot" or entry.download_id in self._attach_closed:
+                continue
+            # No revision means the default branch.
+            if (job["repo_id"], job["hf_filename"], job["revision"] or "main") == (
+                repo_id,
+                filename,
+                revision or "main",
+            ):
+                return job
+        return None
+
+    def _close_for_attach(self, download_id: str):
+        """
+        Stops a job from taking further requests for its file, from now until its
+        task is gone. A later request starts its own job (which finds the file in place).
+        """
+        if download_id in self._attach_closed:
+            return
+        self._attach_closed.add(download_id)
+        task = asyncio.current_task()
+        if task:
+            task.add_done_callback(lambda _: self._attach_closed.discard(download_id))
+
+    def _attach_download_targets(
+        self, job: Dict[str, Any], targets: List[pathlib.Path]
+    ) -> List[pathlib.Path]:
+        """Adds the targets a job does not write yet as extra targets. Returns the added ones."""
+        known = set(self._job_target_paths(job))
+        known.update(pathlib.Path(path) for path in job.get("extra_targets") or [])
+        added = [path for path in targets if path not in known]
+        if added:
+            job.setdefault("extra_targets", []).extend(str(path) for path in added)
+            self.download_queue.add(job)
+        return added
+
+    async def _link_extra_targets(self, job: Dict[str, Any]):
+        """
+        Links the downloaded file of a job into each of its extra targets (copying
+        across filesystems). Targets attached while this runs are picked up too:
+        the job stops taking new ones right after the last target is read, with no
+        await in between.
+        """
+        download_id = job["download_id"]
+        source = self._job_target_paths(job)[0]
+        sha256 = await asyncio.to_thread(self.hash_index.lookup, source)
+        linked = 0
+        # The job's own list, so targets attached while linking are seen by the loop.
+        extra_targets = job.setdefault("extra_targets", [])
+        index = 0
+        while index < len(extra_targets):
+            target = pathlib.Path(extra_targets[index])
+            index += 1
+            try:
+                await asyncio.to_thread(target.parent.mkdir, parents=True, exist_ok=True)
+                method = await asyncio.to_thread(link_or_copy, source, target)
+                if sha256:
+                    await asyncio.to_thread(self.hash_index.record, target, sha256)
+                linked += 1
+                logger.info(f"Download {download_id}: placed '{target}' ({method}).")
+            except OSError as e:
+                logger.error(f"Download {download_id}: could not place '{target}': {e}")
+        self._close_for_attach(download_id)
+        if not index:
+            return
+        await download_tracker.set_status_text(
+            download_id, f"Completed, also placed in {linked} of {index} other location(s)"
+        )
+
+    def _preflight_disk_space(self, job: Dict[str, Any]) -> Optional[str]:
+        """
+        Reserves the disk space of a new job. Returns why the job can never fit (and
+        drops the reservation), or None. Jobs that only fit once others finish are
+        accepted and held in the queue by the scheduler.
+        """
+        self._reserve_disk_space(job)
+        shortfall = self.disk_space.check(job["download_id"], alone=True)
+        if shortfall:
+            self.disk_space.release(job["download_id"])
+            logger.warning(f"Rejected download of '{job['repo_id']}': {shortfall}")
+        return shortfall
+
+    def _reserve_disk_space(self, job: Dict[str, Any]):
+        files = job["files"] if job.get("kind") == "snapshot" else [job]
+        self.disk_space.reserve(
+            job["download_id"],
+            {
+                pathlib.Path(f["target_directory"]) / f["target_filename_override"]: f.get("size")
+                for f in files
+            },
+        )
+
+    def _admit_download_job(self, job: Dict[str, Any]) -> Optional[str]:
+        """Scheduler admission check: a job starts only if its disk space is available."""
+        shortfall = self.disk_space.check(job["download_id"])
+        if not shortfall:
+            self.disk_space.activate(job["download_id"])
+        return shortfall
+
+    def _recheck_running_download_job(self, job: Dict[str, Any]) -> Optional[str]:
+        """
+        (Blocking) Whether a running job still fits: its outstanding bytes against
+        the free space minus what the other running jobs still need.
+        """
+        shortfall = self.disk_space.check(job["download_id"])
+        if shortfall:
+            logger.warning(f"Holding download {job['download_id']}: {shortfall}")
+        return shortfall
+
+    def _download_job_held(self, job: Dict[str, Any]):
+        """A held job stops counting against the others; it keeps its reservation."""
+        self.disk_space.deactivate(job["download_id"])
+
+    async def run_disk_space_checks(self):
+        """
+        Re-checks free disk space periodically. A running download that no longer
+        fits (e.g. because something else filled the disk) is held in the queue with
+        the reason, keeping its partial file, and starts again by itself once space
+        has been freed. Meant to run as a background task.
+        """
+        while True:
+            await asyncio.sleep(DISK_SPACE_CHECK_INTERVAL_SECONDS)
+            try:
+                await self.scheduler.recheck_running(
+                    self._recheck_running_download_job, on_held=self._download_job_held
+                )
+            except Exception as e:
+                logger.error(f"Disk space check failed: {e}", exc_info=True)
+
+    def get_disk_space_status(self) -> List[Dict[str, Any]]:
+        return self.disk_space.get_status()
+
+    def _launch_download_job(self, job: Dict[str, Any]):
+        """Journals a download job, registers it with the tracker and hands it to the scheduler."""
+        if job["download_id"] not in self.disk_space.reservations:
+            self._reserve_disk_space(job)
+        self.download_queue.add(job)
+        download_tracker.start_tracking(
+            download_id=job["download_id"],
+            repo_id=job["repo_id"],
+            filename=job.get("display_name") or job["target_filename_override"],
+            task=None,
+            priority=job.get("priority", 0),
+        )
+        if job.get("kind") == "snapshot":
+            download_tracker.set_files(
+                job["download_id"], {f["hf_filename"]: f["size"] for f in job["files"]}
+            )
+        self.scheduler.submit(job)
+
+    @staticmethod
+    def _job_target_paths(job: Dict[str, Any]) -> List[pathlib.Path]:
+        """Returns the final paths a journaled job writes to."""
+        files = job["files"] if job.get("kind") == "snapshot" else [job]
+        return [pathlib.Path(f["target_directory"]) / f["target_filename_override"] for f in files]
+
+    async def _run_download_job(self, job: Dict[str, Any]):
+        """
+        Runs a journaled download. The journal entry is dropped once the download
+        finishes (successfully or not); if the task is cancelled by a shutdown the
+        entry is kept so the job is restored on the next start.
+        """
+        download_id = job["download_id"]
+        search_directories = await asyncio.to_thread(self._model_search_directories)
+        bandwidth_limiter.set_download_rate(download_id, job.get("bandwidth_limit"))
+        try:
+            if job.get("kind") == "snapshot":
+                await self._run_snapshot_job(job, search_directories)
+            else:
+                completed = await self.downloader.download_model_file(
+                    download_id=download_id,
+                    repo_id=job["repo_id"],
+                    hf_filename=job["hf_filename"],
+                    target_directory=pathlib.Path(job["target_directory"]),
+                    target_filename_override=job["target_filename_override"],
+                    revision=job["revision"],
+                    segments=job["segments"],
+                    dedup_directories=search_directories,
+                )
+                if completed:
+                    await self._link_extra_targets(job)
+                self._close_for_attach(download_id)
+        finally:
+            bandwidth_limiter.release(download_id)
+            # A paused or held job goes back to the queue and keeps its reservation.
+            self.disk_space.deactivate(download_id)
+        self.download_queue.remove(download_id)
+        self.disk_space.release(download_id)
+
+    async def _run_snapshot_job(self, job: Dict[str, Any], search_directories: List[pathlib.Path]):
+        """
+        Downloads the files of a snapshot job concurrently, all sharing the job's
+        bandwidth limit. Files already in place from an earlier run (known to the
+        hash index with the expected hash) are not fetched again.
+        """
+        download_id = job["download_id"]
+        file_slots = asyncio.Semaphore(SNAPSHOT_MAX_PARALLEL_FILES)
+
+        def already_in_place(target: pathlib.Path, sha256: Optional[str]) -> bool:
+            return bool(sha256) and self.hash_index.lookup(target) == sha256
+
+        async def fetch(repo_file: Dict[str, Any]) -> bool:
+            target = (
+                pathlib.Path(repo_file["target_directory"]) / repo_file["target_filename_override"]
+            )
+            async with file_slots:
+                if await asyncio.to_thread(already_in_place, target, repo_file["sha256"]):
+                    await download_tracker.complete_download(
+                        download_id,
+                        str(target),
+                        sha256=repo_file["sha256"],
+                        file_key=repo_file["hf_filename"],
+                    )
+                    return True
+                return await self.downloader.download_model_file(
+                    download_id=download_id,
+                    repo_id=job["repo_id"],
+                    hf_filename=repo_file["hf_filename"],
+                    target_directory=pathlib.Path(repo_file["target_directory"]),
+                    target_filename_override=repo_file["target_filename_override"],
+                    revision=job["revision"],
+                    segments=job["segments"],
+                    bandwidth_key=download_id,
+                    expected_sha256=repo_file["sha256"],
+                    dedup_directories=search_directories,
+                    file_key=repo_file["hf_filename"],
+                )
+
+        try:
+            results = await asyncio.gather(*(fetch(f) for f in job["files"]))
+        except asyncio.CancelledError:
+            await download_tracker.fail_download(
+                download_id, "Download cancelled by user.", cancelled=True
+            )
+            raise
+
+        failed = [f["hf_filename"] for f, ok in zip(job["files"], results) if not ok]
+        if failed:
+            await download_tracker.fail_download(
+                download_id,
+                f"{len(failed)} of {len(results)} files failed: {', '.join(failed[:5])}"
+                + (", ..." if len(failed) > 5 else ""),
+            )
+            return
+        snapshot_root = os.path.commonpath([str(p) for p in self._job_target_paths(job)])
+        await download_tracker.complete_download(download_id, snapshot_root)
+
+    def _model_search_directories(self) -> List[pathlib.Path]:
+        """
+        (Blocking) Returns the model directories of every base path: the configured
+        one and each managed UI installation. A base path with none of the known model
+        directories is searched as a whole.
+        """
+        base_paths = {self.config.base_path}
+        if MANAGED_UIS_ROOT_PATH.is_dir():
+            base_paths.update(p for p in MANAGED_UIS_ROOT_PATH.iterdir() if p.is_dir())
+        relative_dirs = {d for paths in KNOWN_UI_PROFILES.values() for d in paths.values()}
+        relative_dirs.update(self.config.custom_model_type_paths.values())
+
+        directories = []
+        for base_path in filter(None, base_paths):
+            found = [base_path / d for d in sorted(relative_dirs) if (base_path / d).is_dir()]
+            directories.extend(found or [base_path])
+        return directories
+
+    def restore_queued_downloads(self) -> int:
+        """Restarts every download that was still queued or running when the app stopped."""
+        jobs = self.download_queue.get_all()
+        for job in jobs:
+            logger.info(
+                f"Restoring queued download {job['download_id']} for "
+                f"'{job.get('display_name') or job['hf_filename']}'."
+            )
+            self._launch_download_job(job)
+        return len(jobs)
+
+    def restore_download_history(self) -> int:
+        """
+        (Blocking) Brings back the most recently finished downloads from the history
+        and marks jobs that were interrupted by the last shutdown, but are not in the
+        queue journal to be restarted, as failed. Returns how many were interrupted.
+        """
+        interrupted = self.download_history.mark_interrupted(
+            keep=(job["download_id"] for job in self.download_queue.get_all())
+        )
+        download_tracker.restore_finished(
+            self.download_history.get_recent_finished(DOWNLOAD_HISTORY_RECENT_LIMIT)
+        )
+        return interrupted
+
+    def get_download_history(
+        self,
+        statuses: Optional[List[str]] = None,
+        repo_id: Optional[str] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        page: int = 1,
+        limit: int = 50,
+    ) -> Dict[str, Any]:
+        """(Blocking) Returns one page of the download history, newest first."""
+        items, total = self.download_history.query(statuses, repo_id, since, until, page, limit)
+        return {
+            "items": items,
+            "page": page,
+            "limit": limit,
+            "total": total,
+            "has_more": page * limit < total,
+        }
+
+    def sweep_orphaned_partials(self) -> int:
+        """
+        (Blocking) Removes download leftovers (stale partials and stray sidecars) that
+        no queued job owns from the configured model directories, and reports files
+        that look like leftovers but cannot be proven to be this app's.
+        """
+        if not self.base_path:
+            return 0
+        profile_paths = KNOWN_UI_PROFILES.get(self.config.ui_profile, {})
+        model_types = set(profile_paths) | set(self.config.custom_model_type_paths)
+        target_dirs = {d for d in (self.paths._get_target_directory(t) for t in model_types) if d}
+        owned_paths = {
+            path for job in self.download_queue.get_all() for path in self._job_target_paths(job)
+        }
+        return sweep_orphaned_partials(
+            directories=target_dirs,
+            legacy_temp_directories={d.parent for d in target_dirs},
+            owned_final_paths=owned_paths,
+        )
+
     async def cancel_download(self, download_id: str):
         """Requests cancellation of a running download task."""
         logger.info(f"Cancel request received for download {download_id}.")
-        await download_tracker.cancel_and_remove(download_id)
+        # A user cancellation is final; the job must not come back after a restart.
+        self.download_queue.remove(download_id)
+        self.disk_space.release(download_id)
+        if not await self.scheduler.cancel(download_id):
+            await download_tracker.cancel_and_remove(download_id)
+
+    def pause_download(self, download_id: str) -> bool:
+        """Pauses a queued or running download. Returns False if it cannot be paused."""
+        return self.scheduler.pause(download_id)
+
+    def resume_download(self, download_id: str) -> bool:
+        """Puts a paused download back into the queue."""
+        return self.scheduler.resume(download_id)
+
+    def set_download_priority(self, download_id: str, priority: int) -> bool:
+        return self.scheduler.set_priority(download_id, priority)
+
+    def set_download_bandwidth(self, download_id: str, bandwidth_limit: Optional[int]) -> bool:
+        """
+        Sets (or, with None/0, lifts) the bandwidth limit of a queued or running
+        download. A running download picks up the new limit without restarting.
+        """
+        job = self.scheduler.get_job(download_id)
+        if not job:
+            return False
+        job["bandwidth_limit"] = bandwidth_limit or None
+        self.download_queue.add(job)
+        if download_id in self.scheduler.active:
+            bandwidth_limiter.set_download_rate(download_id, bandwidth_limit)
+        return True
+
+    def move_download(self, download_id: str, direction: MoveDirection) -> bool:
+        """Moves a queued download one place up or down in the queue."""
+        return self.scheduler.move(download_id, direction)
 
     async def dismiss_download(self, download_id: str):
-        """Removes a finished (completed/error/cancelled) download from the tracker."""
+        """
+        Removes a finished (completed/error/cancelled) download from the tracker.
+        Its record stays in the download history.
+        """
         logger.info(f"Dismiss request received for download {download_id}.")
         await download_tracker.remove_download(download_id)
 
@@ -0,0 +1,87 @@
+# backend/core/http_client.py
+import logging
+from typing import Dict, Any, Optional
+
+import httpx
+
+from .constants.constants import DEFAULT_HTTP_SETTINGS
+
+logger = logging.getLogger(__name__)
+
+# HTTP/2 support in httpx needs the optional 'h2' package (`pip install httpx[http2]`).
+try:
+    import h2  # noqa: F401
+
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+class HttpClientManager:
+    """
+    Owns the application-scoped, pooled HTTP clients shared by the download
+    engine and the model sources.
+
+    Two pools are kept with the same limits and timeouts:
+    - `client` carries API traffic and negotiates HTTP/2 where the server
+      supports it, so many small requests share one connection.
+    - `transfer_client` carries file transfers and stays on HTTP/1.1, so that
+      segmented downloads open real parallel connections instead of being
+      multiplexed onto a single one.
+
+    Clients are created lazily; the FastAPI lifespan configures them on startup
+    and closes them on shutdown.
+    """
+
+    def __init__(self):
+        self.settings: Dict[str, Any] = dict(DEFAULT_HTTP_SETTINGS)
+        self._client: Optional[httpx.AsyncClient] = None
+        self._transfer_client: Optional[httpx.AsyncClient] = None
+
+    def configure(self, settings: Optional[Dict[str, Any]] = None):
+        """Applies new settings. Only clients created after this call are affected."""
+        self.settings = {**DEFAULT_HTTP_SETTINGS, **(settings or {})}
+
+    def _build_client(self, http2: bool) -> httpx.AsyncClient:
+        limits = httpx.Limits(
+            max_connections=self.settings["max_connections"],
+            max_keepalive_connections=self.settings["max_keepalive_connections"],
+            keepalive_expiry=self.settings["keepalive_expiry_seconds"],
+        )
+        # No pool timeout: when every connection is busy, new requests wait their turn.
+        timeout = httpx.Timeout(
+            connect=self.settings["connect_timeout_seconds"],
+            read=self.settings["read_timeout_seconds"],
+            write=self.settings["read_timeout_seconds"],
+            pool=None,
+        )
+        return httpx.AsyncClient(http2=http2, limits=limits, timeout=timeout, follow_redirects=True)
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """The pooled client for API requests (HTTP/2 when available)."""
+        if self._client is None or self._client.is_closed:
+            use_http2 = bool(self.settings["http2"]) and HTTP2_AVAILABLE
+            if self.settings["http2"] and not HTTP2_AVAILABLE:
+                logger.info("HTTP/2 requested but the 'h2' package is missing; using HTTP/1.1.")
+            self._client = self._build_client(http2=use_http2)
+        return self._client
+
+    @property
+    def transfer_client(self) -> httpx.AsyncClient:
+        """The pooled HTTP/1.1 client for file transfers."""
+        if self._transfer_client is None or self._transfer_client.is_closed:
+            self._transfer_client = self._build_client(http2=False)
+        return self._transfer_client
+
+    async def close(self):
+        """Closes both pools, releasing all kept-alive connections."""
+        for http_client in (self._client, self._transfer_client):
+            if http_client is not None and not http_client.is_closed:
+                await http_client.aclose()
+        self._client = None
+        self._transfer_client = None
+        logger.info("Shared HTTP clients closed.")
+
+
+http_client_manager = HttpClientManager()
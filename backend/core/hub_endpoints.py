@@ -0,0 +1,208 @@
+# backend/core/hub_endpoints.py
+import asyncio
+import logging
+import math
+import time
+from dataclasses import dataclass, asdict
+from typing import Dict, Any, Optional, List, Set
+
+import httpx
+from huggingface_hub import constants as hf_constants
+from huggingface_hub.utils import build_hf_headers
+
+from .http_client import http_client_manager
+from .constants.constants import (
+    HUB_PROBE_INTERVAL_SECONDS,
+    HUB_PROBE_TIMEOUT_SECONDS,
+    HUB_RANKING_REFERENCE_BYTES,
+    HUB_THROUGHPUT_SMOOTHING,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def is_endpoint_failure(error: BaseException) -> bool:
+    """Whether an error means the endpoint itself is unwell (unreachable, stalled or 5xx)."""
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code >= 500
+    return isinstance(error, httpx.TransportError)
+
+
+@dataclass
+class EndpointHealth:
+    """What is known about one Hub endpoint from probes and transfers."""
+
+    url: str
+    healthy: bool = True
+    latency_seconds: Optional[float] = None  # Time to the first byte of the last probe
+    throughput: Optional[float] = None  # Smoothed bytes per second
+    failures: int = 0
+    last_error: Optional[str] = None
+    last_checked: Optional[float] = None
+
+    @property
+    def estimated_seconds(self) -> float:
+        """Estimated time to fetch HUB_RANKING_REFERENCE_BYTES; infinite if unmeasured."""
+        if self.latency_seconds is None:
+            return math.inf
+        if not self.throughput:
+            return self.latency_seconds
+        return self.latency_seconds + HUB_RANKING_REFERENCE_BYTES / self.throughput
+
+    def record_throughput(self, bytes_per_second: float):
+        if self.throughput is None:
+            self.throughput = bytes_per_second
+        else:
+            self.throughput += HUB_THROUGHPUT_SMOOTHING * (bytes_per_second - self.throughput)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class HubEndpointSelector:
+    """
+    Chooses between the configured Hugging Face Hub endpoint and its mirrors.
+
+    Endpoints are probed periodically for latency and throughput and ranked by
+    how fast they are expected to deliver a file. An endpoint that fails a
+    request (connection error, timeout or 5xx) is marked unhealthy and skipped
+    until a later probe succeeds. With a single endpoint nothing is probed.
+
+    The Hugging Face token is only sent to the official Hub endpoint and to
+    mirrors explicitly configured as trusted; other mirrors are asked anonymously.
+    """
+
+    def __init__(self):
+        self.endpoints: Dict[str, EndpointHealth] = {}
+        self.trusted: Set[str] = set()
+        self.configure([])
+
+    def configure(self, urls: Optional[List[str]], trusted: Optional[List[str]] = None):
+        """
+        Sets the endpoints in order of preference. Empty means the default Hub endpoint.
+        `trusted` lists the mirrors that may receive the Hugging Face token.
+        """
+        cleaned = [url.strip().rstrip("/") for url in urls or [] if url and url.strip()]
+        cleaned = list(dict.fromkeys(cleaned)) or [hf_constants.ENDPOINT.rstrip("/")]
+        # Keep what is already known about endpoints that stay configured.
+        self.endpoints = {url: self.endpoints.get(url) or EndpointHealth(url) for url in cleaned}
+        self.trusted = {url.strip().rstrip("/") for url in trusted or [] if url and url.strip()}
+        self.trusted.add(hf_constants.ENDPOINT.rstrip("/"))
+        logger.info(f"Hub endpoints: {', '.join(cleaned)}")
+
+    def is_trusted(self, url: str) -> bool:
+        """Whether `url` (an endpoint or a url on one) may receive the Hugging Face token."""
+        return any(url == base or url.startswith(f"{base}/") for base in self.trusted)
+
+    def headers_for(self, url: str) -> Dict[str, str]:
+        """Request headers for `url`, with the Hugging Face token only if it is trusted."""
+        return build_hf_headers(token=None if self.is_trusted(url) else False)
+
+    def ranked(self) -> List[str]:
+        """Returns the endpoints, healthy and fastest first. Ties keep the configured order."""
+        order = list(self.endpoints)
+        return sorted(
+            order,
+            key=lambda url: (
+                not self.endpoints[url].healthy,
+                self.endpoints[url].estimated_seconds,
+                order.index(url),
+            ),
+        )
+
+    @property
+    def best(self) -> str:
+        return self.ranked()[0]
+
+    def mark_failed(self, url: str, error: Any):
+        health = self.endpoints.get(url)
+        if health is None:
+            return
+        health.healthy = False
+        health.failures += 1
+        health.last_error = str(error) or type(error).__name__
+        logger.warning(f"Hub endpoint {url} marked unhealthy: {health.last_error}")
+
+    def failover(self, url: str, error: Any) -> Optional[str]:
+        """
+        Marks `url` as failed and returns the best remaining healthy endpoint,
+        or None if there is none left to switch to.
+        """
+        self.mark_failed(url, error)
+        return next((u for u in self.ranked() if u != url and self.endpoints[u].healthy), None)
+
+    def record_transfer(self, url: str, num_bytes: int, seconds: float):
+        """Feeds the throughput seen on a real transfer into the endpoint's ranking."""
+        health = self.endpoints.get(url)
+        if health and num_bytes > 0 and seconds > 0:
+            health.record_throughput(num_bytes / seconds)
+
+    async def get(self, path: str, **kwargs) -> httpx.Response:
+        """
+        Issues a GET for `path` on the best endpoint (authenticated if trusted), moving on to the
+        next one whenever an endpoint fails. Returns the last response (or raises the
+        last error) if they all fail.
+        """
+        client = http_client_manager.client
+        last_error: Optional[Exception] = None
+        last_response: Optional[httpx.Response] = None
+        for url in self.ranked():
+            try:
+                response = await client.get(f"{url}{path}", headers=self.headers_for(url), **kwargs)
+            except httpx.TransportError as e:
+                self.mark_failed(url, e)
+                last_error = e
+                continue
+            if response.status_code >= 500 and len(self.endpoints) > 1:
+                self.mark_failed(url, f"HTTP {response.status_code}")
+                last_response = response
+                last_error = None
+                continue
+            self.endpoints[url].healthy = True
+            return response
+        if last_error is not None:
+            raise last_error
+        return last_response
+
+    async def _probe(self, health: EndpointHealth):
+        """Measures the latency and throughput of one endpoint with a small API listing."""
+        client = http_client_manager.client
+        started = time.monotonic()
+
+        async def fetch():
+            async with client.stream(
+                "GET", f"{health.url}/api/models", params={"limit": 100}
+            ) as response:
+                first_byte = time.monotonic()
+                response.raise_for_status()
+                return first_byte, len(await response.aread())
+
+        try:
+            first_byte, size = await asyncio.wait_for(fetch(), HUB_PROBE_TIMEOUT_SECONDS)
+            finished = time.monotonic()
+        except Exception as e:
+            self.mark_failed(health.url, e)
+        else:
+            health.healthy = True
+            health.last_error = None
+            health.latency_seconds = first_byte - started
+            if finished > first_byte:
+                health.record_throughput(size / (finished - first_byte))
+        health.last_checked = time.time()
+
+    async def probe_all(self):
+        await asyncio.gather(*(self._probe(health) for health in list(self.endpoints.values())))
+
+    async def run_probes(self):
+        """Probes the endpoints periodically. Meant to run as a background task."""
+        while True:
+            if len(self.endpoints) > 1:
+                await self.probe_all()
+                logger.debug(f"Hub endpoint ranking: {self.ranked()}")
+            await asyncio.sleep(HUB_PROBE_INTERVAL_SECONDS)
+
+    def get_status(self) -> List[Dict[str, Any]]:
+        return [self.endpoints[url].to_dict() for url in self.ranked()]
+
+
+hub_endpoints = HubEndpointSelector()
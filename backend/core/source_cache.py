@@ -0,0 +1,166 @@
+# backend/core/source_cache.py
+import asyncio
+import json
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Set
+
+from .constants.constants import SOURCE_CACHE_MAX_STALE_SECONDS, SOURCE_CACHE_MAX_BYTES
+
+logger = logging.getLogger(__name__)
+
+# Fetches a fresh value; gets the previous (expired) value, if any, to revalidate against.
+Fetcher = Callable[[Optional[Any]], Awaitable[Any]]
+# Called with the kind, key and value of an entry that left the cache.
+DiscardCallback = Callable[[str, Hashable, Any], None]
+
+
+@dataclass
+class _CacheEntry:
+    value: Any
+    size: int
+    fetched_at: float
+    ttl: float
+
+    def age(self) -> float:
+        return time.monotonic() - self.fetched_at
+
+
+class SourceCache:
+    """
+    An in-memory TTL cache with LRU eviction for responses of the model sources.
+
+    - A fresh entry is returned as is.
+    - An entry up to SOURCE_CACHE_MAX_STALE_SECONDS past its TTL is returned at once
+      and refreshed in the background (stale-while-revalidate).
+    - Anything else is fetched before answering; concurrent requests for the same
+      key share one fetch.
+
+    Sizes are estimated from the JSON form of the values, and the least recently
+    used entries are evicted beyond `max_bytes`. None values are not cached.
+    `on_discard` is told about every value that is evicted or replaced by a newer
+    one, so state tied to it (such as search cursors) can be dropped along with it.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = SOURCE_CACHE_MAX_BYTES,
+        max_stale: float = SOURCE_CACHE_MAX_STALE_SECONDS,
+        on_discard: Optional[DiscardCallback] = None,
+    ):
+        self.max_bytes = max_bytes
+        self.max_stale = max_stale
+        self._on_discard = on_discard
+        self.entries: "OrderedDict[Hashable, _CacheEntry]" = OrderedDict()
+        self.size = 0
+        self._in_flight: Dict[Hashable, asyncio.Future] = {}
+        # Background refreshes; the event loop only keeps weak references to tasks.
+        self._refresh_tasks: Set[asyncio.Task] = set()
+        # Counters per kind of entry (e.g. 'search', 'details').
+        self.counters: Dict[str, Dict[str, int]] = {}
+        self.evictions = 0
+
+    def count(self, kind: str, counter: str, amount: int = 1):
+        counters = self.counters.setdefault(
+            kind, {"hits": 0, "stale_hits": 0, "misses": 0, "refreshes": 0, "errors": 0}
+        )
+        counters[counter] = counters.get(counter, 0) + amount
+
+    async def get(self, kind: str, key: Hashable, ttl: float, fetch: Fetcher) -> Any:
+        """Returns the cached value for `key`, fetching or refreshing it as needed."""
+        key = (kind, key)
+        entry = self.entries.get(key)
+        if entry is not None:
+            age = entry.age()
+            if age <= entry.ttl + self.max_stale:
+                self.entries.move_to_end(key)
+                if age <= entry.ttl:
+                    self.count(kind, "hits")
+                else:
+                    self.count(kind, "stale_hits")
+                    if key not in self._in_flight:
+                        task = asyncio.create_task(
+                            self._refresh(kind, key, ttl, fetch, entry.value, background=True)
+                        )
+                        self._refresh_tasks.add(task)
+                        task.add_done_callback(self._refresh_tasks.discard)
+                return entry.value
+
+        self.count(kind, "misses")
+        in_flight = self._in_flight.get(key)
+        if in_flight is not None:
+            return await asyncio.shield(in_flight)
+        return await self._refresh(kind, key, ttl, fetch, entry.value if entry else None)
+
+    async def _refresh(
+        self,
+        kind: str,
+        key: Hashable,
+        ttl: float,
+        fetch: Fetcher,
+        previous: Optional[Any],
+        background: bool = False,
+    ) -> Any:
+        """Fetches a value and stores it; waiting requests get the same result or error."""
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            value = await fetch(previous)
+        except Exception as e:
+            self.count(kind, "errors")
+            future.set_exception(e)
+            # Nobody else may be waiting; mark the exception as retrieved.
+            future.exception()
+            if background:
+                logger.warning(f"Background refresh of {key} failed; keeping the old entry: {e}")
+                return previous
+            raise
+        else:
+            if background:
+                self.count(kind, "refreshes")
+            self._store(key, value, ttl)
+            future.set_result(value)
+            return value
+        finally:
+            self._in_flight.pop(key, None)
+            if not future.done():
+                # Cancelled mid-fetch; don't leave the requests sharing this fetch waiting.
+                future.cancel()
+
+    def _discard(self, key: Hashable, entry: _CacheEntry):
+        if self._on_discard:
+            kind, inner_key = key
+            try:
+                self._on_discard(kind, inner_key, entry.value)
+            except Exception as e:
+                logger.warning(f"Discarding cache entry {key} failed: {e}")
+
+    def _store(self, key: Hashable, value: Any, ttl: float):
+        old = self.entries.pop(key, None)
+        if old is not None:
+            self.size -= old.size
+            self._discard(key, old)
+        if value is None:
+            return
+        size = len(json.dumps(value, default=str))
+        if size > self.max_bytes:
+            return
+        self.entries[key] = _CacheEntry(value, size, time.monotonic(), ttl)
+        self.size += size
+        while self.size > self.max_bytes:
+            evicted_key, evicted = self.entries.popitem(last=False)
+            self.size -= evicted.size
+            self.evictions += 1
+            self._discard(evicted_key, evicted)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Returns the counters per kind and the current size of the cache."""
+        return {
+            "kinds": {kind: dict(counters) for kind, counters in self.counters.items()},
+            "entries": len(self.entries),
+            "size_bytes": self.size,
+            "max_bytes": self.max_bytes,
+            "evictions": self.evictions,
+        }
@@ -2,6 +2,8 @@
 import logging
 from typing import List, Dict, Optional, Any, Tuple
 
+from .constants.constants import SEARCH_CACHE_TTL_SECONDS, DETAILS_CACHE_TTL_SECONDS
+from .source_cache import SourceCache
 from .sources.base import APISource
 from .sources.hf_source import HuggingFaceSource
 
@@ -19,11 +21,14 @@ class SourceManager:
 
     This class acts as a single point of entry for searching and retrieving
     model information, abstracting away the specifics of each source API.
+    Search results and model details are cached (see SourceCache), keyed on the
+    normalized request.
     """
 
     def __init__(self):
         """Initializes the SourceManager and registers all available sources."""
         self.sources: Dict[str, APISource] = {}
+        self.cache = SourceCache(on_discard=self._discard_cached)
         self._register_sources()
         logger.info(
             f"SourceManager initialized with sources: {list(self.sources.keys())}"
@@ -42,9 +47,9 @@ class SourceManager:
         # civitai_source = CivitaiSource()
         # self.sources[civitai_source.name] = civitai_source
 
-    def search_models(
+    async def search_models(
         self, source: Optional[str] = None, **kwargs: Any
-    ) -> Tuple[List[Dict[str, Any]], bool]:
+    ) -> Tuple[List[Dict[str, Any]], bool, Optional[str]]:
         """
         Searches for models, either from a specific source or all sources.
 
@@ -54,7 +59,7 @@ class SourceManager:
             **kwargs: Search parameters to be passed to the source's search method.
 
         Returns:
-            A tuple of (results_list, has_more_flag).
+            A tuple of (results_list, has_more_flag, next_cursor).
         """
         # For now, default to 'huggingface' if no source is specified.
         # A multi-source search would require more complex logic for merging and pagination.
@@ -63,11 +68,27 @@ class SourceManager:
         if target_source_name not in self.sources:
             raise ValueError(f"Source '{target_source_name}' is not registered.")
 
-        logger.info(f"Delegating search to '{target_source_name}' source.")
+        # Equivalent searches share a cache entry: trimmed terms, sorted unique tags.
+        for term in ("search_query", "author"):
+            if term in kwargs:
+                kwargs[term] = (kwargs[term] or "").strip() or None
+        if "tags" in kwargs:
+            kwargs["tags"] = sorted({t.strip() for t in kwargs["tags"] or [] if t.strip()}) or None
+        key = (target_source_name,) + tuple(
+            sorted((name, tuple(v) if isinstance(v, list) else v) for name, v in kwargs.items())
+        )
+
         target_source = self.sources[target_source_name]
-        return target_source.search_models(**kwargs)
 
-    def get_model_details(self, model_id: str, source: str) -> Optional[Dict[str, Any]]:
+        async def fetch(
+            previous: Optional[Tuple],
+        ) -> Tuple[List[Dict[str, Any]], bool, Optional[str]]:
+            logger.info(f"Delegating search to '{target_source_name}' source.")
+            return await target_source.search_models(**kwargs)
+
+        return await self.cache.get("search", key, SEARCH_CACHE_TTL_SECONDS, fetch)
+
+    async def get_model_details(self, model_id: str, source: str) -> Optional[Dict[str, Any]]:
         """
         Retrieves model details from a specific source.
 
@@ -84,6 +105,39 @@ class SourceManager:
             )
             return None
 
-        logger.info(f"Delegating detail request for '{model_id}' to '{source}' source.")
         target_source = self.sources[source]
-        return target_source.get_model_details(model_id=model_id)
+
+        async def fetch(previous: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+            logger.info(f"Delegating detail request for '{model_id}' to '{source}' source.")
+            details = await target_source.get_model_details(model_id=model_id, cached=previous)
+            if previous and details and previous.get("sha") == details.get("sha"):
+                self.cache.count("details", "unchanged")
+            return details
+
+        return await self.cache.get("details", (source, model_id), DETAILS_CACHE_TTL_SECONDS, fetch)
+
+    def _discard_cached(self, kind: str, key: Tuple, value: Any):
+        """Lets a source drop the cursor handed out with a search page that left the cache."""
+        if kind == "search" and value and value[2]:
+            source = self.sources.get(key[0])
+            if source:
+                source.forget_cursor(value[2])
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Returns the hit and miss counters and the size of the source cache."""
+        return self.cache.get_stats()
+
+    async def get_repo_snapshot(
+        self, model_id: str, source: str, revision: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Resolves a repository revision to a fixed snapshot (commit sha and file list).
+
+        Returns:
+            The snapshot dictionary, or None if the source, repository or revision
+            does not exist.
+        """
+        if source not in self.sources:
+            logger.error(f"Attempted to resolve a snapshot from unregistered source: '{source}'")
+            return None
+        return await self.sources[source].get_repo_snapshot(model_id, revision=revision)
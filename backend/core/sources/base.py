@@ -19,7 +19,7 @@ class APISource(ABC):
         pass
 
     @abstractmethod
-    def search_models(
+    async def search_models(
         self,
         search_query: Optional[str] = None,
         author: Optional[str] = None,
@@ -28,7 +28,8 @@ class APISource(ABC):
         sort_direction: Optional[int] = -1,
         limit: int = 30,
         page: int = 1,
-    ) -> Tuple[List[Dict[str, Any]], bool]:
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[Dict[str, Any]], bool, Optional[str]]:
         """
         Searches for models from this specific source.
 
@@ -40,24 +41,58 @@ class APISource(ABC):
             sort_direction: Sort direction (-1 for desc, 1 for asc).
             limit: The number of results per page.
             page: The page number (1-indexed).
+            cursor: A `next_cursor` returned for the previous page. If it is still
+                    known, the page after it is returned, regardless of `page`.
 
         Returns:
             A tuple containing:
                 - A list of model data dictionaries.
                 - A boolean indicating if more pages are available (`has_more`).
+                - An opaque cursor for the next page, or None.
+        """
+        pass
+
+    def forget_cursor(self, cursor: str):
+        """
+        Drops whatever is kept for a `next_cursor` returned by `search_models`, once
+        the page that returned it is no longer cached. Sources without cursor state
+        need not override this.
         """
         pass
 
     @abstractmethod
-    def get_model_details(self, model_id: str) -> Optional[Dict[str, Any]]:
+    async def get_model_details(
+        self, model_id: str, cached: Optional[Dict[str, Any]] = None
+    ) -> Optional[Dict[str, Any]]:
         """
         Retrieves detailed information for a specific model.
 
         Args:
             model_id: The unique identifier for the model within this source
                       (e.g., 'author/model_name').
+            cached: Details returned earlier. Parts that only change with the
+                    repository (such as the README) are reused from them if the
+                    repository's `sha` is unchanged.
 
         Returns:
             A dictionary containing detailed model information, or None if not found.
         """
         pass
+
+    @abstractmethod
+    async def get_repo_snapshot(
+        self, model_id: str, revision: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Resolves a revision of a model repository to a fixed snapshot.
+
+        Args:
+            model_id: The unique identifier for the model within this source.
+            revision: A branch, tag or commit. Defaults to the main branch.
+
+        Returns:
+            A dictionary with the resolved commit `sha` and the snapshot's `files`
+            (each with `rfilename`, `size` and, for LFS files, `sha256`), or None
+            if the repository or revision does not exist.
+        """
+        pass
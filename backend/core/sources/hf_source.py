@@ -1,31 +1,65 @@
 # backend/core/sources/hf_source.py
+import json
+import secrets
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
 from typing import List, Dict, Optional, Tuple, Any
-from huggingface_hub import HfApi, ModelInfo
-from huggingface_hub.utils import (
-    GatedRepoError,
-    RepositoryNotFoundError,
-    HFValidationError,
-    HfHubHTTPError,
-)
+from urllib.parse import quote
+
+import httpx
+from huggingface_hub import ModelInfo, constants as hf_constants
 import logging
 
 from .base import APISource
+from ..constants.constants import SEARCH_CACHE_TTL_SECONDS, SOURCE_CACHE_MAX_STALE_SECONDS
+from ..http_client import http_client_manager
+from ..hub_endpoints import hub_endpoints
 
 logger = logging.getLogger(__name__)
 
 # Define the sort keys that Hugging Face API restricts to descending order only.
 DESC_ONLY_SORTS = {"downloads", "likes", "lastModified"}
+# Statuses of searches the Hub rejects (gated or missing repositories, invalid
+# parameters), answered with no results like HfApi's GatedRepoError,
+# RepositoryNotFoundError and HFValidationError were.
+REJECTED_SEARCH_STATUSES = {400, 401, 403, 404, 422}
+# The Hub returns at most this many models per list request.
+MAX_HUB_PAGE_SIZE = 1000
+# Where a search stopped is kept (renewed on use) for as long as the cached page that handed
+# out its cursor may still be served, so the next page can continue from there; at most this
+# many such positions are kept, the least recently created dropped first.
+SEARCH_CURSOR_TTL_SECONDS = SEARCH_CACHE_TTL_SECONDS + SOURCE_CACHE_MAX_STALE_SECONDS
+MAX_SEARCH_CURSORS = 256
+
+
+@dataclass
+class _SearchPosition:
+    """Where a walk through the results of one query stopped."""
+
+    query_key: str
+    offset: int  # Index of the first entry of `buffered` within all results
+    buffered: List[Dict[str, Any]]  # Entries already fetched but not yet returned
+    next_url: Optional[str]  # The Hub's link to the entries after `buffered`
+    expires_at: float
 
 
 class HuggingFaceSource(APISource):
     """
     An APISource implementation for interacting with the Hugging Face Hub.
+
+    Requests go through the application's shared, pooled HTTP client rather
+    than through HfApi's own sessions, and are sent to the fastest healthy Hub
+    endpoint, failing over to the configured mirrors.
     """
 
     def __init__(self):
-        """Initializes the HuggingFaceSource with an HfApi client."""
-        self.client = HfApi()
-        logger.info(f"'{self.name}' source initialized with HfApi client.")
+        """Initializes the HuggingFaceSource against the configured Hub endpoints."""
+        # Opaque search cursor -> where the search stopped, oldest first.
+        self._positions: "OrderedDict[str, _SearchPosition]" = OrderedDict()
+        # (query, offset) -> cursor, so plain page numbers find cached positions too.
+        self._position_index: Dict[Tuple[str, int], str] = {}
+        logger.info(f"'{self.name}' source initialized for endpoints {hub_endpoints.ranked()}.")
 
     @property
     def name(self) -> str:
@@ -83,7 +117,80 @@ class HuggingFaceSource(APISource):
             "readme_content": readme_content,
         }
 
-    def search_models(
+    async def _get(self, path: str, params: Optional[Any] = None) -> httpx.Response:
+        """Issues an authenticated GET for a Hub path on the best available endpoint."""
+        return await hub_endpoints.get(path, params=params)
+
+    async def _fetch_models_page(
+        self, params: Optional[Dict[str, Any]] = None, url: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Fetches one page of raw model entries, either for a new query (`params`) or
+        from a Hub cursor link (`url`). Returns the entries and the `Link: next` url.
+        """
+        if url:
+            # The next link already carries the query parameters and the cursor;
+            # stay on the endpoint that issued it.
+            response = await http_client_manager.client.get(
+                url, headers=hub_endpoints.headers_for(url)
+            )
+        else:
+            response = await self._get("/api/models", params=params)
+        response.raise_for_status()
+        return response.json(), response.links.get("next", {}).get("url")
+
+    def _remember_position(self, position: _SearchPosition) -> str:
+        """Caches where a search stopped and returns the opaque cursor for it."""
+        now = time.monotonic()
+        for token, cached in list(self._positions.items()):
+            if cached.expires_at <= now:
+                self._forget_position(token)
+        while len(self._positions) >= MAX_SEARCH_CURSORS:
+            self._forget_position(next(iter(self._positions)))
+
+        token = secrets.token_urlsafe(16)
+        self._positions[token] = position
+        self._position_index[(position.query_key, position.offset)] = token
+        return token
+
+    def _forget_position(self, token: str):
+        position = self._positions.pop(token, None)
+        if position and self._position_index.get((position.query_key, position.offset)) == token:
+            del self._position_index[(position.query_key, position.offset)]
+
+    def forget_cursor(self, cursor: str):
+        """Drops the cached position of a cursor, e.g. once the page that returned it is evicted."""
+        self._forget_position(cursor)
+
+    def _find_position(
+        self, query_key: str, start: int, cursor: Optional[str]
+    ) -> Optional[_SearchPosition]:
+        """
+        Returns the cached position a search can continue from: the one of `cursor`
+        if it belongs to this query, else the closest one at or before `start`.
+        """
+        now = time.monotonic()
+        candidates = [self._positions.get(cursor)] if cursor else []
+        token = self._position_index.get((query_key, start))
+        candidates.append(self._positions.get(token) if token else None)
+        candidates.append(
+            max(
+                (
+                    p
+                    for p in self._positions.values()
+                    if p.query_key == query_key and p.offset <= start
+                ),
+                key=lambda p: p.offset,
+                default=None,
+            )
+        )
+        for position in candidates:
+            if position and position.query_key == query_key and position.expires_at > now:
+                position.expires_at = now + SEARCH_CURSOR_TTL_SECONDS
+                return position
+        return None
+
+    async def search_models(
         self,
         search_query: Optional[str] = None,
         author: Optional[str] = None,
@@ -92,8 +199,16 @@ class HuggingFaceSource(APISource):
         sort_direction: Optional[int] = -1,
         limit: int = 30,
         page: int = 1,
-    ) -> Tuple[List[Dict[str, Any]], bool]:
-        """Searches for models on the Hugging Face Hub with server-side pagination."""
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[Dict[str, Any]], bool, Optional[str]]:
+        """
+        Searches for models on the Hugging Face Hub with server-side pagination.
+
+        The Hub pages through results with `Link: next` cursors. Where a search
+        stopped is cached (for SEARCH_CURSOR_TTL_SECONDS), so the next page - asked
+        for by the returned `next_cursor` or simply by page number - continues from
+        there instead of fetching all earlier results again.
+        """
 
         final_sort_direction = sort_direction
         if sort_by in DESC_ONLY_SORTS and sort_direction == 1:
@@ -107,51 +222,58 @@ class HuggingFaceSource(APISource):
             f"[{self.name}] Searching models: page={page}, limit={limit}, query='{search_query}', sort='{sort_by}', direction='{final_sort_direction}'"
         )
 
-        models_iterator = self.client.list_models(
-            search=search_query,
-            author=author,
-            filter=tags,
-            sort=sort_by,
-            direction=final_sort_direction,
-            limit=None,
-            full=False,
-            cardData=False,
-        )
+        params: Dict[str, Any] = {"sort": sort_by, "direction": final_sort_direction}
+        if search_query:
+            params["search"] = search_query
+        if author:
+            params["author"] = author
+        if tags:
+            params["filter"] = sorted(tags)
+        query_key = json.dumps(params, sort_keys=True)
 
-        results_for_page = []
-        start_index = (page - 1) * limit
-        end_index_for_check = start_index + limit + 1
-        items_processed_count = 0
+        start = (page - 1) * limit
+        position = self._find_position(query_key, start, cursor)
+        if position and cursor and self._positions.get(cursor) is position:
+            start = position.offset
 
         try:
-            for i, model_info in enumerate(models_iterator):
-                items_processed_count = i + 1
-                if start_index <= i < (start_index + limit):
-                    results_for_page.append(
-                        self._model_info_to_dict_list_item(model_info)
-                    )
+            try:
+                items, has_more, next_position = await self._read_results(
+                    params, query_key, start, limit, position
+                )
+            except httpx.HTTPStatusError as e:
+                if position is None or not position.next_url:
+                    raise
+                # The Hub cursor may have expired; walk the query from the start instead.
+                logger.info(f"[{self.name}] Cached search cursor failed ({e}); starting over.")
+                for token in [t for t, p in self._positions.items() if p.query_key == query_key]:
+                    self._forget_position(token)
+                items, has_more, next_position = await self._read_results(
+                    params, query_key, start, limit, None
+                )
+            results_for_page = []
+            for item in items:
+                item.setdefault("siblings", None)
+                results_for_page.append(self._model_info_to_dict_list_item(ModelInfo(**item)))
 
-                if items_processed_count >= end_index_for_check:
-                    break
-
-            has_more = items_processed_count > (start_index + limit)
-
-        except HfHubHTTPError as e:
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code in REJECTED_SEARCH_STATUSES:
+                logger.error(
+                    f"[{self.name}] API error during search (query: '{search_query}'): {e}"
+                )
+                return [], False, None
             logger.error(
                 f"[{self.name}] HTTP error during search (query: '{search_query}'): {e}"
             )
             raise
-        except (GatedRepoError, RepositoryNotFoundError, HFValidationError) as e:
-            logger.error(
-                f"[{self.name}] API error during search (query: '{search_query}'): {e}"
-            )
-            return [], False
         except Exception as e:
             logger.error(
                 f"[{self.name}] Unexpected error during search: {e}", exc_info=True
             )
             raise
 
+        next_cursor = self._remember_position(next_position) if has_more else None
+
         # --- If the original request was for ascending sort on a descending-only field,
         # we reverse the results of the page to simulate the expected ascending order.
         if sort_by in DESC_ONLY_SORTS and sort_direction == 1:
@@ -160,43 +282,107 @@ class HuggingFaceSource(APISource):
             )
             results_for_page.reverse()
 
-        return results_for_page, has_more
+        return results_for_page, has_more, next_cursor
+
+    async def _read_results(
+        self,
+        params: Dict[str, Any],
+        query_key: str,
+        start: int,
+        limit: int,
+        position: Optional[_SearchPosition],
+    ) -> Tuple[List[Dict[str, Any]], bool, _SearchPosition]:
+        """
+        Reads raw results [start, start + limit) of a query, continuing from a cached
+        position if there is one. Returns them, whether more follow, and the position
+        after them.
+        """
+        if position:
+            offset, buffered, next_url = position.offset, list(position.buffered), position.next_url
+        else:
+            # Fetch everything up to the "has more" probe in as few requests as possible;
+            # the Hub keeps this page size in its next links.
+            first_page = {**params, "limit": min(start + limit + 1, MAX_HUB_PAGE_SIZE)}
+            offset = 0
+            buffered, next_url = await self._fetch_models_page(params=first_page)
+
+        while True:
+            # Results before the requested page are not kept.
+            skipped = min(start - offset, len(buffered))
+            if skipped > 0:
+                del buffered[:skipped]
+                offset += skipped
+            if (offset == start and len(buffered) > limit) or not next_url:
+                break
+            page_items, next_url = await self._fetch_models_page(url=next_url)
+            buffered.extend(page_items)
+
+        items = buffered[:limit] if offset == start else []
+        next_position = _SearchPosition(
+            query_key=query_key,
+            offset=start + len(items),
+            buffered=buffered[len(items) :],
+            next_url=next_url,
+            expires_at=time.monotonic() + SEARCH_CURSOR_TTL_SECONDS,
+        )
+        return items, len(buffered) > limit, next_position
+
+    async def _fetch_readme(self, model_id: str, revision: str, filename: str) -> Optional[str]:
+        """Downloads the README of a model at a given revision, or None on failure."""
+        path = f"/{model_id}/resolve/{quote(revision, safe='')}/{filename}"
+        try:
+            response = await self._get(path)
+            response.raise_for_status()
+            return response.text
+        except Exception as e:
+            logger.warning(f"[{self.name}] Could not read README for {model_id}: {e}")
+            return None
 
-    def get_model_details(self, model_id: str) -> Optional[Dict[str, Any]]:
-        """Retrieves detailed information for a specific model from the Hub."""
+    async def get_model_details(
+        self, model_id: str, cached: Optional[Dict[str, Any]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Retrieves detailed information for a specific model from the Hub. The README
+        is taken from `cached` details if they were made at the same commit.
+        """
         logger.info(f"[{self.name}] Fetching details for model: {model_id}")
         try:
-            model_info = self.client.model_info(model_id, files_metadata=True)
-            if not model_info:
+            response = await self._get(f"/api/models/{model_id}", params={"blobs": True})
+            # The Hub answers 401 instead of 404 for repositories that do not exist.
+            if response.status_code == 404 or (
+                response.status_code == 401
+                and response.headers.get("x-error-code") == "RepoNotFound"
+            ):
+                logger.info(f"[{self.name}] Model repository '{model_id}' not found.")
                 return None
+            response.raise_for_status()
+            model_info = ModelInfo(**response.json())
 
             readme_content = None
             readme_filename = next(
                 (
                     s.rfilename
-                    for s in model_info.siblings
+                    for s in (model_info.siblings or [])
                     if s.rfilename.upper() == "README.MD"
                 ),
                 None,
             )
 
-            if readme_filename:
-                try:
-                    readme_path = self.client.hf_hub_download(
-                        repo_id=model_id, filename=readme_filename, repo_type="model"
-                    )
-                    with open(readme_path, "r", encoding="utf-8") as f:
-                        readme_content = f.read()
-                except Exception as e:
-                    logger.warning(
-                        f"[{self.name}] Could not read README for {model_id}: {e}"
-                    )
+            if (
+                readme_filename
+                and cached
+                and model_info.sha
+                and cached.get("sha") == model_info.sha
+            ):
+                logger.info(f"[{self.name}] {model_id} is unchanged; reusing its README.")
+                readme_content = cached.get("readme_content")
+            elif readme_filename:
+                readme_content = await self._fetch_readme(
+                    model_id, model_info.sha or "main", readme_filename
+                )
 
             return self._model_info_to_dict_details(model_info, readme_content)
-        except RepositoryNotFoundError:
-            logger.info(f"[{self.name}] Model repository '{model_id}' not found.")
-            return None
-        except (GatedRepoError, HFValidationError, HfHubHTTPError) as e:
+        except httpx.HTTPStatusError as e:
             logger.error(f"[{self.name}] API error for {model_id}: {e}")
             raise
         except Exception as e:
@@ -205,3 +391,30 @@ class HuggingFaceSource(APISource):
                 exc_info=True,
             )
             raise
+
+    async def get_repo_snapshot(
+        self, model_id: str, revision: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Resolves a revision to its commit sha and lists the files of that commit."""
+        revision = revision or hf_constants.DEFAULT_REVISION
+        logger.info(f"[{self.name}] Resolving snapshot of {model_id}@{revision}")
+        response = await self._get(
+            f"/api/models/{model_id}/revision/{quote(revision, safe='')}",
+            params={"blobs": True},
+        )
+        if response.status_code == 404 or (
+            response.status_code == 401 and response.headers.get("x-error-code") == "RepoNotFound"
+        ):
+            logger.info(f"[{self.name}] Snapshot {model_id}@{revision} not found.")
+            return None
+        response.raise_for_status()
+        data = response.json()
+        files = [
+            {
+                "rfilename": sibling["rfilename"],
+                "size": sibling.get("size"),
+                "sha256": (sibling.get("lfs") or {}).get("sha256"),
+            }
+            for sibling in data.get("siblings") or []
+        ]
+        return {"repo_id": model_id, "sha": data.get("sha"), "files": files}
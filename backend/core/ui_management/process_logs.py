@@ -0,0 +1,296 @@
+# backend/core/ui_management/process_logs.py
+import asyncio
+import logging
+import pathlib
+import re
+import shutil
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from ..constants.constants import (
+    PROCESS_LOG_DIR,
+    PROCESS_LOG_READ_CHUNK_BYTES,
+    PROCESS_LOG_BUFFER_LINES,
+    PROCESS_LOG_SEGMENT_BYTES,
+    PROCESS_LOG_MAX_SEGMENTS,
+    PROCESS_LOG_MAX_TASKS,
+    PROCESS_LOG_RANGE_MAX_BYTES,
+)
+
+logger = logging.getLogger(__name__)
+
+# Task ids become directory names, so only plain ids (like UUIDs) are accepted.
+_TASK_ID_PATTERN = re.compile(r"^[A-Za-z0-9_-]+$")
+_SEGMENT_SUFFIX = ".log"
+
+
+@dataclass
+class TaskLog:
+    """
+    The output of one task. Recent lines are kept in memory; all of it is written
+    to the task's log files, where each file is named by the byte offset it starts at.
+    """
+
+    task_id: str
+    directory: pathlib.Path
+    created_at: float = field(default_factory=time.time)
+    finished: bool = False
+    # Number of lines so far; `recent` holds the last of them.
+    line_count: int = 0
+    recent: Deque[str] = field(default_factory=lambda: deque(maxlen=PROCESS_LOG_BUFFER_LINES))
+    # Lines not yet sent to clients. If more pile up than fit, the oldest are skipped.
+    unsent: Deque[str] = field(default_factory=lambda: deque(maxlen=PROCESS_LOG_BUFFER_LINES))
+    # Encoded lines not yet written to disk.
+    unwritten: List[bytes] = field(default_factory=list)
+    # The incomplete last line read from each stream.
+    _partial: Dict[str, bytes] = field(default_factory=dict)
+
+    def feed(self, stream_name: str, chunk: bytes):
+        """Adds a chunk of raw output; a trailing incomplete line waits for the next chunk."""
+        data = self._partial.pop(stream_name, b"") + chunk
+        head, newline, rest = data.rpartition(b"\n")
+        if len(rest) >= PROCESS_LOG_READ_CHUNK_BYTES:
+            # Output without line breaks is not held back indefinitely.
+            head, rest = data, b""
+        elif not newline:
+            self._partial[stream_name] = rest
+            return
+        if rest:
+            self._partial[stream_name] = rest
+        self._add_text(head.decode("utf-8", errors="replace"))
+
+    def end_stream(self, stream_name: str):
+        """Adds what is left of a stream once it has ended."""
+        rest = self._partial.pop(stream_name, b"")
+        if rest:
+            self._add_text(rest.decode("utf-8", errors="replace"))
+
+    def _add_text(self, text: str):
+        self.append_lines([line for line in map(str.strip, text.splitlines()) if line])
+
+    def append_lines(self, lines: List[str]):
+        if not lines:
+            return
+        self.line_count += len(lines)
+        self.recent.extend(lines)
+        self.unsent.extend(lines)
+        self.unwritten.append(("\n".join(lines) + "\n").encode("utf-8"))
+
+    def take_unsent(self) -> Optional[Dict[str, Any]]:
+        """Returns the lines added since the last call as one log message, if any."""
+        if not self.unsent:
+            return None
+        lines = list(self.unsent)
+        self.unsent.clear()
+        return {
+            "type": "log",
+            "task_id": self.task_id,
+            "first_line": self.line_count - len(lines),
+            "lines": lines,
+        }
+
+    def backlog(self) -> Dict[str, Any]:
+        """The recent lines already sent, as a log message for a client that just subscribed."""
+        sent = list(self.recent)[: len(self.recent) - len(self.unsent)]
+        return {
+            "type": "log",
+            "task_id": self.task_id,
+            "first_line": self.line_count - len(self.unsent) - len(sent),
+            "lines": sent,
+            "backlog": True,
+        }
+
+
+@dataclass
+class LogSlice:
+    """Bytes read from a task's log files."""
+
+    data: bytes
+    start: int  # Offset of `data` within the task's output
+    size: int  # Bytes of output written to disk so far
+    first_offset: int  # Output before this offset was rotated away
+
+
+class ProcessLogManager:
+    """
+    Collects the output of UI installs and runs without handling it line by line
+    on the event loop: process output is read in raw chunks and split in bulk,
+    lines are sent to clients in batches (see `take_batches`) and written to disk
+    in batches (see `write_pending`).
+
+    Each task's output goes to files in its own directory, rotated at
+    PROCESS_LOG_SEGMENT_BYTES; only the newest PROCESS_LOG_MAX_SEGMENTS files and
+    the logs of the last PROCESS_LOG_MAX_TASKS tasks are kept.
+    """
+
+    def __init__(self, log_dir: pathlib.Path = PROCESS_LOG_DIR):
+        self.log_dir = log_dir
+        self.logs: Dict[str, TaskLog] = {}
+        # Serializes writing, rotating and reading the log files.
+        self._disk_lock = threading.Lock()
+        self._prune_needed = True
+
+    def _task_dir(self, task_id: str) -> pathlib.Path:
+        if not _TASK_ID_PATTERN.match(task_id):
+            raise ValueError(f"Invalid task id '{task_id}'.")
+        return self.log_dir / task_id
+
+    def open(self, task_id: str) -> TaskLog:
+        """Returns the log of a task, starting it on first use."""
+        log = self.logs.get(task_id)
+        if log is None:
+            log = self.logs[task_id] = TaskLog(task_id, self._task_dir(task_id))
+            self._prune_needed = True
+            finished = [
+                t
+                for t, other in self.logs.items()
+                if other.finished and not other.unsent and not other.unwritten
+            ]
+            for stale_id in finished[: max(0, len(self.logs) - PROCESS_LOG_MAX_TASKS)]:
+                del self.logs[stale_id]
+        return log
+
+    def get(self, task_id: str) -> Optional[TaskLog]:
+        return self.logs.get(task_id)
+
+    async def pump(self, task_id: str, stream: asyncio.StreamReader, stream_name: str):
+        """Reads a process stream into the task's log until it ends."""
+        log = self.open(task_id)
+        try:
+            while True:
+                chunk = await stream.read(PROCESS_LOG_READ_CHUNK_BYTES)
+                if not chunk:
+                    break
+                log.feed(stream_name, chunk)
+        finally:
+            log.end_stream(stream_name)
+
+    def finish(self, task_id: str):
+        """Marks a task's log complete; it is dropped from memory once enough newer ones exist."""
+        log = self.logs.get(task_id)
+        if log:
+            for stream_name in list(log._partial):
+                log.end_stream(stream_name)
+            log.finished = True
+
+    def take_batches(self) -> List[Dict[str, Any]]:
+        """Returns one message with the new lines of each task that produced output."""
+        batches = []
+        for log in list(self.logs.values()):
+            batch = log.take_unsent()
+            if batch is None:
+                continue
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"[{log.task_id}] " + "\n".join(batch["lines"]))
+            batches.append(batch)
+        return batches
+
+    def take_unwritten(self) -> List[Tuple[TaskLog, bytes]]:
+        """Takes the output not yet on disk. Runs on the event loop, like the readers."""
+        pending = []
+        for log in self.logs.values():
+            if log.unwritten:
+                pending.append((log, b"".join(log.unwritten)))
+                log.unwritten.clear()
+        return pending
+
+    def write_pending(self, pending: List[Tuple[TaskLog, bytes]]):
+        """(Blocking) Appends output to the tasks' log files, rotating them as needed."""
+        with self._disk_lock:
+            if self._prune_needed:
+                self._prune_needed = False
+                self._prune_tasks()
+            for log, data in pending:
+                try:
+                    self._append(log.directory, data)
+                except OSError as e:
+                    logger.error(f"Error writing log of task {log.task_id}: {e}")
+
+    @staticmethod
+    def _segments(directory: pathlib.Path) -> List[Tuple[int, pathlib.Path]]:
+        """The log files of a task as (start offset, path), oldest first."""
+        if not directory.is_dir():
+            return []
+        segments = []
+        for path in directory.iterdir():
+            if path.suffix == _SEGMENT_SUFFIX and path.stem.isdigit():
+                segments.append((int(path.stem), path))
+        return sorted(segments)
+
+    def _append(self, directory: pathlib.Path, data: bytes):
+        """(Blocking) Writes to the newest log file, starting new ones as each fills up."""
+        directory.mkdir(parents=True, exist_ok=True)
+        segments = self._segments(directory)
+        if segments:
+            start, path = segments[-1]
+            size = path.stat().st_size
+        else:
+            start, path, size = 0, directory / f"{0:016d}{_SEGMENT_SUFFIX}", 0
+            segments.append((start, path))
+        while data:
+            if size >= PROCESS_LOG_SEGMENT_BYTES:
+                start, size = start + size, 0
+                path = directory / f"{start:016d}{_SEGMENT_SUFFIX}"
+                segments.append((start, path))
+            part, data = (
+                data[: PROCESS_LOG_SEGMENT_BYTES - size],
+                data[PROCESS_LOG_SEGMENT_BYTES - size :],
+            )
+            with open(path, "ab") as f:
+                f.write(part)
+            size += len(part)
+        for _, old_path in segments[:-PROCESS_LOG_MAX_SEGMENTS]:
+            old_path.unlink(missing_ok=True)
+
+    def _prune_tasks(self):
+        """(Blocking) Removes the log directories of all but the newest tasks. Needs the lock."""
+        if not self.log_dir.is_dir():
+            return
+        directories = [d for d in self.log_dir.iterdir() if d.is_dir() and d.name not in self.logs]
+        keep = max(0, PROCESS_LOG_MAX_TASKS - len(self.logs))
+        directories.sort(key=lambda d: d.stat().st_mtime, reverse=True)
+        for directory in directories[keep:]:
+            shutil.rmtree(directory, ignore_errors=True)
+
+    async def write_to_disk(self):
+        pending = self.take_unwritten()
+        if pending:
+            await asyncio.to_thread(self.write_pending, pending)
+
+    def read(
+        self,
+        task_id: str,
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+        suffix_length: Optional[int] = None,
+    ) -> Optional[LogSlice]:
+        """
+        (Blocking) Reads bytes [start, end) of a task's logged output, or its last
+        `suffix_length` bytes, at most PROCESS_LOG_RANGE_MAX_BYTES. Without a range
+        the tail is returned. Returns None if nothing was logged for the task.
+        """
+        with self._disk_lock:
+            segments = self._segments(self._task_dir(task_id))
+            if not segments:
+                return None
+            first_offset = segments[0][0]
+            last_start, last_path = segments[-1]
+            size = last_start + last_path.stat().st_size
+
+            if start is None:
+                start = size - (suffix_length or PROCESS_LOG_RANGE_MAX_BYTES)
+            start = max(start, first_offset)
+            end = min(size if end is None else end, start + PROCESS_LOG_RANGE_MAX_BYTES)
+
+            parts = []
+            for index, (segment_start, path) in enumerate(segments):
+                segment_end = segments[index + 1][0] if index + 1 < len(segments) else size
+                if segment_end <= start or segment_start >= end:
+                    continue
+                with open(path, "rb") as f:
+                    f.seek(max(start - segment_start, 0))
+                    parts.append(f.read(min(end, segment_end) - max(start, segment_start)))
+            return LogSlice(b"".join(parts), start, size, first_offset)
@@ -4,8 +4,13 @@ import logging
 import pathlib
 from typing import Optional, Dict, List
 
-from .constants.constants import UI_REPOSITORIES, UiNameType
+from .constants.constants import (
+    UI_REPOSITORIES,
+    UiNameType,
+    PROCESS_LOG_FLUSH_INTERVAL_SECONDS,
+)
 from .ui_management import ui_installer, ui_operator
+from .ui_management.process_logs import ProcessLogManager, LogSlice
 from .file_management.download_tracker import download_tracker, BroadcastCallable
 from backend.api.models import ManagedUiStatus
 
@@ -29,6 +34,7 @@ class UiManager:
         self.broadcast_callback = broadcast_callback
         self.running_processes: Dict[str, asyncio.subprocess.Process] = {}
         self.running_ui_tasks: Dict[UiNameType, str] = {}
+        self.process_logs = ProcessLogManager()
         logger.info("UiManager initialized.")
 
     async def get_all_statuses(
@@ -67,9 +73,31 @@ class UiManager:
         return ui_info
 
     async def _stream_progress_to_tracker(self, task_id: str, line: str):
-        """Streams log lines from subprocesses to the frontend via the tracker."""
-        if self.broadcast_callback:
-            await self.broadcast_callback({"type": "log", "task_id": task_id, "message": line})
+        """Adds a log line of a subprocess to the task's log; see `run_log_flusher`."""
+        self.process_logs.open(task_id).append_lines([line])
+
+    async def run_log_flusher(self):
+        """
+        Sends the new output of each task as one 'log' message and writes it to the
+        task's log files every PROCESS_LOG_FLUSH_INTERVAL_SECONDS. Meant to run as a
+        background task.
+        """
+        while True:
+            await asyncio.sleep(PROCESS_LOG_FLUSH_INTERVAL_SECONDS)
+            for batch in self.process_logs.take_batches():
+                if self.broadcast_callback:
+                    await self.broadcast_callback(batch)
+            await self.process_logs.write_to_disk()
+
+    def read_log(
+        self,
+        task_id: str,
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+        suffix_length: Optional[int] = None,
+    ) -> Optional[LogSlice]:
+        """(Blocking) Reads a byte range of a task's logged output."""
+        return self.process_logs.read(task_id, start, end, suffix_length)
 
     async def install_ui_environment(
         self, ui_name: UiNameType, install_path: pathlib.Path, task_id: str
@@ -144,6 +172,8 @@ class UiManager:
             error_message = f"Installation failed for {ui_name}: {e}"
             logger.error(error_message, exc_info=True)
             await download_tracker.fail_download(task_id, error_message)
+        finally:
+            self.process_logs.finish(task_id)
 
     async def delete_environment(self, install_path: pathlib.Path) -> bool:
         """Deletes the UI environment directory at the specified path."""
@@ -185,21 +215,12 @@ class UiManager:
                 task_id, 5, status_text="Process is running...", new_status="running"
             )
 
-            # Capture and stream stdout/stderr to see why a process might be failing.
+            # Capture stdout/stderr in the task's log to see why a process might be failing.
             async def read_stream(stream, stream_name):
-                while not stream.at_eof():
-                    try:
-                        line_bytes = await stream.readline()
-                        if not line_bytes:
-                            break
-                        line = line_bytes.decode("utf-8", errors="replace").strip()
-                        if line:
-                            # Log to backend console and broadcast to frontend
-                            logger.info(f"[{ui_name}:{stream_name}] {line}")
-                            await self._stream_progress_to_tracker(task_id, line)
-                    except Exception as e:
-                        logger.warning(f"Error reading stream from {ui_name}: {e}")
-                        break
+                try:
+                    await self.process_logs.pump(task_id, stream, stream_name)
+                except Exception as e:
+                    logger.warning(f"Error reading stream from {ui_name}: {e}")
 
             await asyncio.gather(
                 read_stream(process.stdout, "stdout"),
@@ -218,6 +239,7 @@ class UiManager:
         except Exception as e:
             await download_tracker.fail_download(task_id, str(e))
         finally:
+            self.process_logs.finish(task_id)
             self.running_processes.pop(task_id, None)
             if self.running_ui_tasks.get(ui_name) == task_id:
                 self.running_ui_tasks.pop(ui_name, None)
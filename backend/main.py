@@ -7,15 +7,23 @@ from fastapi import (
     WebSocket,
     WebSocketDisconnect,
     Body,
+    Header,
+    Response,
 )
 from fastapi.middleware.cors import CORSMiddleware
-from typing import List, Optional, Dict
+from contextlib import asynccontextmanager
+from typing import List, Optional, Dict, Any, Callable, Deque, Literal, Set, Iterable, Union
+from collections import deque
+from dataclasses import dataclass, field
 import pathlib
 
 import logging
 import json
+import math
+import re
 import uuid
 import asyncio
+from datetime import datetime
 
 # --- Logging Configuration ---
 logging.basicConfig(
@@ -29,16 +37,40 @@ from backend.core.source_manager import SourceManager
 from backend.core.file_manager import FileManager
 from backend.core.ui_manager import UiManager
 from backend.core.file_management.download_tracker import download_tracker
-from backend.core.constants.constants import UI_REPOSITORIES, MANAGED_UIS_ROOT_PATH, UiNameType
+from backend.core.http_client import http_client_manager
+from backend.core.hub_endpoints import hub_endpoints
+from backend.core.constants.constants import (
+    UI_REPOSITORIES,
+    MANAGED_UIS_ROOT_PATH,
+    UiNameType,
+    WS_SEND_QUEUE_SIZE,
+    WS_SEND_TIMEOUT_SECONDS,
+    WS_REPLAY_BUFFER_SIZE,
+    WS_SNAPSHOT_PAGE_SIZE,
+)
 
 # --- API Model Imports ---
 from backend.api.models import (
     PaginatedModelListResponse,
+    SourceCacheStats,
     ModelDetails,
     PathConfigurationRequest,
     PathConfigurationResponse,
     FileDownloadRequest,
     FileDownloadResponse,
+    SnapshotDownloadRequest,
+    SnapshotDownloadResponse,
+    DownloadPriorityRequest,
+    DownloadMoveRequest,
+    DownloadBandwidthRequest,
+    DownloadSettings,
+    DownloadSettingsUpdateRequest,
+    DownloadBroadcastStats,
+    DownloadEngineStatus,
+    HubEndpointStatus,
+    DiskSpaceStatus,
+    DownloadHistoryResponse,
+    DownloadStatePydantic,
     MalFullConfiguration,
     FileManagerListResponse,
     ScanHostDirectoriesResponse,
@@ -53,12 +85,66 @@ from backend.api.models import (
     UiNameTypePydantic,
 )
 
+
+# --- Application Lifespan ---
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Sets up the shared HTTP client, starts probing the Hub endpoints, checking
+    disk space, sampling transfer metrics and writing the download history, the
+    file hash index and UI process logs, and restores interrupted downloads on
+    startup, then writes what is pending and closes the client's connection pools
+    on shutdown.
+    """
+    http_client_manager.configure(file_manager.config.http_settings)
+    probe_task = asyncio.create_task(hub_endpoints.run_probes())
+    disk_check_task = asyncio.create_task(file_manager.run_disk_space_checks())
+    history_task = asyncio.create_task(file_manager.download_history.run_flusher())
+    hash_index_task = asyncio.create_task(file_manager.hash_index.run_flusher())
+    metrics_task = asyncio.create_task(download_tracker.run_metrics_monitor())
+    log_task = asyncio.create_task(ui_manager.run_log_flusher())
+
+    try:
+        removed = await asyncio.to_thread(file_manager.sweep_orphaned_partials)
+        if removed:
+            logger.info(f"Startup sweep removed {removed} orphaned download file(s).")
+    except Exception as e:
+        logger.error(f"Startup sweep of partial downloads failed: {e}", exc_info=True)
+
+    interrupted = await asyncio.to_thread(file_manager.restore_download_history)
+    if interrupted:
+        logger.info(f"Marked {interrupted} download(s) interrupted by the last shutdown.")
+    restored = file_manager.restore_queued_downloads()
+    if restored:
+        logger.info(f"Restored {restored} queued download(s) from the previous session.")
+    yield
+
+    # Stop the background tasks before writing what is pending, so none of them
+    # writes to the history database or the log files after they are closed.
+    background_tasks = [
+        probe_task,
+        disk_check_task,
+        history_task,
+        hash_index_task,
+        metrics_task,
+        log_task,
+    ]
+    for task in background_tasks:
+        task.cancel()
+    await asyncio.gather(*background_tasks, return_exceptions=True)
+    await ui_manager.process_logs.write_to_disk()
+    await asyncio.to_thread(file_manager.download_history.close)
+    await asyncio.to_thread(file_manager.hash_index.flush)
+    await http_client_manager.close()
+
+
 # --- FastAPI Application Instance ---
 app = FastAPI(
     title="M.A.L. - Model Asset Loader API",
     description="API for searching external model sources, managing local model files, "
     "and configuring/managing AI UI environments.",
     version="1.5.0",
+    lifespan=lifespan,
 )
 
 # --- CORS Middleware ---
@@ -69,6 +155,8 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Byte-range log reads tell the frontend which bytes it got.
+    expose_headers=["Content-Range"],
 )
 
 # --- Service Instances ---
@@ -79,61 +167,442 @@ ui_manager = UiManager()
 
 
 # --- WebSocket Connection Manager ---
+# The MessagePack frame encoding needs the optional 'msgpack' package (`pip install msgpack`).
+try:
+    import msgpack
+
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    msgpack = None
+    MSGPACK_AVAILABLE = False
+
+WsEncoding = Literal["json", "msgpack"]
+
+# Tracker entries of UI installations carry this repo_id.
+UI_INSTALLATION_REPO_ID = "UI Installation"
+# Topics a client can subscribe to; "download:<id>" and "logs:<task id>" take an id.
+WS_TOPICS = ("all", "downloads", "installs")
+WS_TOPIC_PREFIXES = ("download:", "logs:")
+
+
+def _event_topics(data: Dict[str, Any]) -> Set[str]:
+    """The topics an event (or, in its 'update' form, a status) is published under."""
+    kind = data.get("type")
+    if kind == "log":
+        return {f"logs:{data['task_id']}"}
+    if kind in ("update", "remove"):
+        item = data["data"] if kind == "update" else data
+        topics = {"downloads", f"download:{item['download_id']}"}
+        if item.get("repo_id") == UI_INSTALLATION_REPO_ID:
+            topics.add("installs")
+        return topics
+    return {"downloads"}
+
+
+def _is_valid_topic(topic: str) -> bool:
+    return topic in WS_TOPICS or any(
+        topic.startswith(prefix) and len(topic) > len(prefix) for prefix in WS_TOPIC_PREFIXES
+    )
+
+
+def _encode(data: Dict[str, Any], encoding: WsEncoding) -> Union[str, bytes]:
+    """Serializes a message: JSON goes out as a text frame, MessagePack as a binary frame."""
+    if encoding == "msgpack":
+        return msgpack.packb(data, default=str, use_bin_type=True)
+    return json.dumps(data, default=str)
+
+
+@dataclass(eq=False)
+class BroadcastEvent:
+    """
+    A numbered event. It is serialized once per encoding, when a client using that
+    encoding first needs it, and the same payload is shared by all those clients.
+    """
+
+    seq: int
+    data: Dict[str, Any]
+    topics: Set[str]
+    _payloads: Dict[str, Union[str, bytes]] = field(default_factory=dict, repr=False)
+
+    def payload(self, encoding: WsEncoding) -> Union[str, bytes]:
+        payload = self._payloads.get(encoding)
+        if payload is None:
+            payload = self._payloads[encoding] = _encode(self.data, encoding)
+        return payload
+
+
+@dataclass(eq=False)
+class OutgoingMessage:
+    """A serialized message waiting in a client's queue."""
+
+    payload: Union[str, bytes]
+    # Messages with the same key describe the same item (e.g. one download). A newer
+    # message replaces a queued one with the same key and state instead of queueing up.
+    key: Optional[str] = None
+    state: Optional[str] = None
+    # Only progress may be dropped to make room; state changes are always delivered.
+    droppable: bool = False
+
+
+def _outgoing_message(data: Dict[str, Any], payload: Union[str, bytes]) -> OutgoingMessage:
+    if data.get("type") == "update":
+        status_data = data["data"]
+        return OutgoingMessage(
+            payload, f"download:{status_data['download_id']}", status_data["status"]
+        )
+    if data.get("type") == "engine_metrics":
+        return OutgoingMessage(payload, "engine_metrics", droppable=True)
+    return OutgoingMessage(payload)
+
+
+class ClientConnection:
+    """
+    One WebSocket client with its own bounded outgoing queue, drained by its own
+    writer task, so a slow client only ever delays its own messages.
+    """
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        on_failed: Callable[["ClientConnection", str, bool], None],
+        encoding: WsEncoding = "json",
+    ):
+        """
+        Args:
+            websocket: The accepted connection.
+            on_failed: Called with the client, a reason and whether the client was too
+                       slow, once sending to it has to stop.
+            encoding: How messages to this client are serialized.
+        """
+        self.websocket = websocket
+        self.encoding = encoding
+        # Only events published under one of these topics are sent.
+        self.topics: Set[str] = {"all"}
+        self.queue: Deque[OutgoingMessage] = deque()
+        self._latest: Dict[str, OutgoingMessage] = {}  # Newest queued message per key
+        self._last_state: Dict[str, Optional[str]] = {}  # State last queued per key
+        self._ready = asyncio.Event()
+        self._on_failed = on_failed
+        self.writer = asyncio.create_task(self._write())
+
+    def wants(self, topics: Set[str]) -> bool:
+        return "all" in self.topics or not self.topics.isdisjoint(topics)
+
+    def enqueue(self, message: OutgoingMessage) -> Literal["queued", "merged", "dropped", "full"]:
+        """
+        Queues a message without waiting. Returns 'merged' if it replaced a queued
+        message, 'dropped' if an older progress message was dropped to make room,
+        and 'full' if the queue holds nothing but state changes and cannot take it.
+        """
+        key = message.key
+        if key is not None:
+            latest = self._latest.get(key)
+            if latest is not None and latest.state == message.state:
+                # The newer message takes the replaced one's place at the tail, so events
+                # still go out in sequence order and a client never skips past one.
+                self.queue.remove(latest)
+                message.droppable = latest.droppable
+                self.queue.append(message)
+                self._latest[key] = message
+                return "merged"
+            # The same state as last time means only progress changed.
+            message.droppable = message.droppable or (
+                key in self._last_state and self._last_state[key] == message.state
+            )
+
+        outcome = "queued"
+        if len(self.queue) >= WS_SEND_QUEUE_SIZE:
+            if not self._drop_oldest_progress():
+                return "full"
+            outcome = "dropped"
+        self.queue.append(message)
+        if key is not None:
+            self._latest[key] = message
+            self._last_state[key] = message.state
+        self._ready.set()
+        return outcome
+
+    def _drop_oldest_progress(self) -> bool:
+        for message in self.queue:
+            if message.droppable:
+                self.queue.remove(message)
+                if message.key is not None and self._latest.get(message.key) is message:
+                    del self._latest[message.key]
+                return True
+        return False
+
+    async def _write(self):
+        """Writer task: sends queued messages in order until the client fails."""
+        try:
+            while True:
+                await self._ready.wait()
+                while self.queue:
+                    message = self.queue.popleft()
+                    if message.key is not None and self._latest.get(message.key) is message:
+                        del self._latest[message.key]
+                    if isinstance(message.payload, bytes):
+                        send = self.websocket.send_bytes(message.payload)
+                    else:
+                        send = self.websocket.send_text(message.payload)
+                    await asyncio.wait_for(send, WS_SEND_TIMEOUT_SECONDS)
+                self._ready.clear()
+        except asyncio.TimeoutError:
+            self._on_failed(self, f"no message accepted for {WS_SEND_TIMEOUT_SECONDS:.0f}s", True)
+        except Exception as e:
+            self._on_failed(self, str(e) or type(e).__name__, False)
+
+
 class ConnectionManager:
-    """Manages active WebSocket connections for real-time broadcasting."""
+    """
+    Manages active WebSocket connections for real-time broadcasting. Messages are
+    serialized once and handed to every client's queue; broadcasting never waits on
+    a network send. Clients that do not keep up are disconnected.
 
-    def __init__(self):
-        self.active_connections: List[WebSocket] = []
+    Every broadcast event carries a sequence number, unique within `stream_id` (one
+    per backend run), and the last WS_REPLAY_BUFFER_SIZE events are kept so that a
+    reconnecting client can be sent just what it missed.
+
+    Clients subscribe to topics (by default "all") and are only sent the events
+    published under them; an event no client wants is never serialized.
+    """
 
-    async def connect(self, websocket: WebSocket):
+    def __init__(self):
+        self.clients: Dict[WebSocket, ClientConnection] = {}
+        self.stream_id = uuid.uuid4().hex
+        self.last_seq = 0
+        self.replay: Deque[BroadcastEvent] = deque(maxlen=WS_REPLAY_BUFFER_SIZE)
+        self.stats = {
+            "client_messages_merged": 0,
+            "client_messages_dropped": 0,
+            "slow_clients_disconnected": 0,
+        }
+
+    @property
+    def active_connections(self) -> List[WebSocket]:
+        return list(self.clients)
+
+    async def connect(
+        self,
+        websocket: WebSocket,
+        topics: Optional[Iterable[str]] = None,
+        encoding: WsEncoding = "json",
+    ):
         await websocket.accept()
-        self.active_connections.append(websocket)
+        client = ClientConnection(websocket, self._client_failed, encoding)
+        if topics is not None:
+            client.topics = set(topics)
+        self.clients[websocket] = client
         logger.info(f"WebSocket client connected: {websocket.client}")
 
     def disconnect(self, websocket: WebSocket):
-        if websocket in self.active_connections:
-            self.active_connections.remove(websocket)
+        client = self.clients.pop(websocket, None)
+        if client:
+            client.writer.cancel()
             logger.info(f"WebSocket client disconnected: {websocket.client}")
 
-    async def broadcast(self, message: str):
-        for connection in list(self.active_connections):
-            try:
-                await connection.send_text(message)
-            except Exception:
-                self.disconnect(connection)
+    def _client_failed(self, client: ClientConnection, reason: str, slow: bool):
+        if self.clients.get(client.websocket) is not client:
+            return
+        if slow:
+            self.stats["slow_clients_disconnected"] += 1
+            logger.warning(
+                f"Disconnecting slow WebSocket client {client.websocket.client}: {reason}"
+            )
+        self.disconnect(client.websocket)
+        asyncio.create_task(self._close(client.websocket))
+
+    @staticmethod
+    async def _close(websocket: WebSocket):
+        try:
+            await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER)
+        except Exception:
+            pass  # Already closed by the other side.
+
+    def _enqueue(self, client: ClientConnection, message: OutgoingMessage):
+        outcome = client.enqueue(message)
+        if outcome == "merged":
+            self.stats["client_messages_merged"] += 1
+        elif outcome == "dropped":
+            self.stats["client_messages_dropped"] += 1
+        elif outcome == "full":
+            self._client_failed(client, f"{WS_SEND_QUEUE_SIZE} messages waiting", True)
+
+    def send(self, websocket: WebSocket, data: Dict[str, Any]):
+        """Queues a message for one client."""
+        client = self.clients.get(websocket)
+        if client:
+            self._enqueue(client, _outgoing_message(data, _encode(data, client.encoding)))
+
+    def _enqueue_event(self, client: ClientConnection, event: BroadcastEvent):
+        if client.wants(event.topics):
+            self._enqueue(client, _outgoing_message(event.data, event.payload(client.encoding)))
+
+    def broadcast(self, data: Dict[str, Any]):
+        """Numbers an event, keeps it for replay and queues it for every subscribed client."""
+        self.last_seq += 1
+        event = BroadcastEvent(self.last_seq, {**data, "seq": self.last_seq}, _event_topics(data))
+        self.replay.append(event)
+        for client in list(self.clients.values()):
+            self._enqueue_event(client, event)
+
+    def update_subscription(
+        self, websocket: WebSocket, subscribe: Iterable[str] = (), unsubscribe: Iterable[str] = ()
+    ):
+        """Changes the topics of a client and confirms its current topics to it."""
+        client = self.clients.get(websocket)
+        if not client:
+            return
+        client.topics.difference_update(unsubscribe)
+        client.topics.update(subscribe)
+        self.send(websocket, {"type": "subscriptions", "topics": sorted(client.topics)})
+
+    def resume(
+        self, websocket: WebSocket, stream_id: Optional[str], last_seq: Optional[int]
+    ) -> bool:
+        """
+        Queues the events a reconnecting client missed since `last_seq`. Returns False
+        if they cannot be replayed (another backend run, or no longer buffered).
+        """
+        oldest_seq = self.replay[0].seq if self.replay else self.last_seq + 1
+        if (
+            stream_id != self.stream_id
+            or last_seq is None
+            or not oldest_seq - 1 <= last_seq <= self.last_seq
+        ):
+            return False
+        client = self.clients.get(websocket)
+        if not client:
+            return True
+        missed = [e for e in self.replay if e.seq > last_seq and client.wants(e.topics)]
+        self.send(
+            websocket,
+            {
+                "type": "resumed",
+                "stream_id": self.stream_id,
+                "seq": self.last_seq,
+                "replayed": len(missed),
+            },
+        )
+        for event in missed:
+            self._enqueue_event(client, event)
+        return True
+
+    def send_snapshot(self, websocket: WebSocket, statuses: List[Dict[str, Any]]):
+        """
+        Queues the state of the items the client subscribed to, in pages of
+        WS_SNAPSHOT_PAGE_SIZE items. `seq` is the last event the snapshot reflects.
+        """
+        client = self.clients.get(websocket)
+        if not client:
+            return
+        statuses = [
+            s for s in statuses if client.wants(_event_topics({"type": "update", "data": s}))
+        ]
+        pages = max(1, math.ceil(len(statuses) / WS_SNAPSHOT_PAGE_SIZE))
+        for page in range(pages):
+            start = page * WS_SNAPSHOT_PAGE_SIZE
+            self.send(
+                websocket,
+                {
+                    "type": "initial_state",
+                    "stream_id": self.stream_id,
+                    "seq": self.last_seq,
+                    "page": page + 1,
+                    "pages": pages,
+                    "downloads": statuses[start : start + WS_SNAPSHOT_PAGE_SIZE],
+                },
+            )
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, "connected_clients": len(self.clients)}
 
 
 manager = ConnectionManager()
 
 
+async def broadcast_status_update(data: dict):
+    manager.broadcast(data)
+
+
+# Events are numbered and buffered even while no client is connected, so a client
+# reconnecting after a gap can still be replayed what it missed.
+download_tracker.set_broadcast_callback(broadcast_status_update)
+ui_manager.broadcast_callback = broadcast_status_update
+
+
 # --- WebSocket Endpoint for Real-time Updates ---
 @app.websocket("/ws/downloads")
-async def websocket_endpoint(websocket: WebSocket):
+async def websocket_endpoint(
+    websocket: WebSocket,
+    stream_id: Optional[str] = None,
+    last_seq: Optional[int] = None,
+    topics: Optional[str] = None,
+    encoding: WsEncoding = "json",
+):
     """
     Handles WebSocket connections for sending real-time updates on downloads
-    and other background tasks.
+    and other background tasks. A reconnecting client passes the `stream_id` and
+    the `last_seq` it has seen to receive only the events it missed; otherwise (or
+    if they are no longer available) it receives a snapshot of the current state.
+
+    Clients receive every event unless they pass comma-separated `topics` or send
+    {"action": "subscribe" | "unsubscribe", "topics": [...]} messages. Topics:
+    "all", "downloads" (every download and task), "download:<id>" (one job),
+    "installs" (UI installation progress) and "logs:<task id>" (a UI task's output).
+    Subscribing to a task's logs first sends the recent lines already logged.
+
+    Messages are JSON text frames unless the client asks for `encoding=msgpack`, in
+    which case they are MessagePack binary frames (if msgpack is installed; JSON
+    otherwise). Client messages are always JSON text.
     """
-    await manager.connect(websocket)
-
-    async def broadcast_status_update(data: dict):
-        await manager.broadcast(json.dumps(data, default=str))
-
-    download_tracker.set_broadcast_callback(broadcast_status_update)
-    ui_manager.broadcast_callback = broadcast_status_update
-
-    try:
-        initial_statuses = download_tracker.get_all_statuses()
-        await websocket.send_text(
-            json.dumps({"type": "initial_state", "downloads": initial_statuses})
+    if encoding == "msgpack" and not MSGPACK_AVAILABLE:
+        logger.warning(
+            "A client asked for MessagePack, but 'msgpack' is not installed. Using JSON."
         )
+        encoding = "json"
+    requested = [t.strip() for t in topics.split(",") if t.strip()] if topics else None
+    requested = [t for t in requested if _is_valid_topic(t)] if requested else None
+    await manager.connect(websocket, requested, encoding)
+    try:
+        if not manager.resume(websocket, stream_id, last_seq):
+            manager.send_snapshot(websocket, download_tracker.get_all_statuses())
+        _send_log_backlogs(websocket, requested or [])
         while True:
-            await websocket.receive_text()
-    except WebSocketDisconnect:
+            _handle_client_message(websocket, await websocket.receive_text())
+    except (WebSocketDisconnect, RuntimeError):
+        # RuntimeError: the connection was already closed, e.g. as a slow client.
+        pass
+    finally:
         manager.disconnect(websocket)
-        if not manager.active_connections:
-            download_tracker.set_broadcast_callback(None)
-            ui_manager.broadcast_callback = None
-            logger.info("Last WebSocket client disconnected, clearing broadcast callbacks.")
+
+
+def _handle_client_message(websocket: WebSocket, text: str):
+    """Applies a subscription request sent by a client."""
+    try:
+        message = json.loads(text)
+        action, topics = message["action"], message["topics"]
+        if action not in ("subscribe", "unsubscribe") or not isinstance(topics, list):
+            raise ValueError(f"Unsupported message: {text[:200]}")
+        invalid = [t for t in topics if not isinstance(t, str) or not _is_valid_topic(t)]
+        if invalid:
+            raise ValueError(f"Unknown topics: {invalid}")
+    except (ValueError, KeyError, TypeError) as e:
+        manager.send(websocket, {"type": "error", "message": str(e)})
+        return
+    if action == "subscribe":
+        manager.update_subscription(websocket, subscribe=topics)
+        _send_log_backlogs(websocket, topics)
+    else:
+        manager.update_subscription(websocket, unsubscribe=topics)
+
+
+def _send_log_backlogs(websocket: WebSocket, topics: List[str]):
+    """Sends the recent lines of the task logs among `topics` to a newly subscribed client."""
+    for topic in topics:
+        if topic.startswith("logs:"):
+            log = ui_manager.process_logs.get(topic[len("logs:") :])
+            if log and log.recent:
+                manager.send(websocket, log.backlog())
 
 
 # --- Helper Functions ---
@@ -161,10 +630,11 @@ async def search_models(
     direction: Optional[int] = Query(-1, enum=[-1, 1]),
     limit: int = Query(30, ge=1, le=100),
     page: int = Query(1, ge=1),
+    cursor: Optional[str] = Query(None, description="The `next_cursor` of the previous page."),
 ):
     try:
         unique_tags = list(set(tags)) if tags else None
-        models_data, has_more = source_manager.search_models(
+        models_data, has_more, next_cursor = await source_manager.search_models(
             source=source,
             search_query=search,
             author=author,
@@ -173,18 +643,30 @@ async def search_models(
             sort_direction=direction,
             limit=limit,
             page=page,
+            cursor=cursor,
         )
         return PaginatedModelListResponse(
             items=[ModelListItem(**m) for m in models_data],
             page=page,
             limit=limit,
             has_more=has_more,
+            next_cursor=next_cursor,
         )
     except Exception as e:
         logger.error(f"Error in search_models: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail="Internal error during model search.")
 
 
+@app.get(
+    "/api/sources/cache/stats",
+    response_model=SourceCacheStats,
+    tags=["Models"],
+    summary="Get Source Cache Statistics",
+)
+async def get_source_cache_stats():
+    return SourceCacheStats(**source_manager.get_cache_stats())
+
+
 @app.get(
     "/api/models/{source}/{model_id:path}",
     response_model=ModelDetails,
@@ -193,7 +675,7 @@ async def search_models(
 )
 async def get_model_details(source: str, model_id: str):
     try:
-        details_data = source_manager.get_model_details(model_id=model_id, source=source)
+        details_data = await source_manager.get_model_details(model_id=model_id, source=source)
         if not details_data:
             raise HTTPException(status_code=404, detail=f"Model '{model_id}' not found.")
         return ModelDetails(**details_data)
@@ -230,6 +712,9 @@ async def configure_file_manager_paths_endpoint(config_request: PathConfiguratio
         color_theme=config_request.color_theme,
         config_mode=config_request.config_mode,
         automatic_mode_ui=config_request.automatic_mode_ui,
+        download_segments=config_request.download_segments,
+        max_active_downloads=config_request.max_active_downloads,
+        max_downloads_per_host=config_request.max_downloads_per_host,
     )
     if not success:
         raise HTTPException(status_code=400, detail=message)
@@ -241,6 +726,59 @@ async def configure_file_manager_paths_endpoint(config_request: PathConfiguratio
     )
 
 
+@app.get(
+    "/api/filemanager/download-settings",
+    response_model=DownloadSettings,
+    tags=["FileManager"],
+    summary="Get Download Engine Settings",
+)
+async def get_download_settings_endpoint():
+    return DownloadSettings(**file_manager.get_download_settings())
+
+
+@app.put(
+    "/api/filemanager/download-settings",
+    response_model=DownloadSettings,
+    tags=["FileManager"],
+    summary="Change Download Engine Settings at Runtime",
+)
+async def update_download_settings_endpoint(request: DownloadSettingsUpdateRequest):
+    settings = file_manager.update_download_settings(
+        download_segments=request.download_segments,
+        max_active_downloads=request.max_active_downloads,
+        max_downloads_per_host=request.max_downloads_per_host,
+        bandwidth_limit=request.bandwidth_limit,
+        hub_endpoints=request.hub_endpoints,
+        progress_broadcast_rate=request.progress_broadcast_rate,
+        trusted_hub_endpoints=request.trusted_hub_endpoints,
+    )
+    return DownloadSettings(**settings)
+
+
+@app.get(
+    "/api/filemanager/disk-space",
+    response_model=List[DiskSpaceStatus],
+    tags=["FileManager"],
+    summary="Get Free and Reserved Disk Space of Download Targets",
+)
+async def get_disk_space_endpoint():
+    status = await asyncio.to_thread(file_manager.get_disk_space_status)
+    return [DiskSpaceStatus(**entry) for entry in status]
+
+
+@app.get(
+    "/api/filemanager/hub-endpoints",
+    response_model=List[HubEndpointStatus],
+    tags=["FileManager"],
+    summary="Get Hub Endpoint Health",
+)
+async def get_hub_endpoints_endpoint(probe: bool = False):
+    """Lists the Hub endpoints, best first. With `probe`, they are measured again first."""
+    if probe:
+        await hub_endpoints.probe_all()
+    return [HubEndpointStatus(**status) for status in hub_endpoints.get_status()]
+
+
 @app.post(
     "/api/filemanager/download",
     response_model=FileDownloadResponse,
@@ -257,12 +795,57 @@ async def download_model_file_endpoint(download_request: FileDownloadRequest):
         model_type=download_request.model_type,
         custom_sub_path=download_request.custom_sub_path,
         revision=download_request.revision,
+        segments=download_request.segments,
+        priority=download_request.priority,
+        bandwidth_limit=download_request.bandwidth_limit,
+        size=download_request.size,
+        additional_ui_targets=download_request.additional_ui_targets,
     )
     if not result.get("success"):
         raise HTTPException(status_code=400, detail=result.get("error", "Download failed."))
     return FileDownloadResponse(**result)
 
 
+@app.post(
+    "/api/filemanager/download-snapshot",
+    response_model=SnapshotDownloadResponse,
+    tags=["FileManager"],
+    summary="Download Many Files of a Repository as One Job",
+)
+async def download_snapshot_endpoint(snapshot_request: SnapshotDownloadRequest):
+    if not file_manager.config.base_path:
+        raise HTTPException(status_code=400, detail="Base path not configured.")
+    try:
+        snapshot = await source_manager.get_repo_snapshot(
+            model_id=snapshot_request.repo_id,
+            source=snapshot_request.source,
+            revision=snapshot_request.revision,
+        )
+    except Exception as e:
+        logger.error(
+            f"Error resolving snapshot of '{snapshot_request.repo_id}': {e}", exc_info=True
+        )
+        raise HTTPException(status_code=502, detail="Could not read the repository file list.")
+    if not snapshot:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Repository '{snapshot_request.repo_id}' or its revision was not found.",
+        )
+    result = file_manager.start_snapshot_download(
+        snapshot=snapshot,
+        model_type=snapshot_request.model_type,
+        include_patterns=snapshot_request.include_patterns,
+        exclude_patterns=snapshot_request.exclude_patterns,
+        custom_sub_path=snapshot_request.custom_sub_path,
+        segments=snapshot_request.segments,
+        priority=snapshot_request.priority,
+        bandwidth_limit=snapshot_request.bandwidth_limit,
+    )
+    if not result.get("success"):
+        raise HTTPException(status_code=400, detail=result.get("error", "Download failed."))
+    return SnapshotDownloadResponse(**result)
+
+
 @app.post(
     "/api/filemanager/downloads/{download_id}/cancel",
     status_code=status.HTTP_202_ACCEPTED,
@@ -274,6 +857,111 @@ async def cancel_download_endpoint(download_id: str):
     return {"message": "Cancellation request accepted."}
 
 
+@app.post(
+    "/api/filemanager/downloads/{download_id}/pause",
+    status_code=status.HTTP_202_ACCEPTED,
+    tags=["FileManager"],
+    summary="Pause a queued or running download",
+)
+async def pause_download_endpoint(download_id: str):
+    if not file_manager.pause_download(download_id):
+        raise HTTPException(status_code=404, detail="Download not found or cannot be paused.")
+    return {"message": "Download paused."}
+
+
+@app.post(
+    "/api/filemanager/downloads/{download_id}/resume",
+    status_code=status.HTTP_202_ACCEPTED,
+    tags=["FileManager"],
+    summary="Resume a paused download",
+)
+async def resume_download_endpoint(download_id: str):
+    if not file_manager.resume_download(download_id):
+        raise HTTPException(status_code=404, detail="Download not found or not paused.")
+    return {"message": "Download resumed."}
+
+
+@app.post(
+    "/api/filemanager/downloads/{download_id}/priority",
+    tags=["FileManager"],
+    summary="Change the queue priority of a download",
+)
+async def set_download_priority_endpoint(download_id: str, request: DownloadPriorityRequest):
+    if not file_manager.set_download_priority(download_id, request.priority):
+        raise HTTPException(status_code=404, detail="Download not found in the queue.")
+    return {"message": "Priority updated."}
+
+
+@app.post(
+    "/api/filemanager/downloads/{download_id}/move",
+    tags=["FileManager"],
+    summary="Move a queued download up or down",
+)
+async def move_download_endpoint(download_id: str, request: DownloadMoveRequest):
+    if not file_manager.move_download(download_id, request.direction):
+        raise HTTPException(status_code=404, detail="Download not found in the queue.")
+    return {"message": "Queue order updated."}
+
+
+@app.post(
+    "/api/filemanager/downloads/{download_id}/bandwidth",
+    tags=["FileManager"],
+    summary="Change the bandwidth limit of a download",
+)
+async def set_download_bandwidth_endpoint(download_id: str, request: DownloadBandwidthRequest):
+    if not file_manager.set_download_bandwidth(download_id, request.bandwidth_limit):
+        raise HTTPException(status_code=404, detail="Download not found in the queue.")
+    return {"message": "Bandwidth limit updated."}
+
+
+@app.get(
+    "/api/filemanager/downloads/status",
+    response_model=DownloadEngineStatus,
+    tags=["FileManager"],
+    summary="Get the status and transfer metrics of all downloads",
+)
+async def get_downloads_status_endpoint():
+    return DownloadEngineStatus(
+        **download_tracker.get_engine_metrics(), downloads=download_tracker.get_all_statuses()
+    )
+
+
+@app.get(
+    "/api/filemanager/downloads/stats",
+    response_model=DownloadBroadcastStats,
+    tags=["FileManager"],
+    summary="Get download status broadcast counters",
+)
+async def get_download_stats_endpoint():
+    return DownloadBroadcastStats(**file_manager.get_broadcast_stats(), **manager.get_stats())
+
+
+@app.get(
+    "/api/filemanager/downloads/history",
+    response_model=DownloadHistoryResponse,
+    tags=["FileManager"],
+    summary="List recorded downloads and tasks",
+)
+async def get_download_history_endpoint(
+    status_filter: Optional[List[DownloadStatePydantic]] = Query(None, alias="status"),
+    repo_id: Optional[str] = Query(None),
+    since: Optional[datetime] = Query(None, description="Only jobs created at or after this."),
+    until: Optional[datetime] = Query(None, description="Only jobs created before this."),
+    page: int = Query(1, ge=1),
+    limit: int = Query(50, ge=1, le=500),
+):
+    history = await asyncio.to_thread(
+        file_manager.get_download_history,
+        statuses=status_filter,
+        repo_id=repo_id,
+        since=since.timestamp() if since else None,
+        until=until.timestamp() if until else None,
+        page=page,
+        limit=limit,
+    )
+    return DownloadHistoryResponse(**history)
+
+
 @app.delete(
     "/api/filemanager/downloads/{download_id}",
     status_code=status.HTTP_204_NO_CONTENT,
@@ -406,7 +1094,7 @@ async def install_ui_environment(request: UiInstallRequest = Body(...)):
     task_id = str(uuid.uuid4())
     download_tracker.start_tracking(
         download_id=task_id,
-        repo_id="UI Installation",
+        repo_id=UI_INSTALLATION_REPO_ID,
         filename=ui_name,
         task=asyncio.create_task(ui_manager.install_ui_environment(ui_name, install_path, task_id)),
     )
@@ -469,6 +1157,64 @@ async def stop_ui(request: UiStopRequest):
     return {"success": True, "message": f"Stop request for task {request.task_id} sent."}
 
 
+@app.get(
+    "/api/uis/logs/{task_id}",
+    tags=["UIs"],
+    summary="Read a UI Task's Log",
+    response_class=Response,
+    responses={206: {"description": "Part of the log."}, 416: {"description": "Bad range."}},
+)
+async def get_ui_task_log(task_id: str, range_header: Optional[str] = Header(None, alias="Range")):
+    """
+    Returns the output logged by a UI install or run as plain text. A standard
+    `Range: bytes=start-end` (or `bytes=-length` for the tail) header selects the
+    part to return; without one, the tail is returned. At most
+    PROCESS_LOG_RANGE_MAX_BYTES are returned at once, and output older than the
+    retained log files starts the response later than requested; `Content-Range`
+    always tells which bytes were returned out of how many.
+    """
+    start = end = suffix_length = None
+    if range_header:
+        match = re.fullmatch(r"bytes=(\d*)-(\d*)", range_header.strip())
+        if not match or not any(match.groups()):
+            raise HTTPException(status_code=416, detail=f"Unsupported range '{range_header}'.")
+        first, last = match.groups()
+        if first:
+            start = int(first)
+            end = int(last) + 1 if last else None
+        else:
+            suffix_length = int(last)
+        if end is not None and end <= start:
+            raise HTTPException(status_code=416, detail=f"Unsupported range '{range_header}'.")
+
+    try:
+        log = await asyncio.to_thread(ui_manager.read_log, task_id, start, end, suffix_length)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if log is None:
+        raise HTTPException(status_code=404, detail=f"No log found for task '{task_id}'.")
+    if range_header and not log.data:
+        raise HTTPException(
+            status_code=416,
+            detail=(
+                f"The log of task '{task_id}' has {log.size} bytes, "
+                f"kept from byte {log.first_offset}."
+            ),
+            headers={"Content-Range": f"bytes */{log.size}"},
+        )
+
+    headers = {"Accept-Ranges": "bytes"}
+    is_whole = log.start == 0 and len(log.data) == log.size
+    if log.data:
+        headers["Content-Range"] = f"bytes {log.start}-{log.start + len(log.data) - 1}/{log.size}"
+    return Response(
+        content=log.data,
+        status_code=200 if is_whole and not range_header else 206,
+        media_type="text/plain; charset=utf-8",
+        headers=headers,
+    )
+
+
 # --- Main Execution Block ---
 if __name__ == "__main__":
     import uvicorn
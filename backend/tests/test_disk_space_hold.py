@@ -0,0 +1,126 @@
+# backend/tests/test_disk_space_hold.py
+import asyncio
+import pathlib
+import shutil
+import tempfile
+import unittest
+from typing import Any, Dict, Optional
+from unittest import mock
+
+from backend.core.file_management.disk_space import DiskSpaceLedger
+from backend.core.file_management.download_scheduler import DownloadScheduler
+from backend.core.file_management.download_tracker import download_tracker
+
+GB = 1024**3
+
+
+class DiskSpaceHoldTests(unittest.IsolatedAsyncioTestCase):
+    """A running download that no longer fits is held, then resumes on its own."""
+
+    async def asyncSetUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.root = pathlib.Path(directory.name)
+        self.free = 10 * GB
+        usage = shutil.disk_usage(self.root)
+        patcher = mock.patch(
+            "backend.core.file_management.disk_space.shutil.disk_usage",
+            lambda path: usage._replace(free=self.free),
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.ledger = DiskSpaceLedger(margin=0)
+        self.starts: Dict[str, int] = {}
+        self.scheduler = DownloadScheduler(
+            run_job=self.run_job,
+            max_active=2,
+            max_per_host=2,
+            can_start=self.admit,
+        )
+
+    async def asyncTearDown(self):
+        for entry in list(self.scheduler.active.values()):
+            entry.task.cancel()
+        await asyncio.sleep(0)
+        for download_id in ("older", "newer"):
+            download_tracker.active_downloads.pop(download_id, None)
+
+    def admit(self, job: Dict[str, Any]) -> Optional[str]:
+        shortfall = self.ledger.check(job["download_id"])
+        if not shortfall:
+            self.ledger.activate(job["download_id"])
+        return shortfall
+
+    def recheck(self, job: Dict[str, Any]) -> Optional[str]:
+        return self.ledger.check(job["download_id"])
+
+    def held(self, job: Dict[str, Any]):
+        self.ledger.deactivate(job["download_id"])
+
+    async def run_job(self, job: Dict[str, Any]):
+        """Downloads forever, reporting a stop the way the downloader does."""
+        download_id = job["download_id"]
+        self.starts[download_id] = self.starts.get(download_id, 0) + 1
+        try:
+            await asyncio.Event().wait()
+        except asyncio.CancelledError:
+            await download_tracker.fail_download(
+                download_id, "Download cancelled by user.", cancelled=True
+            )
+            raise
+        finally:
+            self.ledger.deactivate(download_id)
+
+    def submit(self, download_id: str, size: int):
+        self.ledger.reserve(download_id, {self.root / f"{download_id}.bin": size})
+        download_tracker.start_tracking(download_id, "author/model", download_id, task=None)
+        self.scheduler.submit({"download_id": download_id, "paused": False})
+
+    async def settle(self):
+        for _ in range(5):
+            await asyncio.sleep(0)
+
+    async def test_full_disk_holds_the_newest_download_until_space_is_freed(self):
+        self.submit("older", 4 * GB)
+        self.submit("newer", 4 * GB)
+        await self.settle()
+        self.assertEqual(set(self.scheduler.active), {"older", "newer"})
+
+        # Something else fills the disk: only one of the two still fits.
+        self.free = 6 * GB
+        held = await self.scheduler.recheck_running(self.recheck, on_held=self.held)
+        await self.settle()
+
+        self.assertEqual(held, ["newer"])
+        self.assertEqual(list(self.scheduler.active), ["older"])
+        entry = self.scheduler.queued["newer"]
+        self.assertFalse(entry.paused)
+        self.assertFalse(entry.job["paused"])
+        self.assertIn("Not enough disk space", entry.hold_reason)
+        status = download_tracker.active_downloads["newer"]
+        self.assertEqual(status.status, "pending")
+        self.assertIn("Not enough disk space", status.status_text)
+
+        # Dispatching while the disk is still full keeps it held.
+        self.scheduler.dispatch()
+        await self.settle()
+        self.assertIn("newer", self.scheduler.queued)
+
+        # Once space is freed the next dispatch resumes it without user action.
+        self.free = 10 * GB
+        self.scheduler.dispatch()
+        await self.settle()
+        self.assertEqual(set(self.scheduler.active), {"older", "newer"})
+        self.assertEqual(self.starts, {"older": 1, "newer": 2})
+
+    async def test_download_that_still_fits_keeps_running(self):
+        self.submit("older", 4 * GB)
+        await self.settle()
+        self.free = 5 * GB
+        self.assertEqual(await self.scheduler.recheck_running(self.recheck, on_held=self.held), [])
+        self.assertEqual(list(self.scheduler.active), ["older"])
+
+
+if __name__ == "__main__":
+    unittest.main()
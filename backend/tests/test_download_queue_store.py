@@ -0,0 +1,48 @@
+# backend/tests/test_download_queue_store.py
+import json
+import pathlib
+import tempfile
+import unittest
+
+from backend.core.file_management.download_history import DownloadHistoryStore
+from backend.core.file_management.download_queue_store import DownloadQueueStore
+
+
+class DownloadQueueStoreTests(unittest.TestCase):
+    """The queue journal is written behind into the history database."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.root = pathlib.Path(self.tmp.name)
+        self.legacy_path = self.root / "download_queue.json"
+
+    def open_store(self) -> DownloadQueueStore:
+        history = DownloadHistoryStore(self.root / "history.db")
+        self.addCleanup(history.close)
+        return DownloadQueueStore(history, legacy_file_path=self.legacy_path)
+
+    def test_jobs_survive_a_restart_in_order(self):
+        store = self.open_store()
+        for download_id in ("b", "a", "c"):
+            store.add({"download_id": download_id, "paused": False})
+        store.remove("a")
+        store.jobs["b"]["paused"] = True  # Changed in place, not recorded yet.
+        store.history.close()
+
+        restored = self.open_store()
+        self.assertEqual([job["download_id"] for job in restored.get_all()], ["b", "c"])
+        self.assertFalse(restored.jobs["b"]["paused"])
+
+    def test_legacy_journal_is_imported_once(self):
+        self.legacy_path.write_text(json.dumps([{"download_id": "old", "paused": True}]))
+        store = self.open_store()
+        self.assertEqual(store.get_all(), [{"download_id": "old", "paused": True}])
+        self.assertFalse(self.legacy_path.exists())
+        store.history.close()
+
+        self.assertEqual([job["download_id"] for job in self.open_store().get_all()], ["old"])
+
+
+if __name__ == "__main__":
+    unittest.main()
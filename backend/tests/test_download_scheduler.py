@@ -0,0 +1,106 @@
+# backend/tests/test_download_scheduler.py
+import asyncio
+import unittest
+from typing import Any, Dict
+
+from backend.core.file_management.download_scheduler import DownloadScheduler
+from backend.core.file_management.download_tracker import download_tracker
+
+
+class DownloadSchedulerStopTests(unittest.IsolatedAsyncioTestCase):
+    """User cancellations are told apart from the scheduler stopping a job to queue it again."""
+
+    async def asyncSetUp(self):
+        self.starts: Dict[str, int] = {}
+        self.unwound = asyncio.Event()  # Cleared to keep a stopped job unwinding
+        self.unwound.set()
+        self.scheduler = DownloadScheduler(run_job=self.run_job, max_active=2, max_per_host=2)
+
+    async def asyncTearDown(self):
+        for entry in list(self.scheduler.active.values()):
+            entry.task.cancel()
+        await self.settle()
+        download_tracker.active_downloads.pop("job", None)
+
+    async def run_job(self, job: Dict[str, Any]):
+        """Waits before the first byte (like a probe), reporting a stop the way the downloader does."""
+        download_id = job["download_id"]
+        self.starts[download_id] = self.starts.get(download_id, 0) + 1
+        try:
+            await asyncio.Event().wait()
+        except asyncio.CancelledError:
+            await download_tracker.fail_download(
+                download_id, "Download cancelled by user.", cancelled=True
+            )
+            await self.unwound.wait()  # e.g. closing the partial file
+            raise
+
+    def submit(self, download_id: str = "job"):
+        download_tracker.start_tracking(download_id, "author/model", download_id, task=None)
+        self.scheduler.submit({"download_id": download_id, "paused": False})
+
+    async def settle(self):
+        for _ in range(5):
+            await asyncio.sleep(0)
+
+    async def test_cancel_before_the_first_byte(self):
+        self.submit()
+        await self.settle()
+        status = download_tracker.active_downloads["job"]
+        self.assertEqual(status.status, "pending")  # Still 'Starting...'
+
+        await download_tracker.cancel_and_remove("job")
+        await self.settle()
+
+        self.assertEqual(status.status, "cancelled")
+        self.assertNotIn("job", self.scheduler.active)
+        self.assertNotIn("job", self.scheduler.queued)
+
+    async def test_pause_is_not_a_cancellation(self):
+        self.submit()
+        await self.settle()
+        self.assertTrue(self.scheduler.pause("job"))
+        await self.settle()
+
+        self.assertEqual(download_tracker.active_downloads["job"].status, "paused")
+        self.assertIn("job", self.scheduler.queued)
+
+        self.assertTrue(self.scheduler.resume("job"))
+        await self.settle()
+        self.assertIn("job", self.scheduler.active)
+        self.assertEqual(self.starts["job"], 2)
+
+    async def test_resume_while_unwinding(self):
+        self.submit()
+        await self.settle()
+        self.unwound.clear()
+        self.assertTrue(self.scheduler.pause("job"))
+        await self.settle()
+        self.assertIn("job", self.scheduler.active)  # Still unwinding
+
+        self.assertTrue(self.scheduler.resume("job"))
+        self.unwound.set()
+        await self.settle()
+
+        self.assertIn("job", self.scheduler.active)
+        self.assertEqual(self.starts["job"], 2)
+        self.assertEqual(download_tracker.active_downloads["job"].status, "pending")
+
+    async def test_cancel_while_unwinding_from_pause(self):
+        self.submit()
+        await self.settle()
+        self.unwound.clear()
+        self.assertTrue(self.scheduler.pause("job"))
+        await self.settle()
+
+        self.assertTrue(await self.scheduler.cancel("job"))
+        await self.settle()
+
+        self.assertEqual(download_tracker.active_downloads["job"].status, "cancelled")
+        self.assertNotIn("job", self.scheduler.active)
+        self.assertNotIn("job", self.scheduler.queued)
+        self.assertEqual(self.starts["job"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+# backend/tests/test_file_hash_index.py
+import hashlib
+import pathlib
+import tempfile
+import unittest
+
+from backend.core.file_management.file_hash_index import FileHashIndex
+
+
+class FileHashIndexTests(unittest.TestCase):
+    """Lookups only use indexed files; unknown files are hashed by `index_unknown`."""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.root = pathlib.Path(directory.name)
+        self.models = self.root / "models"
+        self.models.mkdir()
+        self.index = FileHashIndex(self.root / "index.json")
+
+    def write(self, name: str, data: bytes) -> pathlib.Path:
+        path = self.models / name
+        path.write_bytes(data)
+        return path
+
+    def test_unindexed_files_are_not_hashed_by_lookups(self):
+        self.write("model.bin", b"weights")
+        sha256 = hashlib.sha256(b"weights").hexdigest()
+        self.assertIsNone(self.index.find_copy(sha256, 7, [self.models]))
+
+        self.assertEqual(self.index.index_unknown(7, [self.models]), 1)
+        self.assertEqual(self.index.find_copy(sha256, 7, [self.models]), self.models / "model.bin")
+        self.assertEqual(self.index.index_unknown(7, [self.models]), 0)
+
+    def test_changed_files_are_not_matched(self):
+        path = self.write("model.bin", b"weights")
+        self.index.record(path, hashlib.sha256(b"weights").hexdigest())
+        path.write_bytes(b"changed")
+        self.assertIsNone(
+            self.index.find_copy(hashlib.sha256(b"weights").hexdigest(), 7, [self.models])
+        )
+
+    def test_records_are_written_on_flush(self):
+        path = self.write("model.bin", b"weights")
+        self.index.record(path, "a" * 64)
+        self.index.record(self.write("other.bin", b"other"), "b" * 64)
+        self.assertFalse(self.index.file_path.exists())
+
+        self.index.flush()
+        reloaded = FileHashIndex(self.index.file_path)
+        self.assertEqual(reloaded.lookup(path), "a" * 64)
+        self.assertEqual(len(reloaded.entries), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+# backend/tests/test_hf_source.py
+import unittest
+
+import httpx
+
+from backend.core.http_client import http_client_manager
+from backend.core.hub_endpoints import hub_endpoints
+from backend.core.sources.hf_source import HuggingFaceSource
+
+HUB_URL = "https://hub.test"
+
+
+class HuggingFaceSourceErrorTests(unittest.IsolatedAsyncioTestCase):
+    """Hub errors are mapped the way HfApi's exceptions were."""
+
+    async def asyncSetUp(self):
+        self.status = 200
+        self.headers = {}
+        hub_endpoints.configure([HUB_URL])
+        http_client_manager._client = httpx.AsyncClient(transport=httpx.MockTransport(self.handle))
+        self.source = HuggingFaceSource()
+
+    async def asyncTearDown(self):
+        await http_client_manager.close()
+        hub_endpoints.configure([])
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        if self.status != 200:
+            return httpx.Response(self.status, headers=self.headers, json={"error": "rejected"})
+        if request.url.path == "/api/models":
+            return httpx.Response(200, json=[{"id": "author/model", "tags": []}])
+        return httpx.Response(200, json={"id": "author/model", "sha": "abc", "siblings": []})
+
+    async def test_search_returns_results(self):
+        items, has_more, next_cursor = await self.source.search_models(search_query="model")
+        self.assertEqual([item["id"] for item in items], ["author/model"])
+        self.assertFalse(has_more)
+        self.assertIsNone(next_cursor)
+
+    async def test_rejected_search_returns_no_results(self):
+        for status in (400, 401, 403, 404, 422):
+            with self.subTest(status=status):
+                self.status = status
+                result = await self.source.search_models(search_query=f"query-{status}")
+                self.assertEqual(result, ([], False, None))
+
+    async def test_search_server_error_is_raised(self):
+        self.status = 500
+        with self.assertRaises(httpx.HTTPStatusError):
+            await self.source.search_models(search_query="model")
+
+    async def test_missing_repository_has_no_details(self):
+        self.status = 404
+        self.assertIsNone(await self.source.get_model_details("author/missing"))
+        self.status, self.headers = 401, {"x-error-code": "RepoNotFound"}
+        self.assertIsNone(await self.source.get_model_details("author/missing"))
+
+    async def test_gated_repository_details_are_raised(self):
+        self.status, self.headers = 403, {"x-error-code": "GatedRepo"}
+        with self.assertRaises(httpx.HTTPStatusError):
+            await self.source.get_model_details("author/gated")
+
+    async def test_details(self):
+        details = await self.source.get_model_details("author/model")
+        self.assertEqual(details["sha"], "abc")
+
+
+if __name__ == "__main__":
+    unittest.main()
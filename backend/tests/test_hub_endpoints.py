@@ -0,0 +1,150 @@
+# backend/tests/test_hub_endpoints.py
+import json
+import os
+import socket
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+import httpx
+
+from backend.core.http_client import http_client_manager
+from backend.core.hub_endpoints import hub_endpoints
+
+
+class _HubServer:
+    """
+    A local stand-in for a Hub endpoint that answers with a fixed status. A delay
+    is spent both before the headers and before the body, so it shows up in the
+    probed latency as well as the throughput.
+    """
+
+    def __init__(self, status: int = 200, delay: float = 0.0):
+        self.status = status
+        self.delay = delay
+        self.requests = []
+        self.authorizations = []
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server.requests.append(self.path)
+                server.authorizations.append(self.headers.get("Authorization"))
+                time.sleep(server.delay)
+                body = json.dumps([{"id": "author/model"}] if server.status == 200 else {})
+                self.send_response(server.status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.flush()
+                time.sleep(server.delay)
+                self.wfile.write(body.encode())
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def _unused_url() -> str:
+    """The URL of a local port nothing listens on."""
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return f"http://127.0.0.1:{s.getsockname()[1]}"
+
+
+class HubEndpointFailoverTests(unittest.IsolatedAsyncioTestCase):
+    """Requests and probes against a failing and a healthy local endpoint."""
+
+    async def asyncSetUp(self):
+        self.failing = _HubServer(status=500)
+        self.healthy = _HubServer()
+        self.addCleanup(self.failing.close)
+        self.addCleanup(self.healthy.close)
+        http_client_manager._client = httpx.AsyncClient(trust_env=False, timeout=5.0)
+
+    async def asyncTearDown(self):
+        await http_client_manager.close()
+        hub_endpoints.configure([])
+
+    async def test_get_fails_over_to_the_healthy_endpoint(self):
+        hub_endpoints.configure([self.failing.url, self.healthy.url])
+        response = await hub_endpoints.get("/api/models")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), [{"id": "author/model"}])
+        self.assertEqual(self.failing.requests, ["/api/models"])
+        self.assertEqual(self.healthy.requests, ["/api/models"])
+        self.assertFalse(hub_endpoints.endpoints[self.failing.url].healthy)
+        self.assertEqual(hub_endpoints.ranked(), [self.healthy.url, self.failing.url])
+
+        # The failed endpoint is skipped first from now on.
+        await hub_endpoints.get("/api/models")
+        self.assertEqual(len(self.failing.requests), 1)
+        self.assertEqual(len(self.healthy.requests), 2)
+
+    async def test_get_fails_over_from_an_unreachable_endpoint(self):
+        unreachable = _unused_url()
+        hub_endpoints.configure([unreachable, self.healthy.url])
+        response = await hub_endpoints.get("/api/models")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(hub_endpoints.endpoints[unreachable].healthy)
+        self.assertEqual(hub_endpoints.best, self.healthy.url)
+
+    async def test_all_failing_returns_the_last_response(self):
+        other = _HubServer(status=503)
+        self.addCleanup(other.close)
+        hub_endpoints.configure([self.failing.url, other.url])
+        response = await hub_endpoints.get("/api/models")
+        self.assertEqual(response.status_code, 503)
+
+    async def test_probes_rank_the_healthy_endpoint_first(self):
+        hub_endpoints.configure([self.failing.url, self.healthy.url])
+        await hub_endpoints.probe_all()
+
+        self.assertEqual(hub_endpoints.ranked(), [self.healthy.url, self.failing.url])
+        status = hub_endpoints.get_status()
+        self.assertTrue(status[0]["healthy"])
+        self.assertIsNotNone(status[0]["latency_seconds"])
+        self.assertFalse(status[1]["healthy"])
+        self.assertEqual(status[1]["failures"], 1)
+
+        # Once the failing endpoint recovers, a probe makes it healthy again.
+        self.failing.status = 200
+        await hub_endpoints.probe_all()
+        self.assertTrue(hub_endpoints.endpoints[self.failing.url].healthy)
+
+    async def test_probes_rank_the_faster_endpoint_first(self):
+        slow = _HubServer(delay=0.3)
+        self.addCleanup(slow.close)
+        hub_endpoints.configure([slow.url, self.healthy.url])
+        self.assertEqual(hub_endpoints.ranked(), [slow.url, self.healthy.url])
+
+        await hub_endpoints.probe_all()
+        self.assertEqual(hub_endpoints.ranked(), [self.healthy.url, slow.url])
+
+    @mock.patch.dict(os.environ, {"HF_TOKEN": "hf_secret"})
+    async def test_token_is_only_sent_to_trusted_endpoints(self):
+        hub_endpoints.configure([self.failing.url, self.healthy.url])
+        await hub_endpoints.get("/api/models")
+        self.assertEqual(self.failing.authorizations, [None])
+        self.assertEqual(self.healthy.authorizations, [None])
+
+        hub_endpoints.configure([self.healthy.url], trusted=[self.healthy.url])
+        await hub_endpoints.get("/api/models")
+        self.assertEqual(self.healthy.authorizations[-1], "Bearer hf_secret")
+        self.assertFalse(hub_endpoints.is_trusted(f"{self.healthy.url}.evil.test/api"))
+
+
+if __name__ == "__main__":
+    unittest.main()
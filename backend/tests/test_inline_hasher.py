@@ -0,0 +1,88 @@
+# backend/tests/test_inline_hasher.py
+import hashlib
+import os
+import pathlib
+import tempfile
+import unittest
+
+from backend.core.file_management.inline_hasher import HoldBudget, InlineHasher
+from backend.core.file_management.partial_download import DownloadSegment
+
+CHUNK = 1024
+SEGMENT_SIZE = 8 * CHUNK
+
+
+class InlineHasherTests(unittest.TestCase):
+    """Segments written out of order hash to the digest of the whole file."""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = pathlib.Path(directory.name) / "file.part"
+        self.data = os.urandom(4 * SEGMENT_SIZE)
+        self.path.write_bytes(b"\0" * len(self.data))
+
+    def segments(self, written: int = 0):
+        return [
+            DownloadSegment(start, start + SEGMENT_SIZE - 1, written if start == 0 else 0)
+            for start in range(0, len(self.data), SEGMENT_SIZE)
+        ]
+
+    def write_interleaved(self, hasher: InlineHasher, segments):
+        """Writes one chunk of every segment in turn, like parallel connections would."""
+        with open(self.path, "r+b") as f:
+            for step in range(0, SEGMENT_SIZE, CHUNK):
+                for segment in segments:
+                    position = segment.start + step
+                    if position < segment.next_offset:
+                        continue
+                    chunk = self.data[position : position + CHUNK]
+                    f.seek(position)
+                    f.write(chunk)
+                    f.flush()
+                    hasher.feed(segment.start, position, memoryview(chunk))
+
+    def test_later_segments_are_hashed_from_memory(self):
+        segments = self.segments()
+        hasher = InlineHasher(self.path, segments)
+        self.write_interleaved(hasher, segments)
+        self.assertEqual(hasher.finish(len(self.data)), hashlib.sha256(self.data).hexdigest())
+        self.assertEqual(hasher.bytes_read_back, 0)
+        self.assertEqual(hasher.held_size, 0)
+
+    def test_data_beyond_the_hold_limit_is_read_back(self):
+        segments = self.segments()
+        hasher = InlineHasher(self.path, segments, budget=HoldBudget(4 * CHUNK))
+        self.write_interleaved(hasher, segments)
+        self.assertEqual(hasher.finish(len(self.data)), hashlib.sha256(self.data).hexdigest())
+        self.assertGreater(hasher.bytes_read_back, 0)
+        self.assertLess(hasher.bytes_read_back, len(self.data) - SEGMENT_SIZE)
+
+    def test_resumed_part_is_read_back(self):
+        with open(self.path, "r+b") as f:
+            f.write(self.data[: 2 * CHUNK])
+        segments = self.segments(written=2 * CHUNK)
+        hasher = InlineHasher(self.path, segments)
+        self.write_interleaved(hasher, segments)
+        self.assertEqual(hasher.finish(len(self.data)), hashlib.sha256(self.data).hexdigest())
+        self.assertEqual(hasher.bytes_read_back, 2 * CHUNK)
+
+    def test_hold_budget_is_shared_between_downloads(self):
+        budget = HoldBudget(4 * CHUNK)
+        other = InlineHasher(self.path, self.segments(), budget=budget)
+        other.feed(SEGMENT_SIZE, SEGMENT_SIZE, memoryview(bytes(4 * CHUNK)))
+        self.assertEqual(budget.used, 4 * CHUNK)
+
+        segments = self.segments()
+        hasher = InlineHasher(self.path, segments, budget=budget)
+        self.write_interleaved(hasher, segments)
+        self.assertEqual(hasher.finish(len(self.data)), hashlib.sha256(self.data).hexdigest())
+        self.assertGreater(hasher.bytes_read_back, 0)  # Nothing was left to hold it in.
+        self.assertEqual(budget.used, 4 * CHUNK)
+
+        other.release()  # That download stopped early.
+        self.assertEqual(budget.used, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+# backend/tests/test_partial_sweep.py
+import os
+import pathlib
+import tempfile
+import unittest
+
+from backend.core.file_management.partial_download import (
+    PartialDownload,
+    partial_paths_for,
+    sweep_orphaned_partials,
+    write_sidecar,
+)
+
+
+class PartialSweepTests(unittest.TestCase):
+    """The sweeper only removes files it can prove were written by a download."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.root = pathlib.Path(self.tmp.name)
+        self.models = self.root / "models"
+        self.models.mkdir()
+
+    def leftover(self, name: str, sidecar: bool = True, partial: bool = True):
+        partial_path, sidecar_path = partial_paths_for(self.models / name)
+        if partial:
+            partial_path.write_bytes(b"x" * 16)
+            os.utime(partial_path, (0, 0))
+        if sidecar:
+            state = PartialDownload("https://hub.test/f", "author/model", name, None, "e", 16)
+            write_sidecar(sidecar_path, state.to_dict())
+        return partial_path, sidecar_path
+
+    def sweep(self, owned=()) -> int:
+        return sweep_orphaned_partials([self.models], [self.root], set(owned))
+
+    def test_only_files_with_a_sidecar_are_removed(self):
+        stale = self.leftover("stale.safetensors")
+        stray_sidecar = self.leftover("gone.safetensors", partial=False)[1]
+        foreign_part = self.leftover("foreign.safetensors", sidecar=False)[0]
+        foreign_sidecar = self.models / "junk.safetensors.part.json"
+        foreign_sidecar.write_text("not a sidecar")
+        foreign_temp = self.root / "tmpa1b2c3d4"
+        foreign_temp.write_bytes(b"user data")
+
+        with self.assertLogs("backend.core.file_management.partial_download", "WARNING"):
+            removed = self.sweep()
+
+        self.assertEqual(removed, 3)
+        self.assertFalse(any(path.exists() for path in (*stale, stray_sidecar)))
+        self.assertTrue(foreign_part.exists())
+        self.assertTrue(foreign_sidecar.exists())
+        self.assertTrue(foreign_temp.exists())
+
+    def test_partials_of_queued_jobs_are_kept(self):
+        partial_path, sidecar_path = self.leftover("queued.safetensors")
+        self.assertEqual(self.sweep(owned=[self.models / "queued.safetensors"]), 0)
+        self.assertTrue(partial_path.exists())
+        self.assertTrue(sidecar_path.exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
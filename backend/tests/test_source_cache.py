@@ -0,0 +1,151 @@
+# backend/tests/test_source_cache.py
+import asyncio
+import time
+import unittest
+
+import httpx
+
+from backend.core.constants.constants import (
+    SEARCH_CACHE_TTL_SECONDS,
+    SOURCE_CACHE_MAX_STALE_SECONDS,
+)
+from backend.core.http_client import http_client_manager
+from backend.core.hub_endpoints import hub_endpoints
+from backend.core.source_cache import SourceCache
+from backend.core.source_manager import SourceManager
+
+HUB_URL = "https://hub.test"
+
+
+class SourceCacheEvictionTests(unittest.IsolatedAsyncioTestCase):
+    """Entries beyond the size limit are evicted, least recently used first."""
+
+    async def asyncSetUp(self):
+        self.discarded = []
+        self.cache = SourceCache(
+            max_bytes=30, on_discard=lambda kind, key, value: self.discarded.append(key)
+        )
+
+    async def put(self, key: str, value: str):
+        async def fetch(previous):
+            return value
+
+        return await self.cache.get("search", key, 60, fetch)
+
+    async def test_least_recently_used_entry_is_evicted(self):
+        await self.put("a", "x" * 10)
+        await self.put("b", "y" * 10)
+        await self.put("a", "unused")  # A hit, so 'b' is now the least recently used.
+        await self.put("c", "z" * 10)
+
+        self.assertEqual(list(self.cache.entries), [("search", "a"), ("search", "c")])
+        self.assertEqual(self.discarded, ["b"])
+        self.assertEqual(self.cache.get_stats()["evictions"], 1)
+
+    async def test_replaced_entry_is_discarded(self):
+        await self.put("a", "x")
+        self.cache.entries[("search", "a")].fetched_at -= 60 + self.cache.max_stale + 1
+        self.assertEqual(await self.put("a", "new"), "new")
+        self.assertEqual(self.discarded, ["a"])
+
+
+class SourceCacheRefreshTests(unittest.IsolatedAsyncioTestCase):
+    """A fetch shared by several requests never leaves them waiting forever."""
+
+    async def test_cancelled_fetch_releases_waiters(self):
+        cache = SourceCache()
+        started = asyncio.Event()
+
+        async def fetch(previous):
+            started.set()
+            await asyncio.Event().wait()
+
+        first = asyncio.create_task(cache.get("details", "a", 60, fetch))
+        await started.wait()
+        second = asyncio.create_task(cache.get("details", "a", 60, fetch))
+        await asyncio.sleep(0)
+        first.cancel()
+
+        with self.assertRaises(asyncio.CancelledError):
+            await asyncio.wait_for(second, timeout=1)
+        self.assertEqual(cache._in_flight, {})
+
+    async def test_background_refresh_is_kept_alive(self):
+        cache = SourceCache()
+        refreshed = asyncio.Event()
+
+        async def fetch(previous):
+            if previous is not None:
+                await refreshed.wait()
+            return "new" if previous else "old"
+
+        await cache.get("details", "a", 60, fetch)
+        cache.entries[("details", "a")].fetched_at -= 61
+        self.assertEqual(await cache.get("details", "a", 60, fetch), "old")
+        self.assertEqual(len(cache._refresh_tasks), 1)
+
+        refreshed.set()
+        await asyncio.gather(*cache._refresh_tasks)
+        self.assertEqual(cache._refresh_tasks, set())
+        self.assertEqual(await cache.get("details", "a", 60, fetch), "new")
+
+
+class SearchCursorEvictionTests(unittest.IsolatedAsyncioTestCase):
+    """Search cursors live and die with the cached page that handed them out."""
+
+    async def asyncSetUp(self):
+        hub_endpoints.configure([HUB_URL])
+        http_client_manager._client = httpx.AsyncClient(transport=httpx.MockTransport(self.handle))
+        self.manager = SourceManager()
+        self.source = self.manager.sources["huggingface"]
+
+    async def asyncTearDown(self):
+        await http_client_manager.close()
+        hub_endpoints.configure([])
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        query = request.url.params.get("search", "")
+        limit = int(request.url.params.get("limit", "1"))
+        return httpx.Response(
+            200, json=[{"id": f"author/{query}-{i}", "tags": []} for i in range(limit)]
+        )
+
+    async def search(self, query: str):
+        return await self.manager.search_models(search_query=query, limit=1)
+
+    async def test_cursor_expires_with_the_cached_page(self):
+        before = time.monotonic()
+        _, has_more, cursor = await self.search("model")
+        self.assertTrue(has_more)
+        expires_at = self.source._positions[cursor].expires_at
+        self.assertGreaterEqual(
+            expires_at, before + SEARCH_CACHE_TTL_SECONDS + SOURCE_CACHE_MAX_STALE_SECONDS
+        )
+
+    async def test_evicted_page_drops_its_cursor(self):
+        _, _, cursor = await self.search("first")
+        self.assertIn(cursor, self.source._positions)
+
+        # Room for about one page: the next search evicts the first one.
+        self.manager.cache.max_bytes = self.manager.cache.size + 10
+        _, _, other_cursor = await self.search("second")
+
+        self.assertEqual(len(self.manager.cache.entries), 1)
+        self.assertEqual(self.manager.cache.evictions, 1)
+        self.assertNotIn(cursor, self.source._positions)
+        self.assertNotIn(cursor, self.source._position_index.values())
+        self.assertIn(other_cursor, self.source._positions)
+
+    async def test_refetched_page_drops_the_old_cursor(self):
+        _, _, cursor = await self.search("model")
+        for entry in self.manager.cache.entries.values():
+            entry.fetched_at -= entry.ttl + self.manager.cache.max_stale + 1
+
+        _, _, new_cursor = await self.search("model")
+        self.assertNotEqual(new_cursor, cursor)
+        self.assertNotIn(cursor, self.source._positions)
+        self.assertIn(new_cursor, self.source._positions)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+# backend/tests/test_ws_stream.py
+import asyncio
+import json
+import unittest
+
+from backend.main import ConnectionManager
+
+
+class _FakeWebSocket:
+    """Records what is sent to it; sends wait while `gate` is cleared."""
+
+    client = "test-client"
+
+    def __init__(self):
+        self.sent = []
+        self.gate = asyncio.Event()
+        self.gate.set()
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text: str):
+        await self.gate.wait()
+        self.sent.append(json.loads(text))
+
+    async def close(self, code=None):
+        pass
+
+
+def _update(download_id: str, downloaded: int) -> dict:
+    return {
+        "type": "update",
+        "data": {"download_id": download_id, "status": "downloading", "downloaded": downloaded},
+    }
+
+
+class EventStreamOrderTests(unittest.IsolatedAsyncioTestCase):
+    """Merged progress never lets a client's stream position skip an event."""
+
+    async def asyncSetUp(self):
+        self.manager = ConnectionManager()
+
+    async def asyncTearDown(self):
+        for websocket in self.manager.active_connections:
+            self.manager.disconnect(websocket)
+
+    async def flush(self, websocket: _FakeWebSocket):
+        websocket.gate.set()
+        for _ in range(10):
+            await asyncio.sleep(0)
+
+    async def test_merge_keeps_sequence_order_across_a_reconnect(self):
+        first = _FakeWebSocket()
+        await self.manager.connect(first)
+        first.gate.clear()
+
+        self.manager.broadcast(_update("a", 1))  # seq 1, taken by the writer
+        await asyncio.sleep(0)
+        self.manager.broadcast(_update("a", 2))  # seq 2
+        self.manager.broadcast(_update("b", 1))  # seq 3
+        self.manager.broadcast(_update("a", 3))  # seq 4, merged into seq 2
+        self.assertEqual(self.manager.stats["client_messages_merged"], 1)
+        await self.flush(first)
+
+        seqs = [message["seq"] for message in first.sent]
+        self.assertEqual(seqs, [1, 3, 4])
+        self.assertEqual(first.sent[-1]["data"]["downloaded"], 3)
+
+        # The connection drops after the first two; the client resumes from the highest seq.
+        self.manager.disconnect(first)
+        position = max(seqs[:2])
+        second = _FakeWebSocket()
+        await self.manager.connect(second)
+        self.assertTrue(self.manager.resume(second, self.manager.stream_id, position))
+        await self.flush(second)
+
+        self.assertEqual(second.sent[0]["type"], "resumed")
+        replayed = [message["seq"] for message in second.sent[1:]]
+        self.assertEqual(replayed, [4])
+        self.assertEqual(second.sent[-1]["data"]["downloaded"], 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -140,13 +140,16 @@ function App() {
         logger.info('Setting up WebSocket for download and task tracking...');
         const handleWsMessage = (data: any) => {
             switch (data.type) {
-                case 'initial_state':
-                    setActiveDownloads(
-                        new Map(
-                            (data.downloads || []).map((s: DownloadStatus) => [s.download_id, s]),
-                        ),
+                case 'initial_state': {
+                    // Large snapshots arrive in pages; the first page replaces the state.
+                    const entries: [string, DownloadStatus][] = (data.downloads || []).map(
+                        (s: DownloadStatus) => [s.download_id, s],
+                    );
+                    setActiveDownloads((prev) =>
+                        (data.page ?? 1) === 1 ? new Map(entries) : new Map([...prev, ...entries]),
                     );
                     break;
+                }
                 case 'update':
                     const status: DownloadStatus = data.data;
                     if (status?.download_id) {
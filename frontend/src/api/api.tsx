@@ -34,6 +34,8 @@ export interface PaginatedModelListResponse {
     page: number;
     limit: number;
     has_more: boolean;
+    /** Pass as `cursor` with the next page to continue where this page stopped. */
+    next_cursor?: string | null;
 }
 
 export interface ModelDetails extends ModelListItem {
@@ -54,6 +56,7 @@ export interface SearchModelParams {
     direction?: -1 | 1;
     limit?: number;
     page?: number;
+    cursor?: string;
 }
 
 // --- FileManager & Download Interfaces ---
@@ -80,6 +83,9 @@ export interface PathConfigurationRequest {
     color_theme?: ColorThemeType | null;
     config_mode?: ConfigurationMode | null;
     automatic_mode_ui?: UiNameType | null;
+    download_segments?: number | null;
+    max_active_downloads?: number | null;
+    max_downloads_per_host?: number | null;
 }
 
 export interface MalFullConfiguration {
@@ -89,6 +95,10 @@ export interface MalFullConfiguration {
     color_theme: ColorThemeType | null;
     config_mode: ConfigurationMode | null;
     automatic_mode_ui: UiNameType | null;
+    download_segments?: number | null;
+    max_active_downloads?: number | null;
+    max_downloads_per_host?: number | null;
+    bandwidth_limit?: number | null;
 }
 
 export interface PathConfigurationResponse {
@@ -105,6 +115,14 @@ export interface FileDownloadRequest {
     model_type: ModelType;
     custom_sub_path?: string | null;
     revision?: string | null;
+    segments?: number | null;
+    priority?: number;
+    /** Bytes per second for this download. 0 or null is unlimited. */
+    bandwidth_limit?: number | null;
+    /** Expected size in bytes, if known, to reserve disk space up front. */
+    size?: number | null;
+    /** Other managed UIs to place the file in as well. It is downloaded once. */
+    additional_ui_targets?: UiNameType[] | null;
 }
 
 export interface FileDownloadResponse {
@@ -112,20 +130,65 @@ export interface FileDownloadResponse {
     message?: string | null;
     error?: string | null;
     download_id?: string | null;
+    /** True if the request joined a download already in progress. */
+    attached?: boolean;
 }
 
 // --- Download Tracker WebSocket Interface ---
+/** Progress of one file within a multi-file (snapshot) download. */
+export interface FileProgress {
+    filename: string;
+    total_size_bytes: number;
+    downloaded_bytes: number;
+    status: DownloadStatus['status'];
+    error_message?: string | null;
+    status_text?: string | null;
+    deduplicated?: boolean;
+    from_hf_cache?: boolean;
+}
+
 export interface DownloadStatus {
     download_id: string;
     filename: string;
     repo_id: string;
-    status: 'pending' | 'downloading' | 'running' | 'completed' | 'error' | 'cancelled';
+    status:
+        | 'pending'
+        | 'paused'
+        | 'downloading'
+        | 'running'
+        | 'completed'
+        | 'error'
+        | 'cancelled';
     progress: number;
     total_size_bytes: number;
     downloaded_bytes: number;
     error_message?: string | null;
     status_text?: string | null;
     target_path?: string | null;
+    queue_position?: number | null;
+    priority?: number;
+    sha256?: string | null;
+    /** True when the file was linked from an identical local copy instead of downloaded. */
+    deduplicated?: boolean;
+    /** True when the file was linked from the local Hugging Face cache instead of downloaded. */
+    from_hf_cache?: boolean;
+    files?: FileProgress[] | null;
+    /** Files reused from (hits) or not found in (misses) the local Hugging Face cache. */
+    cache_hits?: number;
+    cache_misses?: number;
+    /** Unix timestamps (seconds) of when the job was created and when it finished. */
+    created_at?: number;
+    finished_at?: number | null;
+    /** Smoothed transfer rate and the highest one seen, in bytes per second. */
+    throughput?: number;
+    peak_throughput?: number;
+    eta_seconds?: number | null;
+    /** Time spent transferring, excluding time queued or paused. */
+    elapsed_seconds?: number;
+    /** Time the download waited for its disk writes. */
+    write_blocked_seconds?: number;
+    /** True while no data has arrived for a while. */
+    stalled?: boolean;
     set_as_active_on_completion?: boolean;
 }
 
@@ -277,6 +340,36 @@ export const cancelDownloadAPI = async (
     }
 };
 
+export const pauseDownloadAPI = async (downloadId: string): Promise<void> => {
+    try {
+        await apiClient.post(`/filemanager/downloads/${downloadId}/pause`);
+    } catch (error) {
+        console.error(`Failed to pause download ${downloadId}:`, error);
+        throw error;
+    }
+};
+
+export const resumeDownloadAPI = async (downloadId: string): Promise<void> => {
+    try {
+        await apiClient.post(`/filemanager/downloads/${downloadId}/resume`);
+    } catch (error) {
+        console.error(`Failed to resume download ${downloadId}:`, error);
+        throw error;
+    }
+};
+
+export const moveDownloadAPI = async (
+    downloadId: string,
+    direction: 'up' | 'down',
+): Promise<void> => {
+    try {
+        await apiClient.post(`/filemanager/downloads/${downloadId}/move`, { direction });
+    } catch (error) {
+        console.error(`Failed to move download ${downloadId}:`, error);
+        throw error;
+    }
+};
+
 export const dismissDownloadAPI = async (downloadId: string): Promise<void> => {
     try {
         await apiClient.delete(`/filemanager/downloads/${downloadId}`);
@@ -470,8 +563,31 @@ export const stopUiAPI = async (taskId: string): Promise<{ success: boolean; mes
     }
 };
 
-export const connectToDownloadTracker = (onMessage: (data: any) => void): WebSocket => {
-    const wsUrl = `${WS_BASE_URL}/ws/downloads`;
+// Position in the backend's event stream, so a new connection only receives what was missed.
+let downloadStreamPosition: { streamId: string; seq: number } | null = null;
+
+/** Events a socket client can subscribe to; a new connection receives 'all'. */
+export type DownloadTrackerTopic =
+    | 'all'
+    | 'downloads'
+    | 'installs'
+    | `download:${string}`
+    | `logs:${string}`;
+
+export const connectToDownloadTracker = (
+    onMessage: (data: any) => void,
+    topics?: DownloadTrackerTopic[],
+): WebSocket => {
+    const params = new URLSearchParams();
+    if (downloadStreamPosition) {
+        params.set('stream_id', downloadStreamPosition.streamId);
+        params.set('last_seq', String(downloadStreamPosition.seq));
+    }
+    if (topics) {
+        params.set('topics', topics.join(','));
+    }
+    const query = params.toString();
+    const wsUrl = `${WS_BASE_URL}/ws/downloads${query ? `?${query}` : ''}`;
     const ws = new WebSocket(wsUrl);
 
     ws.onopen = () => console.log('WebSocket connection established.');
@@ -479,6 +595,16 @@ export const connectToDownloadTracker = (onMessage: (data: any) => void): WebSoc
     ws.onmessage = (event) => {
         try {
             const data = JSON.parse(event.data);
+            if (data.stream_id && data.stream_id !== downloadStreamPosition?.streamId) {
+                downloadStreamPosition = { streamId: data.stream_id, seq: data.seq };
+            } else if (
+                downloadStreamPosition &&
+                typeof data.seq === 'number' &&
+                data.type !== 'resumed'
+            ) {
+                // Keep the highest event seen; the replay after 'resumed' starts below it.
+                downloadStreamPosition.seq = Math.max(downloadStreamPosition.seq, data.seq);
+            }
             onMessage(data);
         } catch (e) {
             console.error('Error parsing WebSocket message:', e);
@@ -136,6 +136,7 @@ const DownloadModal: React.FC<DownloadModalProps> = ({
                 source: modelDetails.source,
                 repo_id: modelDetails.id,
                 filename: selection.file.rfilename,
+                size: selection.file.size,
                 model_type: selection.modelType,
                 custom_sub_path:
                     selection.modelType === 'custom' ? selection.customPath : undefined,
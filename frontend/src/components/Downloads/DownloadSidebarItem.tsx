@@ -1,7 +1,24 @@
 // frontend/src/components/Downloads/DownloadSidebarItem.tsx
 import React, { useState } from 'react';
-import { Loader2, CheckCircle2, AlertTriangle, X, Ban, Play } from 'lucide-react';
-import { cancelDownloadAPI, type DownloadStatus, stopUiAPI } from '../../api/api';
+import {
+    Loader2,
+    CheckCircle2,
+    AlertTriangle,
+    X,
+    Ban,
+    Play,
+    Pause,
+    ChevronUp,
+    ChevronDown,
+} from 'lucide-react';
+import {
+    cancelDownloadAPI,
+    moveDownloadAPI,
+    pauseDownloadAPI,
+    resumeDownloadAPI,
+    type DownloadStatus,
+    stopUiAPI,
+} from '../../api/api';
 import ConfirmModal from '../Layout/ConfirmModal';
 
 interface DownloadSidebarItemProps {
@@ -18,14 +35,26 @@ const DownloadSidebarItem: React.FC<DownloadSidebarItemProps> = ({ status, onDis
         error_message,
         repo_id,
         status_text,
+        queue_position,
+        deduplicated,
+        from_hf_cache,
+        files,
     } = status;
 
     const [isConfirmOpen, setIsConfirmOpen] = useState(false);
 
     const isCancellable =
-        taskStatus === 'pending' || taskStatus === 'downloading' || taskStatus === 'running';
+        taskStatus === 'pending' ||
+        taskStatus === 'paused' ||
+        taskStatus === 'downloading' ||
+        taskStatus === 'running';
     const isUiInstallation = repo_id === 'UI Installation';
     const isUiProcess = repo_id === 'UI Process';
+    const isFileDownload = !isUiInstallation && !isUiProcess;
+    const isPausable =
+        isFileDownload && (taskStatus === 'pending' || taskStatus === 'downloading');
+    const isQueued = isFileDownload && taskStatus === 'pending' && queue_position != null;
+    const pauseResumeLabel = taskStatus === 'paused' ? 'Resume Download' : 'Pause Download';
 
     const getStatusIcon = () => {
         switch (taskStatus) {
@@ -33,6 +62,8 @@ const DownloadSidebarItem: React.FC<DownloadSidebarItemProps> = ({ status, onDis
                 return <Loader2 size={18} className="animate-spin" />;
             case 'running':
                 return <Play size={18} className="icon-running" />;
+            case 'paused':
+                return <Pause size={18} className="icon-pending" />;
             case 'completed':
                 return <CheckCircle2 size={18} className="icon-success" />;
             case 'cancelled':
@@ -62,6 +93,26 @@ const DownloadSidebarItem: React.FC<DownloadSidebarItemProps> = ({ status, onDis
         }
     };
 
+    const handlePauseResume = async () => {
+        try {
+            if (taskStatus === 'paused') {
+                await resumeDownloadAPI(download_id);
+            } else {
+                await pauseDownloadAPI(download_id);
+            }
+        } catch (error) {
+            console.error(`Failed to pause/resume download ${download_id}:`, error);
+        }
+    };
+
+    const handleMove = async (direction: 'up' | 'down') => {
+        try {
+            await moveDownloadAPI(download_id, direction);
+        } catch (error) {
+            console.error(`Failed to move download ${download_id}:`, error);
+        }
+    };
+
     const handleActionClick = () => {
         if (isCancellable) {
             handleRequestCancel();
@@ -78,7 +129,13 @@ const DownloadSidebarItem: React.FC<DownloadSidebarItemProps> = ({ status, onDis
             : `Are you sure you want to cancel the task for "${filename}"?`;
     const confirmText = isUiProcess && taskStatus === 'running' ? 'Yes, Stop' : 'Yes, Cancel';
 
-    const showStatusText = isUiInstallation && status_text && taskStatus !== 'completed';
+    // A download finished from an existing local copy or the Hugging Face cache says so.
+    // Multi-file downloads show how many of their files are done.
+    const showStatusText =
+        status_text &&
+        (taskStatus === 'completed'
+            ? deduplicated || from_hf_cache
+            : isUiInstallation || !!files || taskStatus === 'pending' || taskStatus === 'paused');
 
     const renderBody = () => {
         if (taskStatus === 'error') {
@@ -146,6 +203,36 @@ const DownloadSidebarItem: React.FC<DownloadSidebarItemProps> = ({ status, onDis
                 </div>
                 <div className="download-item-body">{renderBody()}</div>
                 <div className="download-item-actions">
+                    {isQueued && (
+                        <>
+                            <button
+                                onClick={() => handleMove('up')}
+                                className="button-icon"
+                                aria-label="Move Up in Queue"
+                                title="Move Up in Queue"
+                            >
+                                <ChevronUp size={16} />
+                            </button>
+                            <button
+                                onClick={() => handleMove('down')}
+                                className="button-icon"
+                                aria-label="Move Down in Queue"
+                                title="Move Down in Queue"
+                            >
+                                <ChevronDown size={16} />
+                            </button>
+                        </>
+                    )}
+                    {(isPausable || taskStatus === 'paused') && (
+                        <button
+                            onClick={handlePauseResume}
+                            className="button-icon"
+                            aria-label={pauseResumeLabel}
+                            title={pauseResumeLabel}
+                        >
+                            {taskStatus === 'paused' ? <Play size={16} /> : <Pause size={16} />}
+                        </button>
+                    )}
                     <button
                         onClick={handleActionClick}
                         className="button-icon dismiss-button"
@@ -38,12 +38,13 @@ const ModelSearchPage: React.FC<ModelSearchPageProps> = ({
     const [error, setError] = useState<string | null>(null);
     const [hasMore, setHasMore] = useState<boolean>(false);
     const [currentPage, setCurrentPage] = useState<number>(1);
+    const [nextCursor, setNextCursor] = useState<string | null>(null);
     const [showScrollTop, setShowScrollTop] = useState(false);
 
     const resultsContainerRef = useRef<HTMLDivElement>(null);
 
     const performSearch = useCallback(
-        async (pageToLoad: number, isNewSearch: boolean = false) => {
+        async (pageToLoad: number, isNewSearch: boolean = false, cursor?: string) => {
             if (isNewSearch) {
                 setIsLoading(true);
                 setResults([]); // Clear previous results immediately for a new search
@@ -56,6 +57,7 @@ const ModelSearchPage: React.FC<ModelSearchPageProps> = ({
                 const response: PaginatedModelListResponse = await searchModels({
                     ...searchParams,
                     page: pageToLoad,
+                    cursor,
                 });
 
                 if (response.items) {
@@ -63,6 +65,7 @@ const ModelSearchPage: React.FC<ModelSearchPageProps> = ({
                         isNewSearch ? response.items : [...prev, ...response.items],
                     );
                     setHasMore(response.has_more);
+                    setNextCursor(response.next_cursor ?? null);
                     setCurrentPage(pageToLoad);
                 } else {
                     throw new Error('Invalid response from server.');
@@ -111,7 +114,7 @@ const ModelSearchPage: React.FC<ModelSearchPageProps> = ({
 
     const handleLoadMore = () => {
         if (hasMore && !isLoading && !isLoadingMore) {
-            performSearch(currentPage + 1);
+            performSearch(currentPage + 1, false, nextCursor ?? undefined);
         }
     };
 